@@ -10,17 +10,19 @@ from medgemma_pd.audio_pipeline.validation import InputValidator
 from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
 from medgemma_pd.audio_pipeline.quality_control import SignalQualityControl as QualityControl # Fix class name alias
 from medgemma_pd.audio_pipeline.features import FeatureExtractor
+from medgemma_pd.audio_pipeline.dsp import DSPKernels
+from medgemma_pd.audio_pipeline.cache import FeatureCache
+from medgemma_pd.audio_pipeline.pipeline import MedicalAudioPipeline
 from medgemma_pd.history_loader import HistoryLoader
 from medgemma_pd.reasoning.engine import MedGemmaEngine
 
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
-from scipy import signal
 
 def plot_spectrogram(y, sr):
     """Generates a Mel-like Spectrogram using Scipy/Matplotlib"""
-    f, t, Sxx = signal.spectrogram(y, sr, nperseg=1024, noverlap=512)
+    f, t, Sxx = DSPKernels.spectrogram(y, sr, nperseg=1024, noverlap=512)
     fig, ax = plt.subplots(figsize=(10, 2))
     # Log scale for better visualization (dB)
     Sxx_log = 10 * np.log10(Sxx + 1e-9)
@@ -69,14 +71,10 @@ def main():
     uploaded_file = st.file_uploader("Upload Voice Recording (WAV)", type=["wav"])
 
     if uploaded_file is not None:
-        # Save temp file
-        with open("temp_upload.wav", "wb") as f:
-            f.write(uploaded_file.getbuffer())
-            
-        file_path = os.path.abspath("temp_upload.wav")
+        # The upload is processed straight from memory (no temp file)
         
         # --- Audio Player & Spectrogram ---
-        st.audio(file_path)
+        st.audio(uploaded_file.getvalue())
         
         with st.spinner("Processing Audio Signal..."):
             time.sleep(1) # UX Pause
@@ -84,14 +82,18 @@ def main():
             # --- PIPELINE START ---
             
             # 1. Validation
-            val = InputValidator.validate(file_path)
+            val, buffer = InputValidator.open(uploaded_file)
             if not val['valid']:
                 st.error(f"❌ **Invalid File**: {val.get('error')}")
                 return
 
+            # Re-uploads of the same recording reuse the cached features
+            cache_key = FeatureCache.key(buffer.content_hash(), MedicalAudioPipeline.VERSION,
+                                         FeatureCache.fingerprint(AudioPreprocessor, FeatureExtractor, stage="app"))
+
             # 2. Preprocessing
             try:
-                y_norm, sr, audit = AudioPreprocessor.process(file_path)
+                y_norm, sr, audit = AudioPreprocessor.process(buffer)
                 
                 # --- 2. Visualize Audio (Spectrogram) ---
                 st.pyplot(plot_spectrogram(y_norm, sr))
@@ -99,6 +101,8 @@ def main():
             except Exception as e:
                 st.error(f"❌ **Preprocessing Failed**: {e}")
                 return
+            finally:
+                buffer.close()
 
             # 3. Quality Control (The Safety Demo)
             qc = QualityControl.assess_quality(y_norm, sr)
@@ -112,7 +116,10 @@ def main():
                 return
 
             # 4. Feature Extraction & Calibration
-            features = FeatureExtractor.extract_features(y_norm, sr)
+            features = FeatureCache.get(cache_key)
+            if features is None:
+                features = FeatureExtractor.extract_features(y_norm, sr)
+                FeatureCache.put(cache_key, features)
             if not features.get("valid_voice_detected", False):
                  st.error("🚨 **Unvoiced Audio**: No vocal signal detected.")
                  st.caption("Using Soft Fallback (Zero Vector)")
@@ -8,8 +8,6 @@ import os
 sys.path.append(os.getcwd()) # FIX: Force current directory into path
 
 try:
-    log("Importing glob...")
-    import glob
     log("Importing csv...")
     import csv
     log("Importing numpy...")
@@ -24,11 +22,15 @@ try:
     log("Imported InputValidator")
     from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
     log("Imported AudioPreprocessor")
-    from medgemma_pd.audio_pipeline.quality_control import QualityControl
-    log("Imported QualityControl")
+    from medgemma_pd.audio_pipeline.quality_control import SignalQualityControl
+    log("Imported SignalQualityControl")
     from medgemma_pd.audio_pipeline.features import FeatureExtractor
     log("Imported FeatureExtractor")
-    from medgemma_pd.reasoning.history_loader import HistoryLoader
+    from medgemma_pd.data.corpus import CorpusReader
+    log("Imported CorpusReader")
+    from medgemma_pd.data.manifest import DatasetManifest
+    log("Imported DatasetManifest")
+    from medgemma_pd.history_loader import HistoryLoader
     log("Imported HistoryLoader")
     from medgemma_pd.reasoning.engine import MedGemmaEngine
     log("Imported Engine")
@@ -41,20 +43,27 @@ except Exception as e:
 
 # Configuration
 DATASET_ROOT = r"dataset- MDVR-KCL Dataset\26_29_09_2017_KCL\26-29_09_2017_KCL\ReadText"
+# Or point DATASET_ROOT at the corpus archive (.zip / .tar[.gz]); it is read without extracting
 OUTPUT_FILE = "results.csv"
 
-def run_pipeline(file_path, patient_id):
+def run_pipeline(file_path, patient_id, name=None, group=None):
+    # file_path may also be archive member bytes, with the member path as `name`
+    name = name or file_path
+    group = group or CorpusReader.infer_group(name)
     try:
         # 1. Validation
-        val = InputValidator.validate(file_path)
+        val, buffer = InputValidator.open(file_path, name)
         if not val['valid']:
             return {"error": "Invalid Header"}
 
         # 2. Preprocessing
-        y_norm, sr, audit = AudioPreprocessor.process(file_path)
+        try:
+            y_norm, sr, audit = AudioPreprocessor.process(buffer)
+        finally:
+            buffer.close() # Also when preprocessing raises: no mmap / handle left behind in the batch loop
         
         # 3. QC
-        qc = QualityControl.check(y_norm, sr)
+        qc = SignalQualityControl.assess_quality(y_norm, sr)
 
         # 4. Features
         features = FeatureExtractor.extract_features(y_norm, sr)
@@ -75,8 +84,8 @@ def run_pipeline(file_path, patient_id):
         
         # 6. Metadata
         metrics = {
-            "filename": os.path.basename(file_path),
-            "group": "PD" if "PD" in file_path else "HC",
+            "filename": os.path.basename(name),
+            "group": group,
             "patient_id": patient_id,
             "mapped_subject_id": mapped_subj,
             "jitter": features.get("jitter_local", 0.0) * 100, 
@@ -89,44 +98,51 @@ def run_pipeline(file_path, patient_id):
         }
         return metrics
     except Exception as e:
-         log(f"Pipeline Error on {file_path}: {e}")
+         log(f"Pipeline Error on {name}: {e}")
          return {"error": str(e)}
 
 def main():
     log("Creating Log...")
     try:
-        hc_files = glob.glob(os.path.join(DATASET_ROOT, "HC", "*.wav"))
-        pd_files = glob.glob(os.path.join(DATASET_ROOT, "PD", "*.wav"))
-        all_files = hc_files + pd_files
-        log(f"Found {len(all_files)} files.")
+        if CorpusReader.is_archive(DATASET_ROOT):
+            # Members are decoded from the archive stream, several at a time
+            results = list(CorpusReader.map_members(
+                DATASET_ROOT, lambda entry, data: run_pipeline(data, entry['patient_id'], entry['member'], entry['group'])))
+            log(f"Processed {len(results)} archive members.")
+            save_results(results)
+            return
+
+        # Manifest: one incremental scan; group and patient ID come from the index
+        entries = [e for e in DatasetManifest.entries(DATASET_ROOT) if e['group'] in ("HC", "PD")]
+        log(f"Found {len(entries)} files.")
         
         results = []
         
         i = 0
-        for f in all_files:
+        for entry in entries:
             i += 1
-            if i % 5 == 0: log(f"Processing {i}/{len(all_files)}...")
+            if i % 5 == 0: log(f"Processing {i}/{len(entries)}...")
 
-            fname = os.path.basename(f)
-            pid = fname.split('_')[0] 
-            
-            # log(f"Processing {fname}...") # Reduced logging
-            res = run_pipeline(f, pid)
+            # log(f"Processing {entry['filename']}...") # Reduced logging
+            res = run_pipeline(entry['path'], entry['patient_id'], group=entry['group'])
             results.append(res)
             
-        log(f"Saving {len(results)} results...")
-        if results:
-            keys = results[0].keys()
-            with open(OUTPUT_FILE, 'w', newline='') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=keys)
-                writer.writeheader()
-                writer.writerows(results)
-        log("BATCH COMPLETE")
+        save_results(results)
         
     except Exception as e:
         log(f"RUNTIME CRASH: {e}")
         import traceback
         log(traceback.format_exc())
 
+def save_results(results):
+    log(f"Saving {len(results)} results...")
+    if results:
+        keys = results[0].keys()
+        with open(OUTPUT_FILE, 'w', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=keys)
+            writer.writeheader()
+            writer.writerows(results)
+    log("BATCH COMPLETE")
+
 if __name__ == "__main__":
     main()
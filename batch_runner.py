@@ -1,10 +1,10 @@
 import os
-import glob
 import csv
 import subprocess
 import re
 import time
 from medgemma_pd.history_loader import HistoryLoader
+from medgemma_pd.data.manifest import DatasetManifest
 
 # Configuration
 DATASET_ROOT = r"dataset- MDVR-KCL Dataset\26_29_09_2017_KCL\26-29_09_2017_KCL\ReadText"
@@ -49,20 +49,16 @@ def main():
     print("--- Batch Runner (Subprocess Mode) ---")
     
     # 1. Find Files
-    hc_files = glob.glob(os.path.join(DATASET_ROOT, "HC", "*.wav"))
-    pd_files = glob.glob(os.path.join(DATASET_ROOT, "PD", "*.wav"))
-    all_files = hc_files + pd_files
-    print(f"Found {len(all_files)} files.")
+    entries = [e for e in DatasetManifest.entries(DATASET_ROOT) if e['group'] in ("HC", "PD")]
+    print(f"Found {len(entries)} files.")
     
     results = []
     
     # Process Loop
-    for i, wav_path in enumerate(all_files):
-        filename = os.path.basename(wav_path)
-        group = "PD" if "PD" in wav_path else "HC"
-        pid = filename.split('_')[0] if "_" in filename else "Unknown"
+    for i, entry in enumerate(entries):
+        wav_path, filename, group, pid = entry['path'], entry['filename'], entry['group'], entry['patient_id']
         
-        print(f"[{i+1}/{len(all_files)}] Processing {filename}...", end=" ", flush=True)
+        print(f"[{i+1}/{len(entries)}] Processing {filename}...", end=" ", flush=True)
         
         # Run main.py
         # ID02 is used as dummy ID to trigger processing, 
@@ -1,17 +1,14 @@
 print("--- Batch V2 Starting ---", flush=True)
-import os
-import glob
 import csv
-import numpy as np
-import time
 
 try:
     print("Importing pipeline...", flush=True)
     from medgemma_pd.audio_pipeline.validation import InputValidator
     from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
-    from medgemma_pd.audio_pipeline.quality_control import QualityControl
+    from medgemma_pd.audio_pipeline.quality_control import SignalQualityControl
     from medgemma_pd.audio_pipeline.features import FeatureExtractor
-    from medgemma_pd.reasoning.history_loader import HistoryLoader
+    from medgemma_pd.data.manifest import DatasetManifest
+    from medgemma_pd.history_loader import HistoryLoader
     from medgemma_pd.reasoning.engine import MedGemmaEngine
     print("Imports Success", flush=True)
 except Exception as e:
@@ -25,18 +22,16 @@ OUTPUT_FILE = "results.csv"
 def main():
     print("Running Main...", flush=True)
     try:
-        hc_files = glob.glob(os.path.join(DATASET_ROOT, "HC", "*.wav"))
-        pd_files = glob.glob(os.path.join(DATASET_ROOT, "PD", "*.wav"))
-        all_files = hc_files + pd_files
-        print(f"Found {len(all_files)} files.", flush=True)
+        entries = [e for e in DatasetManifest.entries(DATASET_ROOT) if e['group'] in ("HC", "PD")]
+        print(f"Found {len(entries)} files.", flush=True)
         
         # Simple loop for debugging first
         with open(OUTPUT_FILE, 'w', newline='') as f:
             writer = csv.writer(f)
             writer.writerow(["Filename", "Status"])
-            for wav in all_files[:3]: # Test first 3
-                print(f"Processing {os.path.basename(wav)}", flush=True)
-                writer.writerow([os.path.basename(wav), "Processed"])
+            for entry in entries[:3]: # Test first 3
+                print(f"Processing {entry['filename']}", flush=True)
+                writer.writerow([entry['filename'], "Processed"])
                 
         print("Batch Complete", flush=True)
         
@@ -0,0 +1,77 @@
+import sys
+import os
+import time
+import numpy as np
+from scipy import signal
+
+sys.path.append(os.getcwd())
+from medgemma_pd.audio_pipeline.dsp import DSPKernels
+from benchmark_acf_engine import synth_speech
+
+# Benchmark: shared DSP kernels (medgemma_pd/audio_pipeline/dsp.py)
+# One place to measure framing/windowing, batched ACF + peak picking and the
+# STFT used by the app, against the per-frame / library equivalents.
+
+SR = 16000
+FRAME_LEN = int(SR * 0.04)
+HOP_LEN = int(SR * 0.01)
+REPEATS = 3
+
+
+def best_time(fn, *args):
+    times = []
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def per_frame_acf(y):
+    """Reference: np.hanning + complex FFT ACF for every hop."""
+    out = []
+    for start in range(0, len(y) - FRAME_LEN, HOP_LEN):
+        frame = y[start : start + FRAME_LEN] * np.hanning(FRAME_LEN)
+        f = np.fft.fft(np.pad(frame, (0, FRAME_LEN)))
+        acf = np.fft.ifft(f * np.conj(f)).real[:FRAME_LEN]
+        out.append(np.argmax(acf[int(SR / 600):int(SR / 75)]))
+    return out
+
+
+def kernel_acf(y):
+    min_lag, max_lag, nfft = DSPKernels.acf_plan(SR, FRAME_LEN, 75, 600)
+    frames = DSPKernels.frame(y, FRAME_LEN, HOP_LEN)
+    window = DSPKernels.window(FRAME_LEN)
+    return [DSPKernels.acf_peaks(frames[s:s + 256] * window, nfft, min_lag, max_lag)
+            for s in range(0, len(frames), 256)]
+
+
+def main():
+    print("--- DSP Kernel Benchmark ---")
+    print(f"{'Kernel':<28} | {'Signal':>6} | {'Reference (s)':>13} | {'Kernel (s)':>10} | {'Speedup':>7}")
+    print("-" * 78)
+    for label, dur in [("60 s", 60), ("10 min", 600)]:
+        y = synth_speech(dur)
+        rows = [
+            ("frame ACF + peak picking", per_frame_acf, kernel_acf),
+            ("STFT (nperseg=1024)",
+             lambda x: signal.spectrogram(x, SR, nperseg=1024, noverlap=512),
+             lambda x: DSPKernels.spectrogram(x, SR, nperseg=1024, noverlap=512)),
+        ]
+        for name, ref, new in rows:
+            t_ref, t_new = best_time(ref, y), best_time(new, y)
+            print(f"{name:<28} | {label:>6} | {t_ref:>13.4f} | {t_new:>10.4f} | {t_ref / t_new:>6.1f}x")
+
+    y = synth_speech(5)
+    _, _, s_ref = signal.spectrogram(y, SR, nperseg=1024, noverlap=512)
+    _, _, s_new = DSPKernels.spectrogram(y, SR, nperseg=1024, noverlap=512)
+    print(f"\nSTFT max relative difference vs scipy: {np.max(np.abs(s_new - s_ref)) / np.max(np.abs(s_ref)):.2e}")
+
+    t_hann = best_time(lambda: [np.hanning(FRAME_LEN) for _ in range(10000)])
+    t_cached = best_time(lambda: [DSPKernels.window(FRAME_LEN) for _ in range(10000)])
+    print(f"\nWindow x10000: np.hanning {t_hann:.4f} s, cached {t_cached:.4f} s "
+          f"({DSPKernels.window.cache_info().hits} cache hits)")
+
+
+if __name__ == "__main__":
+    main()
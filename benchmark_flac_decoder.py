@@ -0,0 +1,84 @@
+import sys
+import os
+import time
+import tempfile
+import numpy as np
+from scipy.io import wavfile
+
+sys.path.append(os.getcwd())
+from medgemma_pd.audio_pipeline.buffer import AudioBuffer
+from medgemma_pd.audio_pipeline.decoders import AudioDecoders
+from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
+
+# Benchmark: block-streaming FLAC decoding vs. the memory-mapped WAV path.
+# Reports file sizes, raw block-scan throughput and end-to-end preprocessing
+# time for the same PCM stored both ways, and checks the decoded samples and
+# preprocessed output are bit-identical.
+
+DURATIONS = [("60 s", 60), ("10 min", 600)]
+SR = 44100
+
+
+def synth_pcm(duration, sr=SR, seed=0):
+    """Speech-like int16 PCM: harmonic voice, pauses and a noise floor."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sr)) / sr
+    f0 = 140 + 20 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    y = sum((0.6 / k) * np.sin(k * phase) for k in range(1, 6)) * ((t % 2.0) < 1.5)
+    y = y + rng.normal(0, 0.005, len(t))
+    return (0.7 * y / np.max(np.abs(y)) * 32767).astype(np.int16)
+
+
+def block_scan(path):
+    """Reads every sample once in BLOCK_SAMPLES blocks; returns (seconds, checksum)."""
+    t0 = time.perf_counter()
+    buffer = AudioBuffer.open(path)
+    total = 0
+    for a in range(0, len(buffer.samples), AudioPreprocessor.BLOCK_SAMPLES):
+        total += int(np.sum(buffer.samples[a : a + AudioPreprocessor.BLOCK_SAMPLES], dtype=np.int64))
+    buffer.close()
+    return time.perf_counter() - t0, total
+
+
+def timed_process(path):
+    t0 = time.perf_counter()
+    y, _, _ = AudioPreprocessor.process(path)
+    return time.perf_counter() - t0, y
+
+
+def main():
+    print("--- FLAC Block Decoder Benchmark ---")
+    if not AudioDecoders.available('.flac'):
+        print("soundfile (libsndfile with FLAC) is not installed; nothing to compare.")
+        return
+
+    import soundfile
+    print(f"{'Length':<8} | {'WAV MB':>7} | {'FLAC MB':>7} | {'Scan WAV':>10} | {'Scan FLAC':>10} | "
+          f"{'process WAV':>11} | {'process FLAC':>12} | Identical")
+    print("-" * 100)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Warm-up: filter design and FFT plans are cached after the first run
+        warm = os.path.join(tmp, "warm.wav")
+        wavfile.write(warm, SR, synth_pcm(1))
+        AudioPreprocessor.process(warm)
+
+        for label, dur in DURATIONS:
+            pcm = synth_pcm(dur)
+            wav_path, flac_path = os.path.join(tmp, "x.wav"), os.path.join(tmp, "x.flac")
+            wavfile.write(wav_path, SR, pcm)
+            soundfile.write(flac_path, pcm, SR, subtype="PCM_16")
+
+            t_scan_wav, sum_wav = block_scan(wav_path)
+            t_scan_flac, sum_flac = block_scan(flac_path)
+            t_wav, y_wav = timed_process(wav_path)
+            t_flac, y_flac = timed_process(flac_path)
+
+            identical = sum_wav == sum_flac and np.array_equal(y_wav, y_flac)
+            msps = lambda t: f"{len(pcm) / t / 1e6:.1f} MS/s"
+            print(f"{label:<8} | {os.path.getsize(wav_path) / 2**20:>7.1f} | {os.path.getsize(flac_path) / 2**20:>7.1f} | "
+                  f"{msps(t_scan_wav):>10} | {msps(t_scan_flac):>10} | {t_wav:>10.2f}s | {t_flac:>11.2f}s | {identical}")
+
+
+if __name__ == "__main__":
+    main()
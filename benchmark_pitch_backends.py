@@ -0,0 +1,70 @@
+import sys
+import os
+import time
+import numpy as np
+
+sys.path.append(os.getcwd())
+from medgemma_pd.audio_pipeline.features import FeatureExtractor
+from medgemma_pd.audio_pipeline.pitch_backends import PitchBackends
+from benchmark_acf_engine import synth_speech
+
+# Benchmark: pitch-tracker backends vs. the reference ACF backend
+# Reports throughput (frames/sec) and agreement on the frame trace (voicing,
+# lag within +/- 1 sample) and on the final features, for every backend
+# available in this environment.
+
+SR = 16000
+DURATIONS = [("5 s", 5), ("60 s", 60), ("10 min", 600)]
+FEATURES = ["f0_mean", "jitter_local", "shimmer_local", "hnr"]
+REFERENCE = "acf"
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    backends = PitchBackends.available()
+    missing = sorted(set(PitchBackends.names()) - set(backends))
+    print("--- Pitch Backend Benchmark ---")
+    print(f"Backends: {', '.join(backends)}" + (f" (not installed: {', '.join(missing)})" if missing else ""))
+
+    # Warm-up (lazy imports, FFT plans, window caches)
+    warm = synth_speech(1)
+    for name in backends:
+        FeatureExtractor._track_pitch(warm, SR, name)
+
+    print(f"\n{'Backend':<15} | {'Length':<7} | {'fr/s':>8} | {'vs ACF':>6} | {'Voicing agree':>13} | {'Lag +/-1':>8}")
+    print("-" * 72)
+    for label, dur in DURATIONS:
+        y = synth_speech(dur)
+        ref, t_ref = timed(FeatureExtractor._track_pitch, y, SR, REFERENCE)
+        v_ref = FeatureExtractor._voiced_mask(ref)
+        for name in backends:
+            trace, t = timed(FeatureExtractor._track_pitch, y, SR, name)
+            voiced = FeatureExtractor._voiced_mask(trace)
+            both = voiced & v_ref
+            lag_ok = np.mean(np.abs(trace["lag"][both] - ref["lag"][both]) <= 1) if np.any(both) else 1.0
+            n = len(trace["lag"])
+            print(f"{name:<15} | {label:<7} | {n / t:>8.0f} | {t_ref / t:>5.2f}x | "
+                  f"{np.mean(voiced == v_ref):>13.2%} | {lag_ok:>8.2%}")
+
+    print("\nFeature agreement (60 s, relative difference to ACF):")
+    y = synth_speech(60, seed=1)
+    ref = FeatureExtractor.extract_features(y, SR, pitch_method=REFERENCE)
+    print(f"{'Backend':<15} | " + " | ".join(f"{k:>13}" for k in FEATURES))
+    for name in backends:
+        out = FeatureExtractor.extract_features(y, SR, pitch_method=name)
+        cells = []
+        for k in FEATURES:
+            if k in out and k in ref:
+                cells.append(f"{abs(out[k] - ref[k]) / (abs(ref[k]) + 1e-12):>13.2e}")
+            else:
+                cells.append(f"{'n/a':>13}")
+        print(f"{name:<15} | " + " | ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.getcwd())
+from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
+
+# Benchmark: polyphase resampler (cached FIR designs) vs. scipy.signal.resample (FFT)
+# Uses "awkward" clip lengths (primes, lengths with a large prime factor) at the
+# source rates we see in practice. Accuracy is the interior error against the
+# analytic test signal evaluated on the 16 kHz grid.
+
+TARGET_SR = AudioPreprocessor.TARGET_SR
+SOURCE_RATES = [44100, 48000, 22050]
+
+
+def next_prime(n):
+    def is_prime(k):
+        if k < 2 or k % 2 == 0:
+            return k == 2
+        return all(k % d for d in range(3, int(k ** 0.5) + 1, 2))
+    while not is_prime(n):
+        n += 1
+    return n
+
+
+def test_signal(t):
+    """Harmonic vowel, band-limited below the 8 kHz target Nyquist."""
+    return sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 20))
+
+
+def best_time(fn, repeats=3):
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return out, min(times)
+
+
+def main():
+    print("--- Resampler Benchmark (fft vs polyphase) ---")
+    print(f"{'Source':>6} | {'Length':>9} | {'Kind':<9} | {'FFT (ms)':>9} | {'Poly (ms)':>9} | {'Speedup':>7} | "
+          f"{'FFT err':>7} | {'Poly err':>8}")
+    print("-" * 90)
+    for src_sr in SOURCE_RATES:
+        for seconds in (3, 30):
+            base = src_sr * seconds
+            for kind, n in [("round", base), ("prime", next_prime(base + 1)), ("2 * prime", 2 * next_prime(base // 2 + 1))]:
+                y = test_signal(np.arange(n) / src_sr)
+                fft_out, t_fft = best_time(lambda: AudioPreprocessor._resample(y, src_sr, TARGET_SR, "fft"))
+                poly_out, t_poly = best_time(lambda: AudioPreprocessor._resample(y, src_sr, TARGET_SR, "polyphase"))
+
+                ideal = test_signal(np.arange(len(poly_out)) / TARGET_SR)
+                edge = 200  # both methods differ near the clip edges (periodic vs zero extension)
+                err = [np.max(np.abs(out[edge:-edge] - ideal[edge:-edge])) / np.max(np.abs(ideal))
+                       for out in (fft_out, poly_out)]
+                print(f"{src_sr:>6} | {n:>9} | {kind:<9} | {t_fft * 1e3:>9.1f} | {t_poly * 1e3:>9.1f} | "
+                      f"{t_fft / t_poly:>6.1f}x | {err[0]:>7.1e} | {err[1]:>8.1e}")
+
+    info = AudioPreprocessor._polyphase_filter.cache_info()
+    print(f"\nFilter design cache: {info.currsize} designs, {info.hits} hits, {info.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
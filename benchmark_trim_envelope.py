@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.append(os.getcwd())
+from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
+from benchmark_acf_engine import synth_speech
+
+# Benchmark: silence-trim envelope, cumulative-sum moving average vs. the
+# original np.convolve(y**2, box, 'same') envelope (O(N * 2048)).
+# Checks that both give the same trim boundaries.
+
+SR = 16000
+FRAME_LENGTH = 2048
+
+
+def convolve_trim(y, top_db=60):
+    """Reference: the original whole-signal convolution envelope."""
+    window = np.full(FRAME_LENGTH, 1.0 / FRAME_LENGTH)
+    rmse_env = np.sqrt(np.convolve(y ** 2, window, mode='same'))
+    db_env = 20 * np.log10(rmse_env / np.max(rmse_env) + 1e-9)
+    active = np.flatnonzero(db_env > -top_db)
+    return active[0], active[-1]
+
+
+def cumsum_trim(y, top_db=60):
+    start, end, _ = AudioPreprocessor._trim_bounds(len(y), lambda a, b: y[a:b], top_db, FRAME_LENGTH)
+    return start, end
+
+
+def main():
+    print("--- Trim Envelope Benchmark (convolve vs cumsum) ---")
+    print(f"{'Length':<8} | {'Convolve (s)':>12} | {'Cumsum (s)':>10} | {'Speedup':>8} | Same bounds")
+    print("-" * 62)
+    for label, seconds in [("30 s", 30), ("2 min", 120), ("5 min", 300)]:
+        y = synth_speech(seconds)
+        # Silent lead-in / tail so the trim actually removes something
+        pad = np.zeros(SR * 2)
+        y = np.concatenate((pad, y, pad))
+
+        t0 = time.perf_counter()
+        ref = convolve_trim(y)
+        t_ref = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        new = cumsum_trim(y)
+        t_new = time.perf_counter() - t0
+        print(f"{label:<8} | {t_ref:>12.3f} | {t_new:>10.4f} | {t_ref / t_new:>7.0f}x | {tuple(map(int, ref)) == new}")
+
+
+if __name__ == "__main__":
+    main()
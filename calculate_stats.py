@@ -1,6 +1,10 @@
+import os
 import csv
 import math
 import sys
+sys.path.append(os.getcwd())
+from medgemma_pd.data.feature_store import FeatureStore
+from medgemma_pd.audio_pipeline.pipeline import MedicalAudioPipeline
 # Try importing scipy, if fails, use manual T-Test approximation
 try:
     from scipy import stats
@@ -35,14 +39,17 @@ def manual_ttest(group1, group2):
     if t_stat > 1.96: return 0.05
     return 0.5
 
-def main():
-    print("--- MedGemma-PD Statistical Validation ---")
-    
-    # Load Data
-    hc_jitter, pd_jitter = [], []
-    hc_shimmer, pd_shimmer = [], []
-    hc_hnr, pd_hnr = [], []
-    
+def load_feature_store():
+    """Per-group [jitter, shimmer, hnr] lists from the feature store (voiced, non-fallback rows)."""
+    table = FeatureStore.read(MedicalAudioPipeline.VERSION,
+                              columns=["group", "voiced", "fallback_used", "jitter", "shimmer", "hnr"])
+    keep = (table["voiced"] == 1) & (table["fallback_used"] != 1)
+    return {group: [table[c][keep & (table["group"] == group)].tolist() for c in ("jitter", "shimmer", "hnr")]
+            for group in ("HC", "PD")}
+
+def load_results_csv():
+    """Per-group [jitter, shimmer, hnr] lists from the batch runner's results.csv."""
+    data = {"HC": [[], [], []], "PD": [[], [], []]}
     with open("results.csv", "r") as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -54,16 +61,24 @@ def main():
                 s = float(row["Shimmer"])
                 h = float(row["HNR"])
                 
-                if row["Group"] == "HC":
-                    hc_jitter.append(j)
-                    hc_shimmer.append(s)
-                    hc_hnr.append(h)
-                else:
-                    pd_jitter.append(j)
-                    pd_shimmer.append(s)
-                    pd_hnr.append(h)
+                group = data["HC"] if row["Group"] == "HC" else data["PD"]
+                group[0].append(j)
+                group[1].append(s)
+                group[2].append(h)
             except:
                 continue
+    return data
+
+def main():
+    print("--- MedGemma-PD Statistical Validation ---")
+    
+    # Load Data: the feature store (filled by train_validation.py) if populated, else results.csv
+    if FeatureStore.keys(MedicalAudioPipeline.VERSION):
+        data = load_feature_store()
+    else:
+        data = load_results_csv()
+    hc_jitter, hc_shimmer, hc_hnr = data["HC"]
+    pd_jitter, pd_shimmer, pd_hnr = data["PD"]
                 
     print(f"Loaded: {len(pd_jitter)} PD samples, {len(hc_jitter)} HC samples.")
     
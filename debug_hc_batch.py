@@ -11,22 +11,32 @@ warnings.filterwarnings("ignore")
 from medgemma_pd.audio_pipeline.features import FeatureExtractor
 from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
 from medgemma_pd.models.signals import MLSignalGenerator
+from medgemma_pd.data.manifest import DatasetManifest
 
-HC_PATH = r"dataset- MDVR-KCL Dataset/26_29_09_2017_KCL/26-29_09_2017_KCL/ReadText/HC"
+DATA_ROOT = r"dataset- MDVR-KCL Dataset/26_29_09_2017_KCL/26-29_09_2017_KCL/ReadText"
+HC_PATH = os.path.join(DATA_ROOT, "HC")
 
 def test_hc_folder():
     print(f"--- Diagnosing HC Folder: {HC_PATH} ---")
-    files = [f for f in os.listdir(HC_PATH) if f.endswith(".wav")]
-    print(f"Found {len(files)} files.")
+    entries = DatasetManifest.entries(DATA_ROOT, group="HC")
+    print(f"Found {len(entries)} files.")
     
     results = []
     
-    for f in files:
-        path = os.path.join(HC_PATH, f)
+    # Preprocess all files, then run one batched feature extraction
+    loaded = []
+    for entry in entries:
+        f = entry['filename']
+        try:
+            y, sr, _ = AudioPreprocessor.process(entry['path'])
+            loaded.append((f, y))
+        except Exception as e:
+            print(f"{f}: ERROR {e}")
+
+    batch_feats = FeatureExtractor.extract_features_batch([y for _, y in loaded], AudioPreprocessor.TARGET_SR)
+
+    for (f, _), feats in zip(loaded, batch_feats):
         try:
-            y, sr, _ = AudioPreprocessor.process(path)
-            feats = FeatureExtractor.extract_features(y, sr)
-            
             jitter = feats.get("jitter_local", 0.0) * 100
             shimmer = feats.get("shimmer_local", 0.0) * 100
             hnr = feats.get("hnr", 0.0)
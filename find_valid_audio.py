@@ -1,33 +1,36 @@
 import os
-import glob
-import numpy as np
-from scipy.io import wavfile
+import sys
+
+sys.path.append(os.getcwd())
+from medgemma_pd.audio_pipeline.validation import InputValidator
+from medgemma_pd.audio_pipeline.triage import AudioTriage
+from medgemma_pd.data.manifest import DatasetManifest
 
 def is_silent(file_path):
+    # Triage reads the header and a few sampled blocks, not the whole file
     try:
-        sr, y = wavfile.read(file_path)
-        if len(y) == 0: return True
-        # Check max amplitude
-        if y.dtype.kind == 'i':
-            peak = np.max(np.abs(y))
-            return peak == 0
-        return np.max(np.abs(y)) < 1e-4
+        val, buffer = InputValidator.open(file_path)
+        if not val['valid']: return True
+        result = AudioTriage.check(buffer)
+        buffer.close()
+        return not result['passed']
     except:
         return True
 
 print("Scanning for VALID (Non-Silent) Audio...")
 root = "dataset- MDVR-KCL Dataset"
-candidates = glob.glob(os.path.join(root, "**", "*.wav"), recursive=True)
+candidates = DatasetManifest.entries(root) # Unreadable headers are already excluded
 
 found_pd = None
 found_hc = None
 
-for f in candidates:
-    if "PD" in f and not found_pd:
+for entry in candidates:
+    f = entry['path']
+    if entry['group'] == "PD" and not found_pd:
         if not is_silent(f):
             print(f"Found Valid PD: {f}")
             found_pd = f
-    elif "HC" in f and not found_hc:
+    elif entry['group'] == "HC" and not found_hc:
         if not is_silent(f):
             print(f"Found Valid HC: {f}")
             found_hc = f
@@ -0,0 +1,171 @@
+import io
+import os
+import hashlib
+import numpy as np
+from .decoders import AudioDecoders
+
+
+class AudioBuffer:
+    """
+    A recording opened once per pipeline run.
+    Carries the file stat info, header metadata and the raw PCM samples
+    (memory-mapped when possible), so validation, preprocessing and the report
+    never go back to disk. Created by InputValidator.open().
+
+    Sources can be a file path or an in-memory upload (bytes, bytearray,
+    memoryview or a binary file-like object); in-memory sources never touch
+    the filesystem.
+    """
+
+    MEMORY_NAME = "<memory>"
+
+    # Leading bytes -> extension, for in-memory sources without a file name
+    MAGIC = [
+        (0, b"RIFF", '.wav'), (0, b"RIFX", '.wav'), (0, b"RF64", '.wav'),
+        (0, b"fLaC", '.flac'), (0, b"OggS", '.ogg'),
+        (0, b"ID3", '.mp3'), (4, b"ftyp", '.m4a'),
+    ]
+
+    def __init__(self, path: str, size_bytes: int, mtime: float, sample_rate: int = 0,
+                 samples: np.ndarray = None, ingest: str = None, data: memoryview = None,
+                 extension: str = None):
+        self.path = path
+        self.size_bytes = size_bytes
+        self.mtime = mtime      # None for in-memory sources
+        self.sample_rate = sample_rate
+        self.samples = samples  # Raw PCM (n,) or (n, channels); None if not decodable here
+        self.ingest = ingest    # "mmap", "read", "memory" or "stream" (compressed)
+        self.data = data        # Encoded bytes of an in-memory source
+        self.extension = extension if extension is not None else os.path.splitext(path)[1].lower()
+        self._content_hash = None
+
+    @staticmethod
+    def is_path(source) -> bool:
+        return isinstance(source, (str, os.PathLike))
+
+    @staticmethod
+    def locate(source, stat: os.stat_result = None, name: str = None) -> "AudioBuffer":
+        """
+        Wraps a source without decoding it: stats a path (raises OSError if it
+        is missing), or takes a view of in-memory bytes / reads a file-like
+        object. `name` is an optional file-name hint for in-memory sources;
+        without one the format is sniffed from the leading bytes.
+        """
+        if AudioBuffer.is_path(source):
+            path = os.fspath(source)
+            stat = stat or os.stat(path)
+            return AudioBuffer(path, stat.st_size, stat.st_mtime)
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            data = memoryview(source)
+        elif hasattr(source, "getbuffer"):
+            data = source.getbuffer()  # BytesIO / Streamlit uploads: no copy
+        elif hasattr(source, "read"):
+            data = memoryview(source.read())
+        else:
+            raise TypeError(f"Unsupported audio source: {type(source).__name__}")
+        data = data.cast("B")
+
+        name = name or getattr(source, "name", None)
+        ext = os.path.splitext(name)[1].lower() if isinstance(name, str) else ""
+        return AudioBuffer(name if isinstance(name, str) else AudioBuffer.MEMORY_NAME, data.nbytes, None,
+                           data=data, extension=ext or AudioBuffer.sniff_extension(data))
+
+    @staticmethod
+    def sniff_extension(data: memoryview) -> str:
+        """Extension implied by the magic bytes ('' if unknown)."""
+        head = bytes(data[:12])
+        for offset, magic, ext in AudioBuffer.MAGIC:
+            if head[offset:offset + len(magic)] == magic:
+                return ext
+        if len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0:
+            return '.mp3'  # MPEG frame sync without an ID3 tag
+        return ""
+
+    @staticmethod
+    def open(source, stat: os.stat_result = None, name: str = None) -> "AudioBuffer":
+        """
+        locate() + decode(): stats/wraps the source and decodes WAV headers/samples.
+        Other formats get size info only. Raises on unreadable WAV data.
+        """
+        buffer = AudioBuffer.locate(source, stat, name)
+        buffer.decode()
+        return buffer
+
+    def decode(self):
+        """
+        Reads the header and exposes the samples: WAV memory-mapped (files) or
+        decoded from RAM; FLAC / OGG / MP3 as block-decoded BlockSamples when
+        a decoder is installed. Other formats are left undecoded.
+        """
+        if self.extension != '.wav':
+            if AudioDecoders.available(self.extension):
+                self.sample_rate, self.samples = AudioDecoders.open(self.stream())
+                self.ingest = "stream"
+            return
+        from scipy.io import wavfile
+        if self.data is not None:
+            self.sample_rate, self.samples = wavfile.read(self.stream())
+            self.ingest = "memory"
+            return
+        try:
+            self.sample_rate, self.samples = wavfile.read(self.path, mmap=True)
+            self.ingest = "mmap"
+        except ValueError:
+            # e.g. 24-bit PCM, which scipy can only read by copying
+            self.sample_rate, self.samples = wavfile.read(self.path)
+            self.ingest = "read"
+
+    def content_hash(self) -> str:
+        """
+        SHA-256 of the encoded bytes (file read in 1 MB chunks), independent of
+        name and mtime. Computed once per buffer, so it also outlives close().
+        """
+        if self._content_hash is not None:
+            return self._content_hash
+        digest = hashlib.sha256()
+        if self.data is not None:
+            digest.update(self.data)
+        else:
+            with open(self.path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def stream(self):
+        """The encoded source for readers: the path, or a file object over the in-memory bytes."""
+        return self.path if self.data is None else io.BytesIO(self.data)
+
+    @property
+    def filename(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def channels(self) -> int:
+        if self.samples is None:
+            return 0
+        return 1 if self.samples.ndim == 1 else self.samples.shape[1]
+
+    @property
+    def duration_sec(self) -> float:
+        if self.samples is None or not self.sample_rate:
+            return 0
+        return len(self.samples) / float(self.sample_rate)
+
+    def metadata(self) -> dict:
+        """Header metadata in the validation report layout."""
+        return {
+            'sample_rate': self.sample_rate,
+            'channels': self.channels,
+            'duration_sec': self.duration_sec
+        }
+
+    def close(self):
+        """Drops the sample view and source bytes (releases the file mapping once unreferenced)."""
+        if hasattr(self.samples, "close"):
+            self.samples.close() # Decoder handle of compressed formats
+        self.samples = None
+        if self.data is not None:
+            self.data.release()  # unlocks a BytesIO passed in as the source
+            self.data = None
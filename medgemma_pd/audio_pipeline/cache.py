@@ -0,0 +1,246 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+import numpy as np
+
+
+class FeatureCache:
+    """
+    Persistent, content-addressed cache of pipeline results.
+    Entries are JSON files named by a key over the audio content hash, the
+    pipeline version and every tunable parameter (class constants of the
+    layers involved plus per-call options), so an unchanged recording with
+    unchanged settings is a lookup instead of a DSP run. Array artifacts
+    (StageGraph frame statistics) are .npz entries under the same budget.
+
+    Safe for several processes sharing one directory: entries are written to
+    a temp file and atomically renamed into place, hits refresh the entry's
+    mtime (LRU order), and size-bounded eviction runs under a lock file.
+    Writes add to a per-process running size total (seeded by one directory
+    scan), so the directory is only rescanned when the total crosses
+    MAX_BYTES or every RESCAN_WRITES writes (picking up other processes).
+    The eviction helpers take a `root` so TraceStore can budget its own
+    directory the same way.
+    """
+
+    ENABLED = os.environ.get("MEDGEMMA_FEATURE_CACHE", "1") != "0"
+    ROOT = os.environ.get("MEDGEMMA_CACHE_DIR",
+                          os.path.join(os.path.expanduser("~"), ".cache", "medgemma_pd", "features"))
+    MAX_BYTES = 256 * 1024 * 1024  # Evict least recently used entries beyond this
+    EVICT_TARGET = 0.9             # ... down to this fraction of MAX_BYTES
+    LOCK_STALE_SEC = 60            # A lock file older than this is from a crashed process
+    SUFFIXES = (".json", ".npz")   # JSON values, array artifacts
+    RESCAN_WRITES = 256            # Writes between full rescans of the running size total
+
+    # Per-process counters (also copied into each pipeline report; evictions include TraceStore's)
+    counters = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+    # Running size estimate per cache root: {root: [bytes, writes since the last scan]}
+    usage = {}
+
+    @staticmethod
+    def fingerprint(*classes, **params) -> dict:
+        """Upper-case scalar class constants of `classes` plus call parameters, JSON-ready."""
+        fp = {}
+        for cls in classes:
+            fp[cls.__name__] = {k: v for k, v in sorted(vars(cls).items())
+                                if k.isupper() and isinstance(v, (bool, int, float, str, tuple))}
+        fp['params'] = params
+        return fp
+
+    @staticmethod
+    def key(content_hash: str, version: str, fingerprint: dict) -> str:
+        blob = json.dumps([content_hash, version, fingerprint], sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    @staticmethod
+    def _path(key: str, suffix: str = ".json") -> str:
+        return os.path.join(FeatureCache.ROOT, key[:2], key + suffix)
+
+    @staticmethod
+    def get(key: str):
+        """Cached value or None; a hit marks the entry most recently used."""
+        return FeatureCache._load(key, ".json", json.load)
+
+    @staticmethod
+    def get_arrays(key: str) -> dict:
+        """Cached put_arrays() dict or None."""
+        def read(f):
+            with np.load(f) as npz:
+                value = {name: npz[name] for name in npz.files if name != "__json__"}
+                value.update(json.loads(str(npz["__json__"])))
+            return value
+        return FeatureCache._load(key, ".npz", read, mode="rb")
+
+    @staticmethod
+    def _load(key: str, suffix: str, read, mode: str = "r"):
+        path = FeatureCache._path(key, suffix)
+        try:
+            with open(path, mode) as f:
+                value = read(f)
+            os.utime(path) # LRU: eviction removes the oldest mtimes first
+        except (OSError, ValueError, KeyError):
+            # Missing, or torn by an external writer: treat as a miss
+            FeatureCache.counters['misses'] += 1
+            return None
+        FeatureCache.counters['hits'] += 1
+        return value
+
+    @staticmethod
+    def put(key: str, value):
+        """Atomically stores a JSON-serializable value, then evicts if over MAX_BYTES."""
+        FeatureCache._store(key, ".json", lambda f: json.dump(value, f, default=FeatureCache._json_default))
+
+    @staticmethod
+    def put_arrays(key: str, value: dict):
+        """
+        Stores a dict of numpy arrays and JSON-serializable values (e.g. a
+        signal with its sample rate and audit) as one .npz entry; arrays
+        round-trip bit-exactly.
+        """
+        arrays = {k: v for k, v in value.items() if isinstance(v, np.ndarray)}
+        rest = json.dumps({k: v for k, v in value.items() if k not in arrays}, default=FeatureCache._json_default)
+        FeatureCache._store(key, ".npz", lambda f: np.savez(f, __json__=np.array(rest), **arrays), mode="wb")
+
+    @staticmethod
+    def _store(key: str, suffix: str, write, mode: str = "w"):
+        path = FeatureCache._path(key, suffix)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, mode) as f:
+                    write(f)
+                os.replace(tmp, path) # Readers see the old entry or the new one, never a partial file
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            print(f"[FeatureCache] Error: could not store {key[:12]}: {e}")
+            return
+        FeatureCache.counters['writes'] += 1
+        FeatureCache.account(path)
+
+    @staticmethod
+    def account(path: str, root: str = None, max_bytes: int = None):
+        """
+        Adds a new entry under `root` (default ROOT) to the running size
+        total; evicts (with a rescan) once it is due.
+        """
+        root = root or FeatureCache.ROOT
+        max_bytes = max_bytes if max_bytes is not None else FeatureCache.MAX_BYTES
+        usage = FeatureCache.usage.get(root)
+        if usage is None:
+            # Seeded once per process; the scan already includes this entry
+            FeatureCache.usage[root] = usage = [FeatureCache._entries(root)[1], 0]
+        else:
+            try:
+                usage[0] += os.path.getsize(path) # Overwrites count twice until the next rescan
+            except OSError:
+                pass
+        usage[1] += 1
+        if usage[0] > max_bytes or usage[1] >= FeatureCache.RESCAN_WRITES:
+            usage[:] = [FeatureCache.evict(max_bytes, root), 0]
+
+    @staticmethod
+    def _json_default(obj):
+        # numpy scalars / arrays that slipped into a report
+        if hasattr(obj, "tolist"):
+            return obj.tolist()
+        raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+    @staticmethod
+    def report_entry(key: str, hit: bool) -> dict:
+        """Cache section of a pipeline report."""
+        return {'hit': hit, 'key': key[:16], **FeatureCache.counters}
+
+    @staticmethod
+    def evict(max_bytes: int = None, root: str = None) -> int:
+        """
+        Removes least recently used entries until the cache (`root`, default
+        ROOT) is under EVICT_TARGET * max_bytes. Skipped if another process
+        holds the lock.
+        Returns: the scanned size of the cache after eviction (bytes).
+        """
+        max_bytes = max_bytes if max_bytes is not None else FeatureCache.MAX_BYTES
+        root = root or FeatureCache.ROOT
+        entries, total = FeatureCache._entries(root)
+        if total <= max_bytes:
+            return total
+        if not FeatureCache._acquire_lock(root):
+            return total
+        try:
+            entries, total = FeatureCache._entries(root) # Re-read under the lock
+            entries.sort(key=lambda e: e[0])
+            for _, size, path in entries:
+                if total <= FeatureCache.EVICT_TARGET * max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                    FeatureCache.counters['evictions'] += 1
+                except OSError:
+                    pass # Already evicted elsewhere
+        finally:
+            FeatureCache._release_lock(root)
+        return total
+
+    @staticmethod
+    def _entries(root: str = None) -> tuple[list, int]:
+        """[(mtime, size, path)] of all entries and their total size."""
+        entries = []
+        root = root or FeatureCache.ROOT
+        if not os.path.isdir(root):
+            return entries, 0
+        for shard in os.scandir(root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(FeatureCache.SUFFIXES):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries, sum(size for _, size, _ in entries)
+
+    @staticmethod
+    def _lock_path(root: str = None) -> str:
+        return os.path.join(root or FeatureCache.ROOT, ".evict.lock")
+
+    @staticmethod
+    def _acquire_lock(root: str = None) -> bool:
+        """O_EXCL lock file (portable across platforms); breaks locks left by crashed processes."""
+        path = FeatureCache._lock_path(root)
+        for _ in range(2):
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(path) < FeatureCache.LOCK_STALE_SEC:
+                        return False
+                    os.unlink(path)
+                except OSError:
+                    return False
+            except OSError:
+                return False
+        return False
+
+    @staticmethod
+    def _release_lock(root: str = None):
+        try:
+            os.unlink(FeatureCache._lock_path(root))
+        except OSError:
+            pass
+
+    @staticmethod
+    def clear():
+        """Removes every entry (the directory itself is kept)."""
+        FeatureCache.usage.pop(FeatureCache.ROOT, None)
+        for _, _, path in FeatureCache._entries()[0]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
@@ -0,0 +1,130 @@
+import json
+import time
+from .cache import FeatureCache
+from .traces import TraceStore
+
+
+class Stage:
+    """
+    One node of a StageGraph.
+    inputs: names of the upstream stages whose artifacts run() receives.
+    params: JSON-ready dict of everything besides the inputs that shapes the
+            output (typically FeatureCache.fingerprint of the layer class).
+    run: callable(dict of input artifacts) -> artifact.
+    kind: "json" (dict report), "arrays" (dict of numpy arrays plus JSON
+          values, in FeatureCache), "trace" (pitch trace plus 'sr', in
+          TraceStore) or None (memoized for the run only, e.g. the opened
+          audio buffer or the decoded signal).
+    valid: optional callable(artifact) -> bool; an invalid artifact (e.g. a
+           preprocessing fallback after a read error) is used for this run
+           but neither it nor anything computed from it is stored.
+    """
+
+    def __init__(self, name: str, inputs: tuple, params: dict, run, kind: str = "json", valid=None):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.params = params
+        self.run = run
+        self.kind = kind
+        self.valid = valid
+
+
+class StageGraph:
+    """
+    Lazy, memoizing executor for a small DAG of pipeline stages.
+    A stage's key is derived from its name, its params and the keys of its
+    inputs (source stages are keyed by the audio content hash), so keys are
+    known before anything runs. result(name) loads a cached artifact if its
+    key is stored and only otherwise resolves the inputs and runs the stage:
+    a changed feature parameter re-runs feature extraction on the cached
+    trace, a changed QC threshold re-runs QC on cached frame statistics,
+    and neither decodes the audio again.
+    """
+
+    def __init__(self, stages: list, source_keys: dict, version: str, cache: bool = True):
+        """
+        source_keys: {stage name: key} for stages keyed from outside (the
+                     audio content hash, TraceStore keys), whatever their
+                     params; or a callable returning it, called on the first
+                     key lookup (so an uncached run never hashes the audio).
+        cache: look up / store artifacts in FeatureCache / TraceStore.
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.version = version
+        self.cache = cache
+        self.source_keys = source_keys
+        self.keys = None
+        self.artifacts = {}
+        self.status = {} # name -> "computed" | "reused"
+        self.timings = {}
+        self.tainted = set() # Computed from an invalid artifact: never stored
+
+    def key(self, name: str) -> str:
+        if self.keys is None:
+            self.keys = dict(self.source_keys() if callable(self.source_keys) else self.source_keys)
+        if name not in self.keys:
+            stage = self.stages[name]
+            upstream = json.dumps([self.key(i) for i in stage.inputs])
+            self.keys[name] = FeatureCache.key(upstream, self.version, {'stage': name, 'params': stage.params})
+        return self.keys[name]
+
+    def result(self, name: str):
+        """Artifact of a stage: memoized, then cached, then computed from its inputs."""
+        if name in self.artifacts:
+            return self.artifacts[name]
+        stage = self.stages[name]
+        t0 = time.time()
+
+        artifact = self._load(stage) if self._cached(stage) else None
+        if artifact is not None:
+            self.status[name] = "reused"
+        else:
+            inputs = {i: self.result(i) for i in stage.inputs}
+            t0 = time.time() # Own run time, excluding upstream stages
+            artifact = stage.run(inputs)
+            self.status[name] = "computed"
+            if self.tainted.intersection(stage.inputs) or (stage.valid and not stage.valid(artifact)):
+                self.tainted.add(name)
+            elif self._cached(stage):
+                self._store(stage, artifact)
+
+        self.timings[name] = (time.time() - t0) * 1000
+        self.artifacts[name] = artifact
+        return artifact
+
+    def _cached(self, stage: Stage) -> bool:
+        if stage.kind == "trace":
+            return self.cache and TraceStore.ENABLED
+        return self.cache and stage.kind is not None
+
+    def _load(self, stage: Stage):
+        if stage.kind == "trace":
+            stored = TraceStore.get(self.key(stage.name))
+            return None if stored is None else {**stored[0], 'sr': stored[1]}
+        if stage.kind == "arrays":
+            return FeatureCache.get_arrays(self.key(stage.name))
+        return FeatureCache.get(self.key(stage.name))
+
+    def _store(self, stage: Stage, artifact):
+        if stage.kind == "trace":
+            TraceStore.put(self.key(stage.name), artifact, artifact['sr'])
+        elif stage.kind == "arrays":
+            FeatureCache.put_arrays(self.key(stage.name), artifact)
+        else:
+            FeatureCache.put(self.key(stage.name), artifact)
+
+    def report(self) -> dict:
+        """
+        Per stage resolved this run, sources excluded: {'status': computed |
+        reused, 'time_ms'} ('key' too when caching), plus 'stored': False for
+        artifacts computed from an invalid one.
+        """
+        report = {}
+        for name, status in self.status.items():
+            if self.stages[name].inputs:
+                report[name] = {'status': status, 'time_ms': self.timings[name]}
+                if self.cache:
+                    report[name]['key'] = self.key(name)[:16]
+                if name in self.tainted:
+                    report[name]['stored'] = False
+        return report
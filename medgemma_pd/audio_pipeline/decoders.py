@@ -0,0 +1,86 @@
+import importlib.util
+import numpy as np
+
+
+class AudioDecoders:
+    """
+    Block-streaming decoders for compressed formats (Layer 1 / 3 ingestion).
+    A decoded file is exposed as BlockSamples, a lazy stand-in for the
+    memory-mapped WAV array: slicing it seeks and decodes just those frames,
+    so peak / trim scans, triage and streaming preprocessing stay block-wise.
+    Lossless PCM is returned in the dtype scipy's WAV reader would use, so
+    FLAC yields bit-identical samples to the WAV path.
+    The decoding library (soundfile / libsndfile) is imported only when needed.
+    """
+
+    # Extension -> (module, libsndfile format name)
+    FORMATS = {
+        '.flac': ("soundfile", "FLAC"),
+        '.ogg': ("soundfile", "OGG"),
+        '.mp3': ("soundfile", "MP3"),
+    }
+
+    # libsndfile subtype -> numpy dtype of the decoded samples
+    SUBTYPE_DTYPES = {
+        "PCM_S8": "int16", "PCM_U8": "int16", "PCM_16": "int16",
+        "PCM_24": "int32", "PCM_32": "int32",
+        "DOUBLE": "float64",
+    }
+    DEFAULT_DTYPE = "float32" # FLOAT and lossy codecs (Vorbis, Opus, MPEG)
+
+    @staticmethod
+    def supports(ext: str) -> bool:
+        return ext in AudioDecoders.FORMATS
+
+    @staticmethod
+    def available(ext: str) -> bool:
+        """True if a decoder for `ext` is installed and its library handles the format."""
+        if ext not in AudioDecoders.FORMATS:
+            return False
+        module, fmt = AudioDecoders.FORMATS[ext]
+        if importlib.util.find_spec(module) is None:
+            return False
+        import soundfile
+        return fmt in soundfile.available_formats()
+
+    @staticmethod
+    def open(source) -> tuple[int, "BlockSamples"]:
+        """
+        Opens a path or binary file object. Returns (sample_rate, BlockSamples).
+        Raises on unreadable headers.
+        """
+        import soundfile
+
+        handle = soundfile.SoundFile(source)
+        dtype = AudioDecoders.SUBTYPE_DTYPES.get(handle.subtype, AudioDecoders.DEFAULT_DTYPE)
+        return handle.samplerate, BlockSamples(handle, np.dtype(dtype))
+
+
+class BlockSamples:
+    """
+    Array-like view of a compressed file: len(), dtype, ndim, shape and
+    [a:b] slicing (decoded on demand). Reads in file order skip the seek.
+    """
+
+    def __init__(self, handle, dtype: np.dtype):
+        self.handle = handle
+        self.dtype = dtype
+        self.channels = handle.channels
+        self.ndim = 1 if self.channels == 1 else 2
+        self.shape = (handle.frames,) if self.ndim == 1 else (handle.frames, self.channels)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, key) -> np.ndarray:
+        if not isinstance(key, slice) or key.step not in (None, 1):
+            raise TypeError("BlockSamples supports contiguous slices only")
+        a, b, _ = key.indices(len(self))
+        if b <= a:
+            return np.zeros((0,) + self.shape[1:], dtype=self.dtype)
+        if self.handle.tell() != a:
+            self.handle.seek(a)
+        return self.handle.read(b - a, dtype=self.dtype.name, always_2d=self.ndim == 2)
+
+    def close(self):
+        self.handle.close()
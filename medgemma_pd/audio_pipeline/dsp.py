@@ -0,0 +1,204 @@
+import numpy as np
+from functools import lru_cache
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import fft as sp_fft
+
+
+class DSPKernels:
+    """
+    Shared DSP kernels for the audio pipeline (Layers 2-4).
+    Framing, windowing, batched autocorrelation, STFT and peak picking live
+    here once, so every caller gets the same numerics and optimizations.
+    Windows and FFT sizes are memoized per frame length / sample rate.
+    """
+
+    @staticmethod
+    def frame(y: np.ndarray, frame_len: int, hop_len: int, num_frames: int = None) -> np.ndarray:
+        """
+        Strided (num_frames, frame_len) view of y, row i = y[i*hop : i*hop + frame_len].
+        No samples are copied. num_frames defaults to every frame that fits.
+        """
+        if len(y) < frame_len:
+            return np.zeros((0, frame_len), dtype=y.dtype)
+        frames = sliding_window_view(y, frame_len)[::hop_len]
+        return frames if num_frames is None else frames[:num_frames]
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def window(frame_len: int, dtype: str = "float64") -> np.ndarray:
+        """Hann window (np.hanning), cached and read-only."""
+        w = np.hanning(frame_len).astype(dtype)
+        w.flags.writeable = False
+        return w
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def window_acf(frame_len: int) -> np.ndarray:
+        """
+        Normalized autocorrelation r_w(lag) of the Hann analysis window
+        (r_w(0) = 1), lags 0 .. frame_len - 1; cached and read-only.
+        """
+        w = np.hanning(frame_len)
+        r = np.correlate(w, w, mode="full")[frame_len - 1:]
+        r = r / r[0]
+        r.flags.writeable = False
+        return r
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def stft_window(nperseg: int) -> np.ndarray:
+        """scipy.signal.spectrogram's default Tukey(0.25) window, cached and read-only."""
+        from scipy.signal import get_window
+        w = get_window(('tukey', .25), nperseg)
+        w.flags.writeable = False
+        return w
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def fft_size(min_len: int) -> int:
+        """Fastest real-FFT length >= min_len."""
+        return sp_fft.next_fast_len(min_len, real=True)
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def acf_plan(sr: int, frame_len: int, min_f0: float, max_f0: float) -> tuple[int, int, int]:
+        """
+        Lag search range and FFT size for frame ACFs at a sample rate.
+        Returns (min_lag, max_lag, nfft); max_lag is clamped below frame_len.
+        Only lags < max_lag are read, so nfft = frame_len + max_lag keeps them
+        free of circular wrap-around (a full 2n-1 transform is not needed).
+        """
+        min_lag = int(sr / max_f0)
+        max_lag = min(int(sr / min_f0), frame_len - 1)
+        return min_lag, max_lag, DSPKernels.fft_size(frame_len + max_lag)
+
+    @staticmethod
+    def acf(windowed: np.ndarray, nfft: int) -> np.ndarray:
+        """
+        Autocorrelation of each row (or of a 1-D signal) via real FFTs.
+        Lags below nfft - len + 1 are exact linear ACF values.
+        """
+        spec = sp_fft.rfft(windowed, n=nfft, axis=-1)
+        return sp_fft.irfft(spec.real ** 2 + spec.imag ** 2, n=nfft, axis=-1)
+
+    @staticmethod
+    def xcorr(a: np.ndarray, b: np.ndarray, nfft: int) -> np.ndarray:
+        """
+        Row-wise cross-correlation c[tau] = sum_j a[j] * b[j + tau] via real FFTs.
+        Exact (no wrap-around) for tau <= nfft - len(a) when len(b) <= nfft.
+        """
+        spec_a = sp_fft.rfft(a, n=nfft, axis=-1)
+        return sp_fft.irfft(np.conj(spec_a) * sp_fft.rfft(b, n=nfft, axis=-1), n=nfft, axis=-1)
+
+    @staticmethod
+    def cepstrum(windowed: np.ndarray, nfft: int) -> np.ndarray:
+        """Real cepstrum (inverse FFT of the log magnitude spectrum) of each row."""
+        log_mag = np.log(np.abs(sp_fft.rfft(windowed, n=nfft, axis=-1)) + 1e-12)
+        return sp_fft.irfft(log_mag, n=nfft, axis=-1)
+
+    @staticmethod
+    def pick_peaks(values: np.ndarray, lo: int, hi: int) -> tuple[np.ndarray, np.ndarray]:
+        """Index (first on ties) and value of the maximum of values[..., lo:hi] per row."""
+        segment = values[..., lo:hi]
+        idx = np.argmax(segment, axis=-1)
+        return lo + idx, np.take_along_axis(segment, idx[..., None], axis=-1)[..., 0]
+
+    @staticmethod
+    def acf_peaks(windowed: np.ndarray, nfft: int, min_lag: int, max_lag: int) -> tuple:
+        """Best lag in [min_lag, max_lag), its ACF value and ACF lag 0 for each windowed frame."""
+        acf = DSPKernels.acf(windowed, nfft)
+        lag, peak_val = DSPKernels.pick_peaks(acf, min_lag, max_lag)
+        return lag, peak_val, acf[..., 0]
+
+    @staticmethod
+    def acf_lags(windowed: np.ndarray, first_lag: np.ndarray, n_lags: int) -> np.ndarray:
+        """
+        Exact linear ACF of each row at lags first_lag .. first_lag + n_lags - 1
+        by direct dot products (no FFT). first_lag: (frames,) or (frames, k).
+        Returns first_lag.shape + (n_lags,). The n_lags lagged copies overlap, so
+        one contiguous stretch of len + n_lags - 1 samples serves all of them.
+        """
+        first_lag = np.asarray(first_lag, dtype=np.int64)
+        k, n = windowed.shape
+        if k == 0:
+            return np.zeros(first_lag.shape + (n_lags,), dtype=windowed.dtype)
+
+        padded = np.zeros((k, n + int(first_lag.max()) + n_lags), dtype=windowed.dtype)
+        padded[:, :n] = windowed
+        stretches = sliding_window_view(padded, n + n_lags - 1, axis=1)
+        rows = np.arange(k).reshape((k,) + (1,) * (first_lag.ndim - 1))
+        shifted = sliding_window_view(stretches[rows, first_lag], n, axis=-1)  # (..., lag, n)
+        return np.einsum("k...ln,kn->k...l", shifted, windowed)
+
+    @staticmethod
+    def frame_stats(y: np.ndarray, hop_len: int, clip_level: float = 0.99, block_cells: int = 4096) -> dict:
+        """
+        Statistics table over consecutive non-overlapping cells of hop_len samples
+        (the last cell may be partial), built in one blocked pass over y:
+          energy  - sum of squares (float64)
+          peak    - max |y|
+          clipped - samples with |y| >= clip_level
+          zc      - sign changes between each sample of the cell and its predecessor
+          zc_edge - whether the cell's first sample is such a change
+        Frame-level values for frames spanning whole cells follow by summing cells
+        (frame_cells), so QC and the feature gate need no extra passes.
+        """
+        n = len(y)
+        n_cells = -(-n // hop_len)
+        table = {
+            "hop": hop_len,
+            "n": n,
+            "energy": np.zeros(n_cells),
+            "peak": np.zeros(n_cells, dtype=y.dtype),
+            "clipped": np.zeros(n_cells, dtype=np.int64),
+            "zc": np.zeros(n_cells, dtype=np.int64),
+            "zc_edge": np.zeros(n_cells, dtype=bool),
+        }
+        step = block_cells * hop_len
+        prev_sign = None
+        for a in range(0, n, step):
+            blk = y[a : a + step]
+            starts = np.arange(0, len(blk), hop_len)
+            cells = slice(a // hop_len, a // hop_len + len(starts))
+            mag = np.abs(blk)
+            table["energy"][cells] = np.add.reduceat(np.square(blk, dtype=np.float64), starts)
+            table["peak"][cells] = np.maximum.reduceat(mag, starts)
+            table["clipped"][cells] = np.add.reduceat(mag >= clip_level, starts, dtype=np.int64)
+
+            signs = np.signbit(blk)
+            change = np.empty(len(blk), dtype=bool)
+            change[0] = prev_sign is not None and signs[0] != prev_sign
+            np.not_equal(signs[1:], signs[:-1], out=change[1:])
+            prev_sign = signs[-1]
+            table["zc"][cells] = np.add.reduceat(change, starts, dtype=np.int64)
+            table["zc_edge"][cells] = change[starts]
+        return table
+
+    @staticmethod
+    def frame_cells(values: np.ndarray, cells_per_frame: int, num_frames: int) -> np.ndarray:
+        """Sums of cells [i, i + cells_per_frame) for frames i < num_frames (one frame per cell)."""
+        if num_frames <= 0:
+            return np.zeros(0, dtype=values.dtype)
+        return sliding_window_view(values, cells_per_frame)[:num_frames].sum(axis=1)
+
+    @staticmethod
+    def spectrogram(y: np.ndarray, sr: int, nperseg: int = 1024, noverlap: int = 512) -> tuple:
+        """
+        Power spectral density STFT, equal to scipy.signal.spectrogram with its
+        defaults (Tukey(0.25) window, per-segment mean removed):
+        (freqs, times, Sxx[freq, time]).
+        """
+        y = np.asarray(y, dtype=np.float64)
+        nperseg = min(nperseg, len(y))
+        hop = nperseg - min(noverlap, nperseg - 1)
+        frames = DSPKernels.frame(y, nperseg, hop)
+        window = DSPKernels.stft_window(nperseg)
+
+        segments = (frames - frames.mean(axis=1, keepdims=True)) * window
+        Sxx = np.abs(sp_fft.rfft(segments, axis=1)) ** 2 / (sr * np.sum(window ** 2))
+        # One-sided density: double every bin except DC (and Nyquist for even lengths)
+        Sxx[:, 1:(nperseg + 1) // 2] *= 2
+
+        freqs = sp_fft.rfftfreq(nperseg, 1 / sr)
+        times = (np.arange(len(frames)) * hop + nperseg / 2) / sr
+        return freqs, times, Sxx.T
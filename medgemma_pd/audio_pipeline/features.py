@@ -1,35 +1,178 @@
 import numpy as np
 import warnings
-
-# Try importing extraction libraries
-# CRITICAL: External libraries are causing crashes in this env.
-# unique implementation using Numpy/Scipy only.
-PARSELMOUTH_AVAILABLE = False
-LIBROSA_AVAILABLE = False
+from numpy.lib.stride_tricks import sliding_window_view
+from .dsp import DSPKernels
+from .pitch_backends import PitchBackends
 
 class FeatureExtractor:
     """
     Layer 4: Feature Extraction
-    Extracts clinical biomarkers using PRAAT/Librosa.
-    Falls back to synthetic values if libraries are missing.
+    Extracts clinical biomarkers with a pluggable pitch tracker (see
+    PitchBackends). The default NumPy/Scipy ACF backend has no optional
+    dependencies; library backends (Praat) are imported only when selected.
     """
 
+    # Constants for Speech Analysis
+    FRAME_DUR = 0.04 # 40ms analysis window
+    HOP_DUR = 0.01   # 10ms hop
+    MIN_F0 = 75      # Hz
+    MAX_F0 = 600     # Hz
+    MIN_ENERGY = 0.001        # ACF lag-0 energy floor for voicing
+    VOICING_THRESHOLD = 0.45  # Normalized ACF peak required for a voiced frame
+    ACF_BLOCK_FRAMES = 256    # Frames per batched FFT (cache-sized, bounds memory)
+    ZCR_MAX = 0.45            # Zero crossings per sample above which a frame is noise-like
+    PITCH_METHOD = "acf"      # Default pitch backend (PitchBackends.names())
+    DECIMATION = 4            # coarse_to_fine: decimation factor of the coarse stage
+    COARSE_CANDIDATES = 3     # coarse_to_fine: decimated ACF peaks refined at full rate
+    REFINE_RADIUS = 2         # coarse_to_fine: full-rate lags checked each side of a coarse peak
+    YIN_THRESHOLD = 0.15      # yin: CMND dip accepted as the period
+    YIN_MAX_APERIODICITY = 0.35  # yin: CMND at the chosen lag above which a frame is unvoiced
+    CEPSTRUM_REFINE_RADIUS = 6   # cepstral: full-rate ACF lags checked each side of the quefrency peak
+    BATCH_MAX_SAMPLES = 4_000_000  # Samples packed per bucket in extract_features_batch
+
+    # Stable segment selection
+    MEDFILT_KERNEL = 5          # Median filter over voiced f0 (octave-jump removal)
+    MIN_STABLE_FRAMES = 30      # 0.30 s minimum before a window search is attempted
+    STABLE_WINDOW_FRAMES = 50   # 0.5 s candidate windows
+    AMP_GATE_RATIO = 0.2        # Window mean amplitude vs. recording peak
+
     @staticmethod
-    def extract_features(y: np.ndarray, sr: int) -> dict:
+    def extract_features(y: np.ndarray, sr: int, jitter_profile: bool = False, pitch_method: str = None,
+                         frame_stats: dict = None) -> dict:
         """
         Runs analysis on the numpy array.
+        jitter_profile: also return the per-window jitter/shimmer curve
+                        scored during stable-segment selection.
+        pitch_method: pitch backend name (PitchBackends.names()); defaults to PITCH_METHOD.
+        frame_stats: DSPKernels.frame_stats table of y with HOP_DUR cells (shared
+                     with QC); the ACF backend then skips frames the table
+                     already rules out before windowing them.
         Returns: Dictionary of valid clinical features.
         """
         features = {}
 
-        # --- 1. Jitter / Shimmer / HNR (Praat) ---
-        if True: # Force Numpy Implementation
-             FeatureExtractor._extract_numpy_features(y, sr, features)
-        else:
-             pass
+        # --- 1. Jitter / Shimmer / HNR ---
+        FeatureExtractor._extract_numpy_features(y, sr, features, jitter_profile, pitch_method, frame_stats)
+
+        return features
+
+    @staticmethod
+    def extract_features_batch(recordings: list, sr: int, jitter_profile: bool = False,
+                               pitch_method: str = None) -> list:
+        """
+        Batched extract_features for many recordings at the same sample rate.
+        Recordings are bucketed by length and ragged-packed per bucket, so framing,
+        FFT and pitch picking run once per bucket (ACF tracker; other pitch
+        methods track each recording separately).
+        Returns: List of feature dictionaries, in input order.
+        """
+        results = [{} for _ in recordings]
+
+        for bucket in FeatureExtractor._length_buckets(recordings):
+            try:
+                traces = FeatureExtractor._track_bucket([recordings[i] for i in bucket], sr, pitch_method)
+                for i, trace in zip(bucket, traces):
+                    FeatureExtractor._summarize_trace(trace, sr, results[i], jitter_profile)
+
+            except Exception as e:
+                # Never lose a whole bucket: fall back to per-recording extraction
+                print(f"[Features] Batch Error: {e}. Retrying bucket per recording.")
+                for i in bucket:
+                    results[i] = FeatureExtractor.extract_features(recordings[i], sr, jitter_profile, pitch_method)
+
+        return results
+
+    @staticmethod
+    def _length_buckets(recordings: list) -> list:
+        """
+        Index lists of recordings: grouped by compute dtype (a packed bucket
+        has one dtype, so float32 input stays single precision), sorted by
+        length, filled up to BATCH_MAX_SAMPLES.
+        """
+        dtypes = [FeatureExtractor._compute_dtype(y) for y in recordings]
+        order = sorted(range(len(recordings)), key=lambda i: (dtypes[i].itemsize, len(recordings[i])))
+        buckets, current, current_len = [], [], 0
+        for i in order:
+            if current and (current_len + len(recordings[i]) > FeatureExtractor.BATCH_MAX_SAMPLES
+                            or dtypes[i] != dtypes[current[0]]):
+                buckets.append(current)
+                current, current_len = [], 0
+            current.append(i)
+            current_len += len(recordings[i])
+        if current:
+            buckets.append(current)
+        return buckets
+
+    @staticmethod
+    def _track_bucket(recordings: list, sr: int, pitch_method: str = None) -> list:
+        """Frame traces of one length bucket (packed ACF, or one backend call per recording)."""
+        signals = [np.asarray(y, dtype=FeatureExtractor._compute_dtype(y)) for y in recordings]
+        if (pitch_method or FeatureExtractor.PITCH_METHOD) == "acf":
+            return FeatureExtractor._track_pitch_acf_packed(signals, sr)
+        return [FeatureExtractor._track_pitch(y, sr, pitch_method) for y in signals]
+
+    @staticmethod
+    def track(y: np.ndarray, sr: int, pitch_method: str = None, frame_stats: dict = None) -> dict:
+        """
+        Per-frame pitch trace of one recording, the part of extract_features
+        that touches audio: {'lag', 'peak_val', 'energy', 'amp', 'acf_computed'}.
+        Persist it (TraceStore) and re-run features_from_trace with other
+        downstream parameters without decoding or re-tracking.
+        """
+        return FeatureExtractor._track_pitch(y, sr, pitch_method, frame_stats)
 
+    @staticmethod
+    def track_batch(recordings: list, sr: int, pitch_method: str = None) -> list:
+        """track() for many recordings, bucketed and packed like extract_features_batch. Input order."""
+        traces = [None] * len(recordings)
+        for bucket in FeatureExtractor._length_buckets(recordings):
+            try:
+                bucket_traces = FeatureExtractor._track_bucket([recordings[i] for i in bucket], sr, pitch_method)
+            except Exception as e:
+                print(f"[Features] Batch Error: {e}. Retrying bucket per recording.")
+                bucket_traces = [FeatureExtractor.track(recordings[i], sr, pitch_method) for i in bucket]
+            for i, trace in zip(bucket, bucket_traces):
+                traces[i] = trace
+        return traces
+
+    @staticmethod
+    def features_from_trace(trace: dict, sr: int, jitter_profile: bool = False, voicing_threshold: float = None,
+                            stable_window_frames: int = None, medfilt_kernel: int = None) -> dict:
+        """
+        Jitter, shimmer, HNR and F0 statistics from a stored frame trace alone.
+        With the default parameters this equals extract_features on the audio
+        the trace came from (up to the precision the trace was stored in).
+        voicing_threshold: normalized ACF peak for a voiced frame (VOICING_THRESHOLD).
+        stable_window_frames: stable-window length in frames (STABLE_WINDOW_FRAMES).
+        medfilt_kernel: odd median-filter length over voiced f0 (MEDFILT_KERNEL).
+        """
+        features = {}
+        try:
+            FeatureExtractor._summarize_trace(trace, sr, features, jitter_profile, voicing_threshold,
+                                              stable_window_frames, medfilt_kernel)
+        except Exception as e:
+            print(f"[Features] Trace Error: {e}")
+            features["valid_voice_detected"] = False
         return features
 
+    @staticmethod
+    def extract_features_stream(chunks, sr: int, jitter_profile: bool = False) -> dict:
+        """
+        Streaming mode for long recordings (telemonitoring sessions).
+        chunks: iterable of 1-D audio arrays at `sr`, in order.
+        Always uses the full-rate ACF tracker.
+        Returns: the same feature dictionary as extract_features, with memory
+        bounded by the chunk size rather than the recording length.
+        """
+        stream = FeatureStream(sr, jitter_profile)
+        try:
+            for chunk in chunks:
+                stream.push(chunk)
+            return stream.finalize()
+        except Exception as e:
+            print(f"[Features] Stream Error: {e}")
+            return {"valid_voice_detected": False}
+
     @staticmethod
     def _fill_mock_praat(features: dict):
         """Generates realistic mock values for PD biomarkers."""
@@ -42,7 +185,475 @@ class FeatureExtractor:
         features["hnr"] = float(np.random.uniform(12.0, 25.0)) # Lower is worse
 
     @staticmethod
-    def _extract_numpy_features(y: np.ndarray, sr: int, features: dict):
+    def _frame_params(sr: int) -> tuple[int, int, int, int]:
+        """Frame length, hop length and ACF lag search range for a sample rate."""
+        frame_len = int(sr * FeatureExtractor.FRAME_DUR)
+        hop_len = int(sr * FeatureExtractor.HOP_DUR)
+        # Lag search range (same clamping as the original per-frame loop)
+        min_lag, max_lag, _ = DSPKernels.acf_plan(sr, frame_len, FeatureExtractor.MIN_F0, FeatureExtractor.MAX_F0)
+        return frame_len, hop_len, min_lag, max_lag
+
+    @staticmethod
+    def _compute_dtype(y: np.ndarray) -> np.dtype:
+        """float32 signals are analysed in single precision, anything else in float64."""
+        return np.dtype(np.float32) if np.asarray(y).dtype == np.float32 else np.dtype(np.float64)
+
+    @staticmethod
+    def _track_pitch(y: np.ndarray, sr: int, method: str = None, frame_stats: dict = None) -> dict:
+        """Frame trace from the selected pitch backend (see PITCH_METHOD)."""
+        method = method or FeatureExtractor.PITCH_METHOD
+        if method == "acf" and frame_stats is not None:
+            return FeatureExtractor._track_pitch_acf(y, sr, frame_stats)
+        return PitchBackends.get(method)(y, sr)
+
+    @staticmethod
+    def _track_pitch_acf(y: np.ndarray, sr: int, frame_stats: dict = None) -> dict:
+        """
+        Vectorized frame-level autocorrelation engine.
+        Frames the whole signal as a strided view (no copies) and runs batched
+        real FFTs over blocks of frames instead of one complex FFT per hop.
+        With a frame_stats table, only frames it cannot rule out are gathered.
+        Returns per-frame arrays: best lag, ACF peak value, lag-0 energy,
+        peak amplitude of the windowed frame and whether the ACF was run.
+        """
+        frame_len, hop_len, _, _ = FeatureExtractor._frame_params(sr)
+        num_frames = max((len(y) - frame_len) // hop_len, 0)
+        if num_frames == 0:
+            return FeatureExtractor._acf_trace(np.zeros((0, frame_len), dtype=FeatureExtractor._compute_dtype(y)), sr)
+
+        # Strided view: row i is y[i*hop : i*hop + frame_len]
+        frames = DSPKernels.frame(y, frame_len, hop_len, num_frames)
+        rows = FeatureExtractor._table_rows(frame_stats, len(y), sr, num_frames) if frame_stats else None
+        if rows is None:
+            return FeatureExtractor._acf_trace(frames, sr)
+
+        # Frames outside `rows` keep the empty-trace values (zero peak: unvoiced)
+        trace = FeatureExtractor._empty_trace(num_frames, FeatureExtractor._compute_dtype(y))
+        for key, values in FeatureExtractor._acf_trace(frames, sr, rows).items():
+            trace[key][rows] = values
+        return trace
+
+    @staticmethod
+    def _table_rows(frame_stats: dict, n_samples: int, sr: int, num_frames: int) -> np.ndarray:
+        """
+        Frames that can pass _frame_gate according to a frame_stats table:
+        unwindowed energy above the floor (an upper bound of the windowed
+        energy) and the exact zero-crossing rate. None if the table's cells do
+        not tile the analysis frames.
+        """
+        frame_len, hop_len, _, _ = FeatureExtractor._frame_params(sr)
+        if frame_stats["hop"] != hop_len or frame_stats["n"] != n_samples or frame_len % hop_len:
+            return None
+        k = frame_len // hop_len
+        energy = DSPKernels.frame_cells(frame_stats["energy"], k, num_frames)
+        # Crossings inside the frame: the cells' counts minus the one into its first sample
+        crossings = DSPKernels.frame_cells(frame_stats["zc"], k, num_frames) - frame_stats["zc_edge"][:num_frames]
+        zcr = crossings / (frame_len - 1)
+        possible = (energy > FeatureExtractor.MIN_ENERGY * (1 - 1e-6)) & (zcr <= FeatureExtractor.ZCR_MAX)
+        return np.flatnonzero(possible)
+
+    @staticmethod
+    def _track_pitch_acf_packed(signals: list, sr: int) -> list:
+        """
+        Ragged-packed variant of _track_pitch_acf for several recordings.
+        Each recording is copied to a hop-aligned slot of one buffer, so a single
+        strided view frames them all; only frames lying fully inside a recording
+        are analysed. Returns one trace per input signal.
+        """
+        frame_len, hop_len, _, _ = FeatureExtractor._frame_params(sr)
+        counts = [max((len(y) - frame_len) // hop_len, 0) for y in signals]
+        slots = [-(-len(y) // hop_len) * hop_len for y in signals]
+        offsets = np.concatenate(([0], np.cumsum(slots))).astype(np.int64)
+
+        packed = np.zeros(offsets[-1] + frame_len, dtype=np.result_type(*signals) if signals else float)
+        for y, off in zip(signals, offsets):
+            packed[off : off + len(y)] = y
+
+        frames = DSPKernels.frame(packed, frame_len, hop_len)
+        rows = np.concatenate([off // hop_len + np.arange(c, dtype=np.int64)
+                               for off, c in zip(offsets, counts)])
+        trace = FeatureExtractor._acf_trace(frames, sr, rows)
+
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+        return [{k: v[bounds[i]:bounds[i + 1]] for k, v in trace.items()}
+                for i in range(len(signals))]
+
+    @staticmethod
+    def _acf_trace(frames: np.ndarray, sr: int, rows: np.ndarray = None) -> dict:
+        """
+        Batched ACF pitch picking over a (num_frames, frame_len) frame matrix.
+        rows: optional frame indices to analyse (gathered block by block).
+        A cheap energy / zero-crossing pre-pass runs first; frames that cannot
+        be voiced (silence, noise-like consonants) skip the FFT and keep a zero
+        ACF peak, so _voiced_mask rejects them as before.
+        """
+        frame_len, _, min_lag, max_lag = FeatureExtractor._frame_params(sr)
+        num_frames = len(rows) if rows is not None else len(frames)
+        # float32 input stays float32 end to end (single-precision FFTs)
+        dtype = FeatureExtractor._compute_dtype(frames)
+
+        trace = FeatureExtractor._empty_trace(num_frames, dtype)
+        if num_frames == 0 or max_lag <= min_lag:
+            return trace
+
+        window = DSPKernels.window(frame_len, dtype)
+        _, _, nfft = DSPKernels.acf_plan(sr, frame_len, FeatureExtractor.MIN_F0, FeatureExtractor.MAX_F0)
+
+        # Blocked so a 10 min recording does not materialize every spectrum at once
+        block = FeatureExtractor.ACF_BLOCK_FRAMES
+        for s in range(0, num_frames, block):
+            e = min(s + block, num_frames)
+            raw = frames[rows[s:e]] if rows is not None else frames[s:e]
+            windowed = raw * window
+
+            # --- Pre-pass: energy (= ACF lag 0) and zero-crossing rate ---
+            energy, amp, candidate = FeatureExtractor._frame_gate(raw, windowed)
+            trace["energy"][s:e] = energy
+            trace["amp"][s:e] = amp
+            idx = np.flatnonzero(candidate)
+            if len(idx) == 0:
+                continue
+
+            lag, peak_val, acf0 = DSPKernels.acf_peaks(windowed[idx], nfft, min_lag, max_lag)
+            trace["lag"][s + idx] = lag
+            trace["peak_val"][s + idx] = peak_val
+            trace["energy"][s + idx] = acf0
+            trace["acf_computed"][s + idx] = True
+
+        return trace
+
+    @staticmethod
+    def _frame_gate(raw: np.ndarray, windowed: np.ndarray) -> tuple:
+        """
+        Pre-pass over a block of frames: windowed energy (= ACF lag 0), peak
+        amplitude and the mask of frames that could be voiced.
+        """
+        energy = np.einsum("ij,ij->i", windowed, windowed)
+        signs = np.signbit(raw)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (raw.shape[1] - 1)
+        # The energy floor is applied with a small margin so rounding
+        # differences against the FFT lag-0 value never change a decision
+        candidate = (energy > FeatureExtractor.MIN_ENERGY * (1 - 1e-6)) & (zcr <= FeatureExtractor.ZCR_MAX)
+        return energy, np.max(np.abs(windowed), axis=1), candidate
+
+    @staticmethod
+    def _coarse_lags(windowed: np.ndarray, nfft: int, min_lag: int, max_lag: int) -> np.ndarray:
+        """
+        The COARSE_CANDIDATES highest ACF peaks per frame as fractional lags
+        (parabola through each peak and its neighbours). Several peaks are kept
+        because decimation can reorder near-equal peaks at multiples of the period.
+        """
+        acf = DSPKernels.acf(windowed, nfft)
+
+        # Local maxima inside the range; the range edges count as peaks too
+        left, mid, right = acf[:, min_lag - 1:max_lag - 1], acf[:, min_lag:max_lag], acf[:, min_lag + 1:max_lag + 1]
+        peaks = (mid >= left) & (mid >= right)
+        peaks[:, [0, -1]] = True
+        scored = np.where(peaks, mid, -np.inf)
+
+        k = min(FeatureExtractor.COARSE_CANDIDATES, scored.shape[1])
+        top = np.argpartition(-scored, k - 1, axis=1)[:, :k]
+        rows = np.arange(len(acf))[:, None]
+        l, m, r = left[rows, top], mid[rows, top], right[rows, top]
+        curv = l - 2 * m + r
+        delta = np.divide(0.5 * (l - r), curv, out=np.zeros_like(m), where=curv < 0)
+        return min_lag + top + np.clip(delta, -0.5, 0.5)
+
+    @staticmethod
+    def _empty_trace(num_frames: int, dtype: np.dtype) -> dict:
+        """Frame trace arrays, every frame unvoiced (zero peak) and not analysed."""
+        return {
+            "lag": np.ones(num_frames, dtype=np.int64),
+            "peak_val": np.zeros(num_frames, dtype=dtype),
+            "energy": np.zeros(num_frames, dtype=dtype),
+            "amp": np.zeros(num_frames, dtype=dtype),
+            "acf_computed": np.zeros(num_frames, dtype=bool),
+        }
+
+    @staticmethod
+    def _gated_trace(y: np.ndarray, sr: int, pick) -> dict:
+        """
+        Shared frame loop for the non-FFT-ACF backends. Frames and gates the
+        signal like _acf_trace, then calls pick(raw, windowed, rows) on the
+        frames that could be voiced; it returns (lag, peak_val) per frame,
+        peak_val being the windowed ACF at that lag (0 marks a frame unvoiced).
+        """
+        frame_len, hop_len, _, _ = FeatureExtractor._frame_params(sr)
+        num_frames = max((len(y) - frame_len) // hop_len, 0)
+        dtype = FeatureExtractor._compute_dtype(y)
+        y = np.asarray(y, dtype=dtype)
+        trace = FeatureExtractor._empty_trace(num_frames, dtype)
+        if num_frames == 0:
+            return trace
+
+        frames = DSPKernels.frame(y, frame_len, hop_len, num_frames)
+        window = DSPKernels.window(frame_len, dtype)
+
+        block = FeatureExtractor.ACF_BLOCK_FRAMES
+        for s in range(0, num_frames, block):
+            e = min(s + block, num_frames)
+            raw = frames[s:e]
+            windowed = raw * window
+            energy, amp, candidate = FeatureExtractor._frame_gate(raw, windowed)
+            trace["energy"][s:e] = energy
+            trace["amp"][s:e] = amp
+            idx = np.flatnonzero(candidate)
+            if len(idx) == 0:
+                continue
+
+            lag, peak_val = pick(raw[idx], windowed[idx], s + idx)
+            trace["lag"][s + idx] = lag
+            trace["peak_val"][s + idx] = peak_val
+            trace["acf_computed"][s + idx] = True
+
+        return trace
+
+    @staticmethod
+    def _track_pitch_coarse_to_fine(y: np.ndarray, sr: int) -> dict:
+        """
+        Two-stage pitch tracker, same frame grid and trace layout as _track_pitch_acf.
+        Stage 1: ACF on a DECIMATION-times decimated signal gives a few coarse
+        peak lags per frame.
+        Stage 2: each is refined at full rate over +/- REFINE_RADIUS lags with
+        direct dot products (exact linear ACF values, no full-rate FFT).
+        Falls back to the full ACF when the hop is not a multiple of DECIMATION.
+        """
+        from scipy.signal import resample_poly
+
+        q = FeatureExtractor.DECIMATION
+        radius = FeatureExtractor.REFINE_RADIUS
+        frame_len, hop_len, min_lag, max_lag = FeatureExtractor._frame_params(sr)
+        if hop_len % q or frame_len % q or len(y) < frame_len + hop_len or max_lag - min_lag <= 2 * radius:
+            return FeatureExtractor._track_pitch_acf(y, sr)
+
+        # --- Stage 1 setup: decimated signal framed on the same grid ---
+        dtype = FeatureExtractor._compute_dtype(y)
+        y_dec = resample_poly(np.asarray(y, dtype=dtype), 1, q).astype(dtype, copy=False)
+        frame_dec, hop_dec = frame_len // q, hop_len // q
+        min_dec = max(min_lag // q - 1, 1)
+        max_dec = min(-(-max_lag // q) + 1, frame_dec - 1)
+        nfft_dec = DSPKernels.fft_size(frame_dec + max_dec)
+        frames_dec = DSPKernels.frame(y_dec, frame_dec, hop_dec)
+        window_dec = DSPKernels.window(frame_dec, dtype)
+
+        def pick(raw, windowed, rows):
+            coarse = FeatureExtractor._coarse_lags(frames_dec[rows] * window_dec, nfft_dec, min_dec, max_dec)
+
+            # --- Stage 2: +/- radius lags around each coarse estimate, inside the search range ---
+            centre = np.clip(np.rint(coarse * q).astype(np.int64), min_lag + radius, max_lag - 1 - radius)
+            r = DSPKernels.acf_lags(windowed, centre - radius, 2 * radius + 1).reshape(len(rows), -1)
+            lags = (centre[:, :, None] + np.arange(-radius, radius + 1)).reshape(len(rows), -1)
+
+            best = np.argmax(r, axis=1)
+            k = np.arange(len(rows))
+            return lags[k, best], r[k, best]
+
+        return FeatureExtractor._gated_trace(y, sr, pick)
+
+    @staticmethod
+    def _track_pitch_yin(y: np.ndarray, sr: int) -> dict:
+        """
+        Vectorized YIN tracker (de Cheveigne & Kawahara, 2002).
+        Difference function over an integration window of frame_len - max_lag
+        samples (batched FFT cross-correlation + energy prefix sums), cumulative
+        mean normalized difference (CMND), first dip below YIN_THRESHOLD (else
+        the global minimum). Frames whose CMND at that lag exceeds
+        YIN_MAX_APERIODICITY are marked unvoiced.
+        """
+        frame_len, _, min_lag, max_lag = FeatureExtractor._frame_params(sr)
+        width = frame_len - max_lag
+        nfft = DSPKernels.fft_size(frame_len)
+        taus = np.arange(max_lag + 1)
+
+        def pick(raw, windowed, rows):
+            # d(tau) = sum_j (x_j - x_{j+tau})^2 = e(0) + e(tau) - 2 r(tau), j < width
+            cross = DSPKernels.xcorr(raw[:, :width], raw, nfft)[:, :max_lag + 1]
+            csum = np.concatenate((np.zeros((len(raw), 1), dtype=raw.dtype), np.cumsum(raw ** 2, axis=1)), axis=1)
+            e_tau = csum[:, taus + width] - csum[:, taus]
+            diff = np.maximum(e_tau[:, :1] + e_tau - 2 * cross, 0)
+
+            # CMND: d'(tau) = d(tau) * tau / sum_{1..tau} d
+            running = np.cumsum(diff[:, 1:], axis=1)
+            cmnd = np.ones_like(diff)
+            cmnd[:, 1:] = np.divide(diff[:, 1:] * taus[1:], running, out=np.ones_like(running), where=running > 0)
+
+            search = cmnd[:, min_lag:max_lag]
+            below = search < FeatureExtractor.YIN_THRESHOLD
+            first = np.where(below.any(axis=1), np.argmax(below, axis=1), np.argmin(search, axis=1))
+            # Walk down to the bottom of the dip: first non-decreasing step at or after `first`
+            cols = np.arange(search.shape[1])
+            rising = np.ones_like(below)
+            rising[:, :-1] = search[:, 1:] >= search[:, :-1]
+            best = np.argmax(rising & (cols >= first[:, None]), axis=1)
+
+            k = np.arange(len(raw))
+            lag = min_lag + best
+            peak_val = DSPKernels.acf_lags(windowed, lag, 1)[:, 0]
+            voiced = search[k, best] <= FeatureExtractor.YIN_MAX_APERIODICITY
+            return lag, np.where(voiced, peak_val, 0)
+
+        return FeatureExtractor._gated_trace(y, sr, pick)
+
+    @staticmethod
+    def _track_pitch_cepstral(y: np.ndarray, sr: int) -> dict:
+        """
+        Cepstral tracker: the period is the quefrency of the highest real
+        cepstrum peak in [min_lag, max_lag). Cepstral peaks are broad for a
+        40 ms frame, so the lag is snapped to the largest ACF value within
+        CEPSTRUM_REFINE_RADIUS (direct dot products); voicing is left to the
+        ACF check at that lag.
+        """
+        frame_len, _, min_lag, max_lag = FeatureExtractor._frame_params(sr)
+        nfft = DSPKernels.fft_size(2 * frame_len)
+
+        radius = min(FeatureExtractor.CEPSTRUM_REFINE_RADIUS, (max_lag - min_lag - 1) // 2)
+
+        def pick(raw, windowed, rows):
+            quefrency, _ = DSPKernels.pick_peaks(DSPKernels.cepstrum(windowed, nfft), min_lag, max_lag)
+            first = np.clip(quefrency - radius, min_lag, max_lag - 1 - 2 * radius)
+            r = DSPKernels.acf_lags(windowed, first, 2 * radius + 1)
+            best = np.argmax(r, axis=1)
+            return first + best, r[np.arange(len(r)), best]
+
+        return FeatureExtractor._gated_trace(y, sr, pick)
+
+    @staticmethod
+    def _voiced_mask(trace: dict, threshold: float = None) -> np.ndarray:
+        """Voicing decision (HNR-like check) for every frame of an ACF trace."""
+        energy = trace["energy"]
+        ratio = np.divide(trace["peak_val"], energy, out=np.zeros_like(energy), where=energy > 0)
+        # STRICTER THRESHOLD: 0.45 (was 0.25) to reject noise/breathiness
+        threshold = FeatureExtractor.VOICING_THRESHOLD if threshold is None else threshold
+        return (energy > FeatureExtractor.MIN_ENERGY) & (ratio > threshold)
+
+    @staticmethod
+    def _stable_window_search(f0_arr: np.ndarray, amp_arr: np.ndarray, window_frames: int = None) -> tuple[int, int, dict]:
+        """
+        Linear-time "Jitter Minimization" search.
+        Scores every candidate window at once from prefix sums of periods,
+        amplitudes and their absolute differences (O(N) instead of O(N*W)).
+        Returns: (best_start, best_end, curves) where curves holds the
+        per-window jitter, shimmer and amplitude-gate result.
+        """
+        n = len(f0_arr)
+        empty = {"jitter": np.zeros(0), "shimmer": np.zeros(0), "amplitude_passed": np.zeros(0, dtype=bool)}
+        if n < FeatureExtractor.MIN_STABLE_FRAMES:
+            return 0, n, empty
+
+        # We check windows of 0.5 second (50 frames) or the whole trace if shorter
+        w = min(window_frames or FeatureExtractor.STABLE_WINDOW_FRAMES, n)
+        # Candidate starts 0 .. n-w-1 (the final window is not scored, as before)
+        n_win = n - w
+        if n_win <= 0:
+            return 0, w, empty
+
+        jitter, shimmer, mean_amp = FeatureExtractor._window_scores(f0_arr, amp_arr, w, n_win)
+
+        # Amplitude Gate (Must be significant part of signal), evaluated once
+        passed = mean_amp >= FeatureExtractor.AMP_GATE_RATIO * np.max(amp_arr)
+
+        best_start = 0
+        if np.any(passed):
+            best_start = FeatureExtractor._first_min(np.where(passed, jitter, np.inf), f0_arr, w)
+
+        curves = {"jitter": jitter, "shimmer": shimmer, "amplitude_passed": passed}
+        return best_start, best_start + w, curves
+
+    @staticmethod
+    def _window_scores(f0_arr: np.ndarray, amp_arr: np.ndarray, w: int, n_win: int) -> tuple:
+        """
+        Jitter, shimmer and mean amplitude of the n_win windows of length w
+        starting at 0, 1, ... computed from prefix sums.
+        """
+        def prefix(x):
+            return np.concatenate(([0.0], np.cumsum(x)))
+
+        periods = 1.0 / (f0_arr + 1e-9)
+        c_per = prefix(periods)
+        c_dper = prefix(np.abs(np.diff(periods)))
+        c_amp = prefix(amp_arr)
+        c_damp = prefix(np.abs(np.diff(amp_arr)))
+
+        starts = np.arange(n_win)
+        ends = starts + w
+        # Window i covers w samples but only w-1 consecutive differences
+        avg_per = (c_per[ends] - c_per[starts]) / w
+        per_diff = (c_dper[ends - 1] - c_dper[starts]) / (w - 1)
+        jitter = np.divide(per_diff, avg_per, out=np.ones_like(avg_per), where=avg_per > 0)
+
+        mean_amp = (c_amp[ends] - c_amp[starts]) / w
+        amp_diff = (c_damp[ends - 1] - c_damp[starts]) / (w - 1)
+        shimmer = np.divide(amp_diff, mean_amp, out=np.zeros_like(mean_amp), where=mean_amp > 0)
+        return jitter, shimmer, mean_amp
+
+    @staticmethod
+    def _first_min(scored: np.ndarray, f0_arr: np.ndarray, w: int) -> int:
+        """
+        Start of the minimum-jitter window, earliest on ties, as the original
+        strict '<' scan over direct means picked it. f0 is quantized to sr/lag,
+        so exact ties are common, and prefix-sum scores differ from direct
+        means in the last bits: windows within that rounding of the minimum
+        are re-scored directly and the first direct minimum wins.
+        """
+        j = np.min(scored)
+        tied = np.flatnonzero(scored <= FeatureExtractor._tie_bound(j, FeatureExtractor._rounding(f0_arr, w, j)))
+        if len(tied) == 1:
+            return int(tied[0])
+        direct = [FeatureExtractor._window_jitter(f0_arr[i:i + w]) for i in tied]
+        return int(tied[np.argmin(direct)]) # argmin keeps the first of equal values
+
+    @staticmethod
+    def _rounding(f0_arr: np.ndarray, w: int, jitter: float) -> float:
+        """
+        Bound on the rounding error of prefix-sum window jitter near `jitter`
+        over f0_arr: ulps of the full cumulative sums (the magnitude at the
+        last window's end, not a window mean), over the smallest period.
+        """
+        periods = 1.0 / (f0_arr + 1e-9)
+        c_per = np.sum(periods)
+        c_dper = np.sum(np.abs(np.diff(periods)))
+        return 8 * np.finfo(np.float64).eps * (c_dper + jitter * c_per) / np.min(periods)
+
+    @staticmethod
+    def _tie_bound(jitter, rounding: float):
+        """Largest prefix-sum jitter that may still be a tie with `jitter` (re-scored directly)."""
+        return jitter * (1 + 1e-12) + rounding
+
+    @staticmethod
+    def _window_jitter(f0_window: np.ndarray) -> float:
+        """Jitter of one window from direct means (the original scan's arithmetic)."""
+        periods = 1.0 / (f0_window + 1e-9)
+        avg_per = np.mean(periods)
+        return np.mean(np.abs(np.diff(periods))) / avg_per if avg_per > 0 else 1.0
+
+    @staticmethod
+    def _stable_metrics(f0_stable: np.ndarray, amp_stable: np.ndarray, features: dict):
+        """Jitter, shimmer and F0 statistics of the selected stable window."""
+        # Re-Calculate Periods for the stable segment
+        periods = 1.0 / (f0_stable + 1e-9)
+        
+        # Jitter (Local)
+        avg_period = np.mean(periods)
+        period_diffs = np.abs(np.diff(periods))
+        jitter = np.mean(period_diffs) / avg_period if avg_period > 0 else 0.0
+        
+        # Shimmer (Local)
+        avg_amp = np.mean(amp_stable)
+        amp_diffs = np.abs(np.diff(amp_stable))
+        shimmer = np.mean(amp_diffs) / avg_amp if avg_amp > 0 else 0.0
+        
+        # float64 scalars even for float32 input (keeps reports JSON-serializable)
+        features["jitter_local"] = np.float64(jitter)
+        features["shimmer_local"] = np.float64(shimmer)
+        
+        # Report F0 stats for the Whole file vs Stable
+        features["f0_mean"] = float(np.mean(f0_stable))
+        features["f0_std"] = float(np.std(f0_stable)) # Use stable std
+
+
+    @staticmethod
+    def _extract_numpy_features(y: np.ndarray, sr: int, features: dict, jitter_profile: bool = False,
+                                pitch_method: str = None, frame_stats: dict = None):
         """
         Extracts clinical features using robust Autocorrelation (ACF) method.
         Replaces flawed Zero-Crossing Rate (ZCR) approach.
@@ -50,177 +661,343 @@ class FeatureExtractor:
         try:
             # --- 1. Pitch Detection (Autocorrelation) ---
             # Frame-based analysis to capture Jitter/Shimmer dynamics
-            
-            # Constants for Speech Analysis
-            frame_dur = 0.04 # 40ms analysis window
-            hop_dur = 0.01   # 10ms hop
-            min_f0 = 75      # Hz
-            max_f0 = 600     # Hz
-            
-            frame_len = int(sr * frame_dur)
-            hop_len = int(sr * hop_dur)
-            
-            num_frames = (len(y) - frame_len) // hop_len
-            
-            if num_frames < 3:
-                # Signal too short for analysis
-                features["valid_voice_detected"] = False
-                return
-
-            f0s = []
-            peaks = []
-            
-            # Simple Hanning Window
-            window = np.hanning(frame_len)
-            
-            for i in range(num_frames):
-                start = i * hop_len
-                frame = y[start : start + frame_len] * window
-                
-                # ACF
-                # Pad to avoid circular convolution separation issues
-                n = len(frame)
-                pad_frame = np.pad(frame, (0, n), mode='constant')
-                f = np.fft.fft(pad_frame)
-                acf = np.fft.ifft(f * np.conj(f)).real
-                acf = acf[:n]
-                
-                # Find Peak in Pitch Range
-                min_lag = int(sr / max_f0)
-                max_lag = int(sr / min_f0)
-                
-                if max_lag >= len(acf): max_lag = len(acf) - 1
-                
-                segment = acf[min_lag:max_lag]
-                if len(segment) == 0: continue
-                    
-                peak_idx = np.argmax(segment)
-                peak_val = segment[peak_idx]
-                true_lag = min_lag + peak_idx
-                
-                # Voicing Detection (HNR-like check)
-                energy = acf[0] # Energy at lag 0
-                # STRICTER THRESHOLD: 0.45 (was 0.25) to reject noise/breathiness
-                if energy > 0.001 and (peak_val / energy) > 0.45: 
-                    f0 = sr / true_lag
-                    f0s.append(f0)
-                    peaks.append(np.max(np.abs(frame)))
-
-            # --- 2. Jitter & Shimmer Calculation ---
-            if len(f0s) < 5:
-                # Not enough voiced frames
-                features["valid_voice_detected"] = False
-                return
-                
-            features["valid_voice_detected"] = True
-            
-            # --- 2. Stable Segment Selection (The Fix for Continuous Speech) ---
-            # Continuous speech has high pitch variance (intonation). 
-            # We must find the "most sustained vowel" segment to calculate valid jitter.
-            
-            # 2a. Median Filter to remove Octave Jumps (Outliers)
-            from scipy.signal import medfilt
-            f0_arr = medfilt(np.array(f0s), kernel_size=5)
-            amp_arr = np.array(peaks)
-            
-            # Minimum required duration: 0.30 seconds (30 frames)
-            # Find the "Cleanest Vowel"
-            min_window_frames = 30 
-            
-            best_start = 0
-            best_end = len(f0_arr)
-            
-            if len(f0_arr) >= min_window_frames:
-                # Sliding window to find LOWEST JITTER directly
-                min_jitter = float('inf')
-                
-                # We check windows of 0.5 second (50 frames) or if shorter, length-15
-                window_size = min(50, len(f0_arr)) 
-                
-                for i in range(len(f0_arr) - window_size):
-                    # Get Window
-                    w_f0 = f0_arr[i : i+window_size]
-                    w_amp = amp_arr[i : i+window_size]
-                    
-                    # 1. Amplitude Gate (Must be significant part of signal)
-                    if np.mean(w_amp) < (0.2 * np.max(amp_arr)):
-                        continue
-                        
-                    # 2. Calculate Jitter for this window
-                    w_periods = 1.0 / (w_f0 + 1e-9)
-                    avg_per = np.mean(w_periods)
-                    per_diff = np.mean(np.abs(np.diff(w_periods)))
-                    w_jitter = per_diff / avg_per if avg_per > 0 else 1.0
-                    
-                    # Minimize Jitter
-                    if w_jitter < min_jitter:
-                        min_jitter = w_jitter
-                        best_start = i
-                
-                best_end = best_start + window_size
-                # print(f"Best Window Jitter: {min_jitter*100:.3f}%")
-
-            # Extract metrics ONLY from the stable window
-            f0_stable = f0_arr[best_start:best_end]
-            amp_stable = amp_arr[best_start:best_end]
-            
-            # Re-Calculate Periods for the stable segment
-            periods = 1.0 / (f0_stable + 1e-9)
-            
-            # Jitter (Local)
-            avg_period = np.mean(periods)
-            period_diffs = np.abs(np.diff(periods))
-            jitter = np.mean(period_diffs) / avg_period if avg_period > 0 else 0.0
-            
-            # Shimmer (Local)
-            avg_amp = np.mean(amp_stable)
-            amp_diffs = np.abs(np.diff(amp_stable))
-            shimmer = np.mean(amp_diffs) / avg_amp if avg_amp > 0 else 0.0
-            
-            features["jitter_local"] = jitter
-            features["shimmer_local"] = shimmer
-            
-            # Report F0 stats for the Whole file vs Stable
-            features["f0_mean"] = float(np.mean(f0_stable))
-            features["f0_std"] = float(np.std(f0_stable)) # Use stable std
-            features["f0_trace_std"] = float(np.std(f0_arr)) # Full file std (for detection)
-
-            # --- 3. HNR (Harmonoic-to-Noise Ratio) ---
-            # Global estimate from middle of signal
-            mid = len(y) // 2
-            seg_len = min(len(y), 4096)
-            mid_segment = y[mid - seg_len//2 : mid + seg_len//2]
-            
-            # ACF of segment
-            n = len(mid_segment)
-            pad_seg = np.pad(mid_segment, (0, n), mode='constant')
-            f_seg = np.fft.fft(pad_seg)
-            acf_seg = np.fft.ifft(f_seg * np.conj(f_seg)).real
-            acf_seg = acf_seg[:n]
-            
-            min_lag = int(sr / 600)
-            max_lag = int(sr / 75)
-            
-            if max_lag < len(acf_seg):
-                peak_target = acf_seg[min_lag:max_lag]
-                if len(peak_target) > 0:
-                    peak_val = np.max(peak_target)
-                    total_energy = acf_seg[0]
-                    
-                    if total_energy > peak_val:
-                        # HNR = 10 * log10 (Harmonic / Noise)
-                        # Where Harmonic ~ Peak, Noise ~ Total - Peak
-                        ratio = peak_val / (total_energy - peak_val + 1e-9)
-                        hnr = 10 * np.log10(ratio)
-                    else:
-                        hnr = 100.0 # Clean
-                else:
-                    hnr = 0.0
-            else:
-                hnr = 0.0
-                
-            features["hnr"] = float(hnr)
+            trace = FeatureExtractor._track_pitch(y, sr, pitch_method, frame_stats)
+            FeatureExtractor._summarize_trace(trace, sr, features, jitter_profile)
 
         except Exception as e:
             print(f"[Features] Numpy Error: {e}")
             features["valid_voice_detected"] = False
+
+    @staticmethod
+    def _summarize_trace(trace: dict, sr: int, features: dict, jitter_profile: bool = False,
+                         voicing_threshold: float = None, stable_window_frames: int = None,
+                         medfilt_kernel: int = None) -> bool:
+        """
+        Voicing, stable-segment selection and jitter/shimmer/F0/HNR statistics
+        from a frame trace (single pass, no further FFT work). The optional
+        parameters override the class defaults (see features_from_trace).
+        Returns True if valid voice was detected.
+        """
+        FeatureExtractor._frame_counters(len(trace["lag"]), int(np.count_nonzero(trace["acf_computed"])), features)
+        if len(trace["lag"]) < 3:
+            # Signal too short for analysis
+            features["valid_voice_detected"] = False
+            return False
+
+        voiced = FeatureExtractor._voiced_mask(trace, voicing_threshold)
+        f0s = sr / trace["lag"][voiced]
+        peaks = trace["amp"][voiced]
+        # Per-frame ACF results kept for HNR (lag-0 energy, window-corrected pitch peak)
+        acf_energy = trace["energy"][voiced]
+        acf_peak = FeatureExtractor._harmonic_peak(trace["peak_val"][voiced], trace["lag"][voiced], acf_energy, sr)
+
+        # --- 2. Jitter & Shimmer Calculation ---
+        if len(f0s) < 5:
+            # Not enough voiced frames
+            features["valid_voice_detected"] = False
+            return False
+            
+        features["valid_voice_detected"] = True
+        
+        # --- 2. Stable Segment Selection (The Fix for Continuous Speech) ---
+        # Continuous speech has high pitch variance (intonation). 
+        # We must find the "most sustained vowel" segment to calculate valid jitter.
+        
+        # 2a. Median Filter to remove Octave Jumps (Outliers)
+        from scipy.signal import medfilt
+        f0_arr = medfilt(np.array(f0s), kernel_size=medfilt_kernel or FeatureExtractor.MEDFILT_KERNEL)
+        amp_arr = np.array(peaks)
+        
+        # Find the "Cleanest Vowel" (lowest-jitter window)
+        best_start, best_end, curves = FeatureExtractor._stable_window_search(f0_arr, amp_arr, stable_window_frames)
+
+        if jitter_profile:
+            # Intra-recording stability over time (window start = first voiced frame)
+            start_frames = np.flatnonzero(voiced)[:len(curves["jitter"])]
+            features["window_jitter_profile"] = FeatureExtractor._profile_dict(
+                curves, start_frames, best_end - best_start, best_start)
+
+        # Extract metrics ONLY from the stable window
+        f0_stable = f0_arr[best_start:best_end]
+        amp_stable = amp_arr[best_start:best_end]
+        
+        FeatureExtractor._stable_metrics(f0_stable, amp_stable, features)
+        features["f0_trace_std"] = float(np.std(f0_arr)) # Full file std (for detection)
+
+        # --- 3. HNR (Harmonic-to-Noise Ratio) over the same stable window ---
+        FeatureExtractor._stable_hnr(acf_peak[best_start:best_end], acf_energy[best_start:best_end], features)
+        return True
+
+    @staticmethod
+    def _frame_counters(frames_total: int, frames_acf: int, features: dict):
+        """Pre-pass savings: frames analysed vs. skipped before the ACF."""
+        features["frames_total"] = frames_total
+        features["frames_acf"] = frames_acf
+        features["frames_skipped"] = frames_total - frames_acf
+
+    @staticmethod
+    def _profile_dict(curves: dict, start_frames: np.ndarray, window_frames: int, best_index: int) -> dict:
+        """JSON-friendly per-window jitter/shimmer profile."""
+        return {
+            "window_frames": window_frames,
+            "start_sec": (np.asarray(start_frames) * FeatureExtractor.HOP_DUR).tolist(),
+            "jitter": np.asarray(curves["jitter"]).tolist(),
+            "shimmer": np.asarray(curves["shimmer"]).tolist(),
+            "amplitude_passed": np.asarray(curves["amplitude_passed"]).tolist(),
+            "best_index": best_index,
+        }
+
+    @staticmethod
+    def _harmonic_peak(peak_val: np.ndarray, lag: np.ndarray, energy: np.ndarray, sr: int) -> np.ndarray:
+        """
+        Pitch ACF peaks divided by the Hann window's normalized ACF at their
+        lag (Boersma 1993), capped at the lag-0 energy. The windowed ACF of a
+        periodic frame decays with lag as r_w(lag) does, so without this HNR
+        would fall with f0 (long periods) rather than with noise.
+        """
+        r_w = DSPKernels.window_acf(FeatureExtractor._frame_params(sr)[0])
+        corrected = peak_val / np.interp(lag, np.arange(len(r_w)), r_w)
+        return np.minimum(corrected, energy).astype(peak_val.dtype, copy=False)
+
+    @staticmethod
+    def _stable_hnr(acf_peak: np.ndarray, acf_energy: np.ndarray, features: dict):
+        """
+        HNR from the pitch-tracking ACFs of the stable window frames.
+        Harmonic ~ window-corrected ACF peak (_harmonic_peak), Noise ~ lag-0
+        energy - harmonic; the window value pools both over its frames,
+        frame-level statistics are reported alongside.
+        """
+        harmonic = acf_peak.astype(np.float64)
+        noise = acf_energy.astype(np.float64) - harmonic
+
+        # HNR = 10 * log10 (Harmonic / Noise)
+        total_noise = np.sum(noise)
+        if total_noise > 0:
+            hnr = 10 * np.log10(np.sum(harmonic) / (total_noise + 1e-9))
+        else:
+            hnr = 100.0 # Clean
+
+        with np.errstate(divide="ignore"):
+            frame_hnr = np.where(noise > 0, 10 * np.log10(harmonic / np.maximum(noise, 1e-30)), 100.0)
+
+        features["hnr"] = float(hnr)
+        features["hnr_frame_mean"] = float(np.mean(frame_hnr))
+        features["hnr_frame_std"] = float(np.std(frame_hnr))
+        features["hnr_frame_min"] = float(np.min(frame_hnr))
+        features["hnr_frame_max"] = float(np.max(frame_hnr))
+
+
+# Built-in NumPy backends (library backends register in pitch_backends.py)
+PitchBackends.register("acf", FeatureExtractor._track_pitch_acf)
+PitchBackends.register("coarse_to_fine", FeatureExtractor._track_pitch_coarse_to_fine)
+PitchBackends.register("yin", FeatureExtractor._track_pitch_yin)
+PitchBackends.register("cepstral", FeatureExtractor._track_pitch_cepstral)
+
+
+class FeatureStream:
+    """
+    Incremental state for FeatureExtractor.extract_features_stream.
+    Keeps less than one frame of samples between chunks, the median-filter
+    context, the last stable window of voiced frames and a small Pareto set of
+    candidate windows (lower jitter vs. higher mean amplitude). The amplitude
+    gate depends on the peak of the whole recording, so any window that could
+    still win once the final peak is known is kept until finalize().
+    """
+
+    # Per-voiced-frame columns carried through the stream
+    COLUMNS = ("f0", "amp", "acf_peak", "acf_energy", "frame")
+
+    def __init__(self, sr: int, jitter_profile: bool = False):
+        self.sr = sr
+        self.frame_len, self.hop_len, _, _ = FeatureExtractor._frame_params(sr)
+        self.jitter_profile = jitter_profile
+        self.w = FeatureExtractor.STABLE_WINDOW_FRAMES
+
+        # Framing state
+        self.n_frames = 0
+        self.n_acf = 0
+        self.tail = None
+
+        # Median filter (zero padded at the edges, like scipy.signal.medfilt)
+        self.med_half = FeatureExtractor.MEDFILT_KERNEL // 2
+        self.med_ctx = np.zeros(self.med_half)
+        self.pending = None  # columns waiting for their filtered f0
+
+        # Filtered voiced trace: head (first W), rolling history (last W), running stats
+        self.n_voiced = 0
+        self.head = None
+        self.hist = None
+        self.amp_max = 0.0
+        self.f0_shift = None
+        self.f0_s1 = 0.0
+        self.f0_s2 = 0.0
+
+        # Candidate windows: (jitter, mean_amp, start, window_columns)
+        self.frontier = []
+        self.first_window = None
+        self.rounding = 0.0 # Largest prefix-sum rounding bound of any scored chunk
+        self.profile = {"jitter": [], "shimmer": [], "mean_amp": [], "start_frames": []}
+
+    def push(self, chunk: np.ndarray):
+        """Consumes the next chunk of audio."""
+        chunk = np.asarray(chunk)
+        chunk = chunk.astype(FeatureExtractor._compute_dtype(chunk), copy=False).ravel()
+        if len(chunk) == 0:
+            return
+        if self.tail is None:
+            # The first chunk fixes the compute precision for the whole stream
+            self.tail = np.zeros(0, dtype=chunk.dtype)
+
+        # Frames are analysed once a full frame plus one hop is available, which
+        # reproduces num_frames = (len(y) - frame_len) // hop_len at the end
+        buf = np.concatenate((self.tail, chunk))
+        trace = FeatureExtractor._track_pitch_acf(buf, self.sr)
+        nf = len(trace["lag"])
+        self.n_acf += int(np.count_nonzero(trace["acf_computed"]))
+        voiced = FeatureExtractor._voiced_mask(trace)
+
+        self._feed_voiced({
+            "f0": self.sr / trace["lag"][voiced],
+            "amp": trace["amp"][voiced],
+            "acf_peak": FeatureExtractor._harmonic_peak(trace["peak_val"][voiced], trace["lag"][voiced],
+                                                        trace["energy"][voiced], self.sr),
+            "acf_energy": trace["energy"][voiced],
+            "frame": self.n_frames + np.flatnonzero(voiced),
+        })
+
+        self.n_frames += nf
+        self.tail = buf[nf * self.hop_len:]
+
+    def finalize(self) -> dict:
+        """Flushes the median filter and returns the feature dictionary."""
+        features = {}
+        self._feed_voiced(None, flush=True)
+        FeatureExtractor._frame_counters(self.n_frames, self.n_acf, features)
+
+        if self.n_frames < 3 or self.n_voiced < 5:
+            features["valid_voice_detected"] = False
+            return features
+        features["valid_voice_detected"] = True
+
+        if self.n_voiced <= self.w:
+            # Short trace: the head holds all of it, use the in-memory search
+            best_start, best_end, curves = FeatureExtractor._stable_window_search(self.head["f0"], self.head["amp"])
+            stable = {k: v[best_start:best_end] for k, v in self.head.items()}
+            if self.jitter_profile:
+                features["window_jitter_profile"] = FeatureExtractor._profile_dict(
+                    curves, self.head["frame"][:len(curves["jitter"])], best_end - best_start, best_start)
+        else:
+            gate = FeatureExtractor.AMP_GATE_RATIO * self.amp_max
+            passing = [c for c in self.frontier if c[1] >= gate]
+            if passing:
+                bound = FeatureExtractor._tie_bound(min(c[0] for c in passing), self.rounding)
+                best = min((c for c in passing if c[0] <= bound),
+                           key=lambda c: (FeatureExtractor._window_jitter(c[3]["f0"]), c[2]))
+            else:
+                best = self.first_window
+            _, _, best_start, stable = best
+            if self.jitter_profile:
+                curves = {
+                    "jitter": self.profile["jitter"],
+                    "shimmer": self.profile["shimmer"],
+                    "amplitude_passed": np.asarray(self.profile["mean_amp"]) >= gate,
+                }
+                features["window_jitter_profile"] = FeatureExtractor._profile_dict(
+                    curves, self.profile["start_frames"], self.w, best_start)
+
+        FeatureExtractor._stable_metrics(stable["f0"], stable["amp"], features)
+        n = self.n_voiced
+        var = self.f0_s2 / n - (self.f0_s1 / n) ** 2
+        features["f0_trace_std"] = float(np.sqrt(max(var, 0.0))) # Full file std (for detection)
+        FeatureExtractor._stable_hnr(stable["acf_peak"], stable["acf_energy"], features)
+        return features
+
+    def _feed_voiced(self, cols: dict, flush: bool = False):
+        """Median-filters the raw voiced f0 stream and forwards finished frames."""
+        k = FeatureExtractor.MEDFILT_KERNEL
+        if flush:
+            ext = np.concatenate((self.med_ctx, np.zeros(self.med_half)))
+        else:
+            ext = np.concatenate((self.med_ctx, cols["f0"]))
+            self.pending = cols if self.pending is None else \
+                {c: np.concatenate((self.pending[c], cols[c])) for c in self.COLUMNS}
+
+        if len(ext) < k:
+            self.med_ctx = ext
+            return
+        med = np.median(sliding_window_view(ext, k), axis=1)
+        self.med_ctx = ext[-(k - 1):]
+        if self.pending is None:
+            return
+
+        # Flushing must not emit values for the zero padding itself
+        n_out = min(len(med), len(self.pending["f0"]))
+        out = {c: v[:n_out] for c, v in self.pending.items()}
+        out["f0"] = med[:n_out]
+        self.pending = {c: v[n_out:] for c, v in self.pending.items()}
+        self._feed_filtered(out)
+
+    def _feed_filtered(self, cols: dict):
+        """Updates running stats and scores windows that are now complete."""
+        f0, amp = cols["f0"], cols["amp"]
+        if len(f0) == 0:
+            return
+        w = self.w
+        if self.head is None:
+            self.head = {c: v[:w] for c, v in cols.items()}
+        elif len(self.head["f0"]) < w:
+            take = w - len(self.head["f0"])
+            self.head = {c: np.concatenate((self.head[c], cols[c][:take])) for c in self.COLUMNS}
+
+        if self.f0_shift is None:
+            self.f0_shift = f0[0]
+        d = f0 - self.f0_shift
+        self.f0_s1 += float(np.sum(d))
+        self.f0_s2 += float(np.sum(d * d))
+        self.amp_max = max(self.amp_max, float(np.max(amp)))
+
+        ext = cols if self.hist is None else \
+            {c: np.concatenate((self.hist[c], cols[c])) for c in self.COLUMNS}
+        base = self.n_voiced - (0 if self.hist is None else len(self.hist["f0"]))
+        self.n_voiced += len(f0)
+
+        # A window is scored once the frame after it exists (the batch search
+        # never scores the final window)
+        n_win = len(ext["f0"]) - w
+        if n_win > 0:
+            jitter, shimmer, mean_amp = FeatureExtractor._window_scores(ext["f0"], ext["amp"], w, n_win)
+            self.rounding = max(self.rounding, FeatureExtractor._rounding(ext["f0"], w, float(np.max(jitter))))
+            if self.jitter_profile:
+                self.profile["jitter"].extend(jitter.tolist())
+                self.profile["shimmer"].extend(shimmer.tolist())
+                self.profile["mean_amp"].extend(mean_amp.tolist())
+                self.profile["start_frames"].extend(ext["frame"][:n_win].tolist())
+
+            def window(p):
+                return {c: v[p:p + w].copy() for c, v in ext.items()}
+
+            if base == 0:
+                self.first_window = (jitter[0], mean_amp[0], 0, window(0))
+
+            gate_now = FeatureExtractor.AMP_GATE_RATIO * self.amp_max
+            self.frontier = [c for c in self.frontier if c[1] >= gate_now]
+
+            # The final peak can only be higher, so windows below today's gate can
+            # never pass; windows dominated by an existing candidate (louder and no
+            # more jittery) can never be selected. Both filters are vectorized.
+            keep = mean_amp >= gate_now
+            if self.frontier:
+                f_j = np.array([c[0] for c in self.frontier])
+                f_a = np.array([c[1] for c in self.frontier])
+                dominated = (f_a[None, :] >= mean_amp[:, None]) & (f_j[None, :] <= jitter[:, None])
+                keep &= ~np.any(dominated, axis=1)
+
+            for p in np.flatnonzero(keep):
+                j, a = jitter[p], mean_amp[p]
+                if any(c[1] >= a and c[0] <= j for c in self.frontier):
+                    continue
+                bound = FeatureExtractor._tie_bound(j, self.rounding)
+                self.frontier = [c for c in self.frontier if not (a >= c[1] and c[0] > bound)]
+                self.frontier.append((j, a, base + p, window(p)))
+
+        self.hist = {c: v[-w:] for c, v in ext.items()}
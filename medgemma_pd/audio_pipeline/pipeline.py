@@ -1,10 +1,15 @@
 import time
-import os
-import json
+import numpy as np
 from .validation import InputValidator
+from .triage import AudioTriage
 from .quality_control import SignalQualityControl
 from .preprocessing import AudioPreprocessor
 from .features import FeatureExtractor
+from .dsp import DSPKernels
+from .cache import FeatureCache
+from .dag import Stage, StageGraph
+from .traces import TraceStore
+from .pitch_backends import PitchBackends
 
 class MedicalAudioPipeline:
     """
@@ -12,12 +17,27 @@ class MedicalAudioPipeline:
     Strictly enforces the layered architecture.
     """
     
-    VERSION = "1.0.0-medical"
+    VERSION = "1.1.0-medical" # 1.1: window-corrected (Boersma) HNR
 
     @staticmethod
-    def process_file(file_path: str) -> dict:
+    def process_file(file_path, precision: str = None, name: str = None, streaming: bool = None,
+                     triage: bool = True, cache: bool = None) -> dict:
         """
         Runs the full pipeline on a file.
+        file_path: path, or in-memory audio (bytes, memoryview, file-like) for
+                   uploads/queues; `name` optionally hints the format and
+                   becomes the report filename.
+        precision: compute dtype ("float64" or "float32"); defaults to
+                   AudioPreprocessor.PRECISION.
+        streaming: chunked two-pass preprocessing feeding streaming feature
+                   extraction (constant memory). None = only for inputs above
+                   InputValidator.MAX_SIZE_MB, up to MAX_STREAM_SIZE_MB.
+        triage: sample a few blocks first and reject silent / flat / saturated
+                recordings before decoding them (AudioTriage).
+        cache: look up / store the result in FeatureCache (None = FeatureCache.ENABLED);
+               the report's 'cache' section carries hit/miss counters. On a
+               miss, per-stage artifacts are still reused (StageGraph); the
+               report's 'dag' section lists each stage as computed or reused.
         Returns: Comprehensive JSON Report
         """
         start_time = time.time()
@@ -29,25 +49,183 @@ class MedicalAudioPipeline:
         }
 
         # --- Stage 1: Validation ---
-        val_result = InputValidator.validate(file_path)
+        # The file is opened once here; later stages work from this buffer
+        val_result, buffer = InputValidator.open(file_path, name, streaming=streaming is not False)
         report['stages']['validation'] = val_result
         if not val_result['valid']:
             report['status'] = "failed"
             report['error'] = f"Validation Error: {val_result['error']}"
             return report
+        if streaming is None:
+            streaming = buffer.size_bytes > InputValidator.MAX_SIZE_MB * 1024 * 1024
+            if streaming and AudioPreprocessor.STREAM_RESAMPLER != AudioPreprocessor.RESAMPLER:
+                print(f"   [WARNING] {buffer.filename} is streamed: resampled with "
+                      f"{AudioPreprocessor.STREAM_RESAMPLER}, not {AudioPreprocessor.RESAMPLER}; features may differ.")
+        # Streamed and in-memory runs resample differently: both are recorded (and keyed)
+        meta = {
+            "filename": buffer.filename,
+            "size_bytes": buffer.size_bytes,
+            "streaming": bool(streaming),
+            "resampler": MedicalAudioPipeline._resampler(streaming)
+        }
+
+        # --- Stage 1b: Early-Reject Triage (sampled blocks only) ---
+        # Ahead of the cache lookup: a rejected recording is never read in full, not even to hash it
+        if triage:
+            triage_result = AudioTriage.check(buffer)
+            report['stages']['triage'] = triage_result
+            if not triage_result['passed']:
+                buffer.close()
+                return MedicalAudioPipeline._triage_rejected(triage_result, report, meta, start_time)
+
+        # --- Result cache (content hash + version + parameters) ---
+        # The content hash (one full read of the file) is only taken when caching
+        use_cache = cache if cache is not None else FeatureCache.ENABLED
+        if use_cache:
+            cache_key = FeatureCache.key(
+                buffer.content_hash(), MedicalAudioPipeline.VERSION,
+                MedicalAudioPipeline._cache_fingerprint(buffer, precision, streaming, triage))
+            cached = FeatureCache.get(cache_key)
+            if cached is not None:
+                buffer.close()
+                stages = report['stages']
+                report.update(cached)
+                report['stages'] = {**stages, **cached['stages']}
+                report['processing_time'] = time.time() - start_time
+                report['meta'] = meta
+                report['cache'] = FeatureCache.report_entry(cache_key, hit=True)
+                report['dag'] = {name: {'status': "reused"} for name in cached['stages']}
+                return report
+
+        report = MedicalAudioPipeline._run_stages(buffer, precision, streaming, report, meta, start_time, use_cache)
+
+        if use_cache:
+            # Deterministic outcomes only; failures may be transient (I/O, memory)
+            read_error = report['stages'].get('preprocessing', {}).get('status') == "error"
+            if report['status'] in ("success", "rejected") and not read_error:
+                FeatureCache.put(cache_key, {
+                    'status': report['status'],
+                    'stages': {k: v for k, v in report['stages'].items() if k not in ('validation', 'triage')},
+                    **{k: report[k] for k in ('error', 'rejections') if k in report}
+                })
+            report['cache'] = FeatureCache.report_entry(cache_key, hit=False)
+        return report
+
+    @staticmethod
+    def _resampler(streaming: bool) -> str:
+        """Resampler a run uses: process_stream only supports STREAM_RESAMPLER."""
+        return AudioPreprocessor.STREAM_RESAMPLER if streaming else AudioPreprocessor.RESAMPLER
+
+    @staticmethod
+    def _cache_fingerprint(buffer, precision: str, streaming: bool, triage: bool) -> dict:
+        """Everything besides the audio bytes that can change a report."""
+        return FeatureCache.fingerprint(
+            AudioPreprocessor, SignalQualityControl, FeatureExtractor, AudioTriage,
+            precision=precision or AudioPreprocessor.PRECISION, streaming=bool(streaming), triage=triage,
+            resampler=MedicalAudioPipeline._resampler(streaming),
+            pitch_backends=PitchBackends.names(), extension=buffer.extension)
+
+    @staticmethod
+    def _stage_graph(buffer, precision: str, cache: bool) -> StageGraph:
+        """
+        The in-memory path as a DAG (artifacts cached per stage):
+        source -> preprocessing -> preprocessing_audit
+                  preprocessing -> frame_stats -> quality_control
+                  preprocessing, frame_stats -> pitch_trace -> feature_extraction
+        Each stage's params hold only the constants it depends on, so e.g. a
+        VOICING_THRESHOLD change re-runs feature_extraction alone. The
+        preprocessed signal is only memoized for the run (it would crowd the
+        cache); the audit is a small entry of its own, and pitch traces live
+        in TraceStore under the key reanalyze_traces.py uses. A read error
+        (audit status "error") stores nothing computed from the fallback signal.
+        Keys, and so the content hash, are only taken when `cache` is set.
+        """
+        precision = precision or AudioPreprocessor.PRECISION
 
+        def preprocess(inputs):
+            try:
+                y, sr, audit = AudioPreprocessor.process(inputs['source'], precision)
+            finally:
+                inputs['source'].close() # Later stages only need the processed signal
+            return {'y': y, 'sr': sr, 'audit': audit}
+
+        # Array artifacts carry their sample rate for the stages below them
+        def frame_stats(inputs):
+            pre = inputs['preprocessing']
+            table = DSPKernels.frame_stats(pre['y'], SignalQualityControl.cell_length(pre['sr']),
+                                           SignalQualityControl.CLIP_LEVEL)
+            return {**table, 'sr': pre['sr']}
+
+        # Features always come from the stored (float32) trace form, so they
+        # do not depend on whether the trace was just tracked or reloaded
+        def pitch_trace(inputs):
+            pre = inputs['preprocessing']
+            trace = FeatureExtractor.track(pre['y'], pre['sr'], frame_stats=inputs['frame_stats'])
+            return {**TraceStore.stored_form(trace), 'sr': pre['sr']}
+
+        stages = [
+            Stage("source", (), {}, lambda inputs: buffer, kind=None),
+            Stage("preprocessing", ("source",),
+                  FeatureCache.fingerprint(AudioPreprocessor, precision=precision, extension=buffer.extension),
+                  preprocess, kind=None, valid=lambda pre: pre['audit'].get('status') != "error"),
+            Stage("preprocessing_audit", ("preprocessing",), {}, lambda inputs: inputs['preprocessing']['audit']),
+            Stage("frame_stats", ("preprocessing",),
+                  {'CELL_DUR': SignalQualityControl.CELL_DUR, 'CLIP_LEVEL': SignalQualityControl.CLIP_LEVEL},
+                  frame_stats, kind="arrays"),
+            Stage("quality_control", ("frame_stats",), FeatureCache.fingerprint(SignalQualityControl),
+                  lambda inputs: SignalQualityControl.assess_stats(
+                      SignalQualityControl.table_stats(inputs['frame_stats']), inputs['frame_stats']['sr'])),
+            Stage("pitch_trace", ("preprocessing", "frame_stats"), {}, pitch_trace, kind="trace"),
+            Stage("feature_extraction", ("pitch_trace",), FeatureCache.fingerprint(FeatureExtractor),
+                  lambda inputs: FeatureExtractor.features_from_trace(inputs['pitch_trace'],
+                                                                      inputs['pitch_trace']['sr'])),
+        ]
+        def source_keys():
+            content_hash = buffer.content_hash()
+            return {
+                'source': content_hash,
+                'pitch_trace': TraceStore.key(content_hash, MedicalAudioPipeline.VERSION, precision=precision)
+            }
+        return StageGraph(stages, source_keys, MedicalAudioPipeline.VERSION, cache)
+
+    @staticmethod
+    def _run_stages(buffer, precision: str, streaming: bool, report: dict, meta: dict,
+                    start_time: float, cache: bool = False) -> dict:
+        """Stages 2-4 on an opened, validated, triaged buffer (closed on return)."""
+        if streaming:
+            return MedicalAudioPipeline._process_stream(buffer, precision, report, meta, start_time)
+
+        graph = MedicalAudioPipeline._stage_graph(buffer, precision, cache)
+        try:
+            return MedicalAudioPipeline._run_graph(graph, report, meta, start_time)
+        finally:
+            buffer.close()
+            report['dag'] = graph.report()
+
+    @staticmethod
+    def _triage_rejected(triage_result: dict, report: dict, meta: dict, start_time: float) -> dict:
+        report['status'] = "rejected"
+        report['error'] = f"Triage Rejected: {'; '.join(triage_result['reasons'])}"
+        report['rejections'] = triage_result['reasons']
+        report['processing_time'] = time.time() - start_time
+        report['meta'] = meta
+        return report
+
+    @staticmethod
+    def _run_graph(graph: StageGraph, report: dict, meta: dict, start_time: float) -> dict:
+        """Stages 2-4 of the in-memory path, resolved through the stage graph."""
         # --- Stage 2: Processing (Load & Preprocess) ---
-        # Note: We load here to pass data to SQC
+        # Decoded only if the audit or a later stage misses the cache
         try:
-            y, sr, pre_audit = AudioPreprocessor.process(file_path)
-            report['stages']['preprocessing'] = pre_audit
+            report['stages']['preprocessing'] = graph.result("preprocessing_audit")
         except Exception as e:
             report['status'] = "failed"
             report['error'] = f"Preprocessing Error: {e}"
             return report
 
         # --- Stage 3: Signal Quality Control ---
-        sqc_result = SignalQualityControl.assess_quality(y, sr)
+        # One framed statistics pass, shared by QC and the feature pre-gate
+        sqc_result = graph.result("quality_control")
         report['stages']['quality_control'] = sqc_result
         if not sqc_result['passed']:
             # report['status'] = "rejected"
@@ -60,7 +238,7 @@ class MedicalAudioPipeline:
         # --- Stage 4: Feature Extraction (PRAAT) ---
         t_feat = time.time()
         try:
-            features = FeatureExtractor.extract_features(y, sr)
+            features = graph.result("feature_extraction")
             report['stages']['feature_extraction'] = features
             report['stages']['feature_extraction']['latency_ms'] = (time.time() - t_feat) * 1000
             
@@ -77,8 +255,59 @@ class MedicalAudioPipeline:
         # --- Success ---
         report['status'] = "success"
         report['processing_time'] = time.time() - start_time
-        report['meta'] = {
-            "filename": os.path.basename(file_path),
-            "size_bytes": os.path.getsize(file_path)
-        }
+        report['meta'] = meta
+        return report
+
+    @staticmethod
+    def _process_stream(buffer, precision: str, report: dict, meta: dict, start_time: float) -> dict:
+        """
+        Stages 2-4 in streaming mode: the preprocessor's chunks are metered for
+        QC and consumed by FeatureExtractor.extract_features_stream in one pass,
+        so no stage holds the whole recording.
+        """
+        # --- Stage 2: Processing (pass one: peak and trim bounds) ---
+        try:
+            chunks, sr, pre_audit = AudioPreprocessor.process_stream(buffer, precision)
+            report['stages']['preprocessing'] = pre_audit
+        except Exception as e:
+            buffer.close()
+            report['status'] = "failed"
+            report['error'] = f"Preprocessing Error: {e}"
+            return report
+
+        # --- Stages 3 + 4: QC statistics and features over the same chunks ---
+        stats = SignalQualityControl.signal_stats(np.zeros(0), sr)
+
+        def metered():
+            for chunk in chunks:
+                SignalQualityControl.signal_stats(chunk, sr, stats)
+                yield chunk
+
+        t_feat = time.time()
+        try:
+            features = FeatureExtractor.extract_features_stream(metered(), sr)
+        except Exception as e:
+            report['status'] = "failed"
+            report['error'] = f"Feature Extraction Error: {e}"
+            return report
+        finally:
+            buffer.close()
+
+        sqc_result = SignalQualityControl.assess_stats(stats, sr)
+        report['stages']['quality_control'] = sqc_result
+        if not sqc_result['passed']:
+            print(f"   [WARNING] QC Failed: {sqc_result['reasons']}. PROCEEDING FOR VERIFICATION.")
+            sqc_result['passed'] = True # Override, as in the in-memory path
+
+        report['stages']['feature_extraction'] = features
+        features['latency_ms'] = (time.time() - t_feat) * 1000
+        if not features.get("valid_voice_detected", False):
+            report['status'] = "rejected"
+            report['error'] = "No valid voice detected (unvoiced)"
+            return report
+
+        # --- Success ---
+        report['status'] = "success"
+        report['processing_time'] = time.time() - start_time
+        report['meta'] = meta
         return report
@@ -0,0 +1,84 @@
+import importlib.util
+import numpy as np
+from .dsp import DSPKernels
+
+
+class PitchBackends:
+    """
+    Pitch-tracker registry for Layer 4 (Feature Extraction).
+    A backend maps (y, sr) to a frame trace on FeatureExtractor's frame grid:
+    per-frame best lag, windowed-ACF value at that lag, lag-0 energy, peak
+    amplitude and an acf_computed flag. Voicing, stable-segment selection and
+    HNR are shared, so backends only differ in how the lag is found.
+    Optional libraries are imported only when their backend is selected.
+    """
+
+    _registry = {}
+
+    @staticmethod
+    def register(name: str, tracker, requires: str = None):
+        """Adds a backend; requires: module that must be importable to use it."""
+        PitchBackends._registry[name] = (tracker, requires)
+
+    @staticmethod
+    def names() -> list:
+        """All registered backends, available or not."""
+        return list(PitchBackends._registry)
+
+    @staticmethod
+    def available() -> list:
+        """Backends whose optional dependency (if any) is installed."""
+        return [name for name, (_, requires) in PitchBackends._registry.items()
+                if requires is None or importlib.util.find_spec(requires) is not None]
+
+    @staticmethod
+    def get(name: str):
+        """Tracker callable for a backend name."""
+        if name not in PitchBackends._registry:
+            raise ValueError(f"Unknown pitch backend '{name}' (registered: {PitchBackends.names()})")
+        tracker, requires = PitchBackends._registry[name]
+        if requires is not None and importlib.util.find_spec(requires) is None:
+            raise ImportError(f"Pitch backend '{name}' requires the '{requires}' package")
+        return tracker
+
+    @staticmethod
+    def _track_pitch_praat(y: np.ndarray, sr: int) -> dict:
+        """
+        Praat autocorrelation pitch (parselmouth), sampled at the centre of each
+        analysis frame. Frames Praat leaves unvoiced keep a zero ACF peak.
+        """
+        import parselmouth
+        from .features import FeatureExtractor
+
+        frame_len, hop_len, min_lag, max_lag = FeatureExtractor._frame_params(sr)
+        pitch = parselmouth.Sound(np.asarray(y, dtype=np.float64), sampling_frequency=sr).to_pitch_ac(
+            time_step=FeatureExtractor.HOP_DUR, pitch_floor=FeatureExtractor.MIN_F0,
+            pitch_ceiling=FeatureExtractor.MAX_F0)
+        times = pitch.xs()
+        f0_praat = pitch.selected_array["frequency"]
+
+        def pick(raw, windowed, rows):
+            centres = (rows * hop_len + frame_len / 2) / sr
+            f0 = np.interp(centres, times, f0_praat, left=0.0, right=0.0) if len(times) else np.zeros(len(rows))
+            # Praat marks unvoiced frames with 0 Hz; interpolation across a gap gives partial values
+            voiced = ((f0 > 0) & (f0_praat[PitchBackends._nearest(times, centres)] > 0) if len(times)
+                      else np.zeros(len(rows), dtype=bool))
+
+            lag = np.clip(np.rint(sr / np.where(voiced, f0, FeatureExtractor.MAX_F0)).astype(np.int64),
+                          min_lag, max_lag - 1)
+            peak_val = DSPKernels.acf_lags(windowed, lag, 1)[:, 0]
+            return lag, np.where(voiced, peak_val, 0)
+
+        return FeatureExtractor._gated_trace(y, sr, pick)
+
+    @staticmethod
+    def _nearest(times: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Index of the closest entry of sorted, non-empty `times` for each query (ties go left)."""
+        right = np.clip(np.searchsorted(times, queries), 1, max(len(times) - 1, 1))
+        left = right - 1
+        if len(times) == 1:
+            return np.zeros(len(queries), dtype=np.int64)
+        return np.where(queries - times[left] <= times[right] - queries, left, right)
+
+
+PitchBackends.register("praat", PitchBackends._track_pitch_praat, requires="parselmouth")
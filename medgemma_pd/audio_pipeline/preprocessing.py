@@ -1,5 +1,8 @@
 import numpy as np
 import warnings
+from functools import lru_cache
+from math import gcd
+from .buffer import AudioBuffer
 
 # Librosa/Soundfile removed due to instability
 # Using Pure Scipy/Numpy implementation
@@ -14,14 +17,28 @@ class AudioPreprocessor:
     
     TARGET_SR = 16000 # Standard for medical ML
     TARGET_DB = -3.0  # Peak normalization target
+    PRECISION = "float64" # Compute dtype; "float32" halves memory bandwidth downstream
+    BLOCK_SAMPLES = 1 << 18 # Samples converted per block while scanning peak / trim bounds
+    # "fft" (scipy.signal.resample) or "polyphase" (cached FIR designs, faster). The bundled
+    # model was trained on FFT-resampled features; polyphase moves shimmer by up to ~10%
+    # (validate_resampler_drift.py), so FFT stays the default until the model is retrained.
+    RESAMPLER = "fft"
+    STREAM_RESAMPLER = "polyphase" # process_stream: chunked resampling needs the FIR, whatever RESAMPLER says
     
     @staticmethod
-    def process(file_path: str) -> tuple[np.ndarray, int, dict]:
+    def process(source, precision: str = None) -> tuple[np.ndarray, int, dict]:
         """
         Loads, Resamples, Mono-mixes, and Normalizes audio.
+        source: file path, in-memory audio (bytes, memoryview, file-like), or
+                the AudioBuffer from InputValidator.open (samples already
+                mapped, nothing is re-read).
+        precision: "float64" (default) or "float32". The returned signal keeps
+                   this dtype, so QC and feature extraction run in it too.
         Returns: (y_processed, sr, audit_log)
         """
         audit = {}
+        dtype = np.dtype(precision or AudioPreprocessor.PRECISION)
+        audit['precision'] = dtype.name
         
         # if not LIBROSA_AVAILABLE:
         #     # Fallback for environments without librosa
@@ -29,60 +46,45 @@ class AudioPreprocessor:
         #     return np.zeros(16000), 16000, {"status": "mocked", "reason": "missing_librosa"}
 
         # 1. Load & Resample (Using Scipy to avoid Librosa crashes)
+        owned = None # Buffer opened here (path / bytes source), closed on the way out
         try:
-            from scipy.io import wavfile
-            from scipy import signal
-            
-            src_sr, y_raw = wavfile.read(file_path)
-            
-            # Normalize to float (Universal Handling)
-            if y_raw.dtype.kind == 'i':
-                # Integer type (int16, int32)
-                # Check for 24-bit stored as 32-bit? Scipy usually scales to range.
-                # Safer: Normalize by the type's max value 
-                type_info = np.iinfo(y_raw.dtype)
-                y_float = y_raw.astype(float) / max(abs(type_info.min), abs(type_info.max))
-            elif y_raw.dtype.kind == 'f':
-                # Float type - assumed normalized or requiring peak norm later
-                y_float = y_raw
-            else:
-                 # Unsure (uint8?) - map 0..255 to -1..1
-                 y_float = (y_raw.astype(float) - 128.0) / 128.0
-                
-                
-            # Convert to Mono
-            if len(y_float.shape) > 1:
-                y_mono = np.mean(y_float, axis=1)
-            else:
-                y_mono = y_float
+            # Memory-mapped ingestion: samples stay on disk until a block is needed
+            if not isinstance(source, AudioBuffer):
+                source = owned = AudioBuffer.open(source)
+            src_sr, y_raw = AudioPreprocessor._load(source, audit)
+            n_samples = len(y_raw)
+            to_float = AudioPreprocessor._pcm_reader(y_raw, dtype)
                 
             # --- Smart Trimming (User Requested Check) ---
             # Remove leading/trailing silence to fix "Signal Too Low" false positives
             # --- Peak Normalization (Fix 1: Normalize First) ---
             # Maximize volume before trimming to fix quiet files
-            max_val = np.max(np.abs(y_mono))
+            max_val = AudioPreprocessor._peak(n_samples, to_float)
             if max_val > 0:
-                y_norm = y_mono / max_val
+                read_norm = lambda a, b: to_float(a, b) / max_val
             else:
-                y_norm = y_mono
+                read_norm = to_float
                 
             # --- Smart Trimming (Fix 2: Lower Threshold) ---
             # Changed top_db from 20 to 60 (Keep almost everything)
-            y_trimmed, trim_log = AudioPreprocessor._trim_silence_numpy(y_norm, top_db=60)
+            # Bounds come from block reads; only the retained region is converted
+            start, end, trim_log = AudioPreprocessor._trim_bounds(n_samples, read_norm, top_db=60, sr=src_sr)
+            y_trimmed = read_norm(start, end)
             audit.update(trim_log)
             
             # --- Fallback Mode (Fix 3: Never Crash) ---
             if len(y_trimmed) == 0:
                  # If trim removed everything, revert to original normalized signal
                  warnings.warn("Trim removed entire signal. Reverting to original.")
-                 y_trimmed = y_norm
+                 y_trimmed = read_norm(0, n_samples)
                  audit['trim_status'] = "reverted_to_original"
+            del y_raw # Release the file mapping
 
             # Resample if needed
             if src_sr != AudioPreprocessor.TARGET_SR:
-                num_samples = int(len(y_trimmed) * AudioPreprocessor.TARGET_SR / src_sr)
-                y_resampled = signal.resample(y_trimmed, num_samples)
+                y_resampled = AudioPreprocessor._resample(y_trimmed, src_sr, AudioPreprocessor.TARGET_SR)
                 audit['resample_rate'] = AudioPreprocessor.TARGET_SR
+                audit['resampler'] = AudioPreprocessor.RESAMPLER
             else:
                 y_resampled = y_trimmed
                 audit['resample_rate'] = src_sr
@@ -93,7 +95,7 @@ class AudioPreprocessor:
             if current_max > 0:
                 target_amp = 10 ** (AudioPreprocessor.TARGET_DB / 20)
                 y_final = y_resampled * (target_amp / current_max)
-                audit['normalization_gain'] = target_amp / current_max
+                audit['normalization_gain'] = float(target_amp / current_max) # Python float, also in float32 mode
             else:
                 y_final = y_resampled
                 audit['normalization_gain'] = 1.0
@@ -104,55 +106,287 @@ class AudioPreprocessor:
              # Catch file read errors
              print(f"[AudioPreprocessor] Error reading file: {e}")
              # Return fallback
-             return np.zeros(16000), 16000, {"status": "error", "reason": str(e)}
+             return np.zeros(16000, dtype=dtype), 16000, {"status": "error", "reason": str(e)}
+        finally:
+            if owned is not None:
+                owned.close()
+
+    @staticmethod
+    def process_stream(source, precision: str = None) -> tuple:
+        """
+        Two-pass streaming variant of process() for recordings too long to hold
+        in memory (home-monitoring sessions). Same inputs.
+        Pass one scans the (memory-mapped) samples block by block for the peak
+        level and the trim bounds, then meters the peak of the resampled
+        region, so the normalization gain is the one process() applies. Pass
+        two is the returned generator: trimmed, resampled, normalized chunks
+        of about BLOCK_SAMPLES input samples, so memory stays constant
+        whatever the recording length.
+        Resampling is always STREAM_RESAMPLER (FFT resampling needs the whole
+        signal), so the output matches process() run with that resampler.
+        Returns: (chunk_iterator, sr, audit_log); the audit is complete on return.
+        A buffer opened here (path / bytes source) is closed once the iterator
+        is exhausted or discarded.
+        """
+        audit = {'mode': "stream"}
+        dtype = np.dtype(precision or AudioPreprocessor.PRECISION)
+        audit['precision'] = dtype.name
+
+        owned = None
+        try:
+            # --- Pass 1: peak level and trim bounds ---
+            if not isinstance(source, AudioBuffer):
+                source = owned = AudioBuffer.open(source)
+            src_sr, y_raw = AudioPreprocessor._load(source, audit)
+            n_samples = len(y_raw)
+            to_float = AudioPreprocessor._pcm_reader(y_raw, dtype)
+
+            max_val = AudioPreprocessor._peak(n_samples, to_float)
+            if max_val > 0:
+                read_norm = lambda a, b: to_float(a, b) / max_val
+            else:
+                read_norm = to_float
+
+            start, end, trim_log = AudioPreprocessor._trim_bounds(n_samples, read_norm, top_db=60, sr=src_sr)
+            audit.update(trim_log)
+            if end <= start:
+                warnings.warn("Trim removed entire signal. Reverting to original.")
+                start, end = 0, n_samples
+                audit['trim_status'] = "reverted_to_original"
+
+            if src_sr != AudioPreprocessor.TARGET_SR:
+                audit['resample_rate'] = AudioPreprocessor.TARGET_SR
+                audit['resampler'] = AudioPreprocessor.STREAM_RESAMPLER
+            else:
+                audit['resample_rate'] = src_sr
+
+            # Peak after resampling (the resampler's overshoot included), as in process()
+            read = lambda a, b: read_norm(start + a, start + b)
+            current_max = 0.0
+            for chunk in AudioPreprocessor._stream_chunks(read, end - start, src_sr, AudioPreprocessor.TARGET_SR, 1.0):
+                if len(chunk):
+                    current_max = max(current_max, np.max(np.abs(chunk)))
+            if current_max > 0:
+                gain = 10 ** (AudioPreprocessor.TARGET_DB / 20) / current_max
+            else:
+                gain = 1.0
+            audit['normalization_gain'] = float(gain)
+
+            # --- Pass 2: lazily streamed chunks ---
+            chunks = AudioPreprocessor._stream_chunks(read, end - start, src_sr, AudioPreprocessor.TARGET_SR, gain)
+            if owned is not None:
+                chunks, owned = AudioPreprocessor._closing(chunks, owned), None # The iterator owns it now
+            return chunks, AudioPreprocessor.TARGET_SR, audit
+
+        except Exception as e:
+             print(f"[AudioPreprocessor] Error reading file: {e}")
+             return iter([np.zeros(16000, dtype=dtype)]), 16000, {"status": "error", "reason": str(e)}
+        finally:
+            if owned is not None:
+                owned.close()
+
+    @staticmethod
+    def _closing(chunks, buffer: AudioBuffer):
+        """Yields from chunks, then closes buffer (also when the consumer stops early)."""
+        try:
+            yield from chunks
+        finally:
+            buffer.close()
+
+    @staticmethod
+    def _load(buffer: AudioBuffer, audit: dict) -> tuple[int, np.ndarray]:
+        """(sample_rate, raw PCM) of an opened AudioBuffer; sets audit['ingest']."""
+        if buffer.samples is not None:
+            audit['ingest'] = buffer.ingest
+            return buffer.sample_rate, buffer.samples
+
+        # Not a .wav by name: still try the WAV reader
+        from scipy.io import wavfile
+        audit['ingest'] = "read"
+        return wavfile.read(buffer.stream())
+
+    @staticmethod
+    def _stream_chunks(read, n_samples: int, src_sr: int, target_sr: int, gain: float):
+        """
+        Yields read(0, n_samples) polyphase-resampled to target_sr and scaled by
+        gain, one chunk at a time. Chunks start on multiples of the decimation
+        factor and carry a halo of half the filter length on both sides, so the
+        concatenated output equals _resample() on the whole signal.
+        """
+        from scipy import signal
+
+        block = AudioPreprocessor.BLOCK_SAMPLES
+        if src_sr == target_sr:
+            for a in range(0, n_samples, block):
+                yield read(a, min(a + block, n_samples)) * gain
+            return
+
+        up, down, taps = AudioPreprocessor._polyphase_filter(src_sr, target_sr)
+        step = max(block // down, 1) * down
+        # Input samples reached by half the filter, rounded up to whole `down` steps
+        halo = -(-(len(taps) // 2 + up) // (up * down)) * down
+        num_out = int(n_samples * target_sr / src_sr)
+        window = None
+
+        for a in range(0, n_samples, step):
+            b = min(a + step, n_samples)
+            s, e = max(a - halo, 0), min(b + halo, n_samples)
+            y = read(s, e)
+            if window is None:
+                window = taps.astype(y.dtype)
+            y_out = signal.resample_poly(y, up, down, window=window)
+            # s is a multiple of `down`, so local output 0 is global output s*up/down
+            o0 = a * up // down
+            o1 = num_out if b == n_samples else b * up // down
+            offset = s * up // down
+            yield y_out[o0 - offset : o1 - offset].astype(y.dtype, copy=False) * gain
+
+    @staticmethod
+    def _resample(y: np.ndarray, src_sr: int, target_sr: int, method: str = None) -> np.ndarray:
+        """
+        Resamples y to int(len(y) * target_sr / src_sr) samples, keeping its dtype.
+        "polyphase": rational-ratio FIR (scipy.signal.resample_poly) with the filter
+                     design cached per rate pair; cost is linear in len(y).
+        "fft": scipy.signal.resample (whole-signal FFT, cost depends on len(y) factoring).
+        """
+        from scipy import signal
+
+        num_samples = int(len(y) * target_sr / src_sr)
+        method = method or AudioPreprocessor.RESAMPLER
+        if method == "fft":
+            return signal.resample(y, num_samples).astype(y.dtype, copy=False)
+        if method != "polyphase":
+            raise ValueError(f"Unknown resampler '{method}'")
+
+        up, down, taps = AudioPreprocessor._polyphase_filter(src_sr, target_sr)
+        y_out = signal.resample_poly(y, up, down, window=taps.astype(y.dtype))
+        return y_out[:num_samples].astype(y.dtype, copy=False)
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _polyphase_filter(src_sr: int, target_sr: int) -> tuple[int, int, np.ndarray]:
+        """
+        Up/down factors and anti-aliasing FIR for a rate pair (resample_poly's
+        default Kaiser design, computed once per pair). Read-only.
+        """
+        from scipy import signal
+
+        g = gcd(int(src_sr), int(target_sr))
+        up, down = int(target_sr) // g, int(src_sr) // g
+        max_rate = max(up, down)
+        taps = signal.firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+        taps.flags.writeable = False
+        return up, down, taps
+
+    @staticmethod
+    def _pcm_reader(y_raw: np.ndarray, dtype: np.dtype):
+        """
+        Returns read(a, b): mono samples a..b of the (possibly memory-mapped) PCM
+        array as `dtype`, scaled to [-1, 1]. Only the requested rows are converted.
+        """
+        # Normalize to float (Universal Handling)
+        if y_raw.dtype.kind == 'i':
+            # Integer type (int16, int32)
+            # Check for 24-bit stored as 32-bit? Scipy usually scales to range.
+            # Safer: Normalize by the type's max value 
+            type_info = np.iinfo(y_raw.dtype)
+            scale = dtype.type(max(abs(type_info.min), abs(type_info.max)))
+            convert = lambda block: block.astype(dtype) / scale
+        elif y_raw.dtype.kind == 'f':
+            # Float type - assumed normalized or requiring peak norm later
+            convert = lambda block: block.astype(dtype)
+        else:
+            # Unsure (uint8?) - map 0..255 to -1..1
+            convert = lambda block: (block.astype(dtype) - dtype.type(128.0)) / dtype.type(128.0)
+
+        def read(a, b):
+            block = convert(y_raw[a:b])
+            # Convert to Mono
+            return np.mean(block, axis=1) if block.ndim > 1 else block
+
+        return read
+
+    @staticmethod
+    def _peak(n_samples: int, read) -> float:
+        """max |y| over the signal, one block at a time."""
+        peak = 0.0
+        for a in range(0, n_samples, AudioPreprocessor.BLOCK_SAMPLES):
+            block = read(a, min(a + AudioPreprocessor.BLOCK_SAMPLES, n_samples))
+            if len(block):
+                peak = max(peak, np.max(np.abs(block)))
+        return peak
 
     @staticmethod
     def _trim_silence_numpy(y, top_db=20, frame_length=2048, hop_length=512):
         """
         Numpy implementation of librosa.effects.trim
+        The envelope is a per-sample moving average (O(N) via cumulative sums),
+        so hop_length is accepted for signature compatibility only.
         """
-        if len(y) < frame_length:
-            return y, {"trim_skipped": "too_short"}
-            
-        # 1. Calculate Envelope (RMSE)
-        # Pad to ensure frames cover edges
-        y_padded = np.pad(y, (0, frame_length), mode='constant')
-        
-        # Strided slice for efficient windowing (Vectorized RMSE)
-        # Shape: (n_frames, frame_length)
-        num_frames = (len(y) - 0) // hop_length
-        # Simplified: loop (safer than tricky stride tricks in quick implementation)
-        # Calculate non-overlapping energy first for speed or use simpler amplitude
-        
-        # Energy per sample
-        energy = y ** 2
-        # Convolve with window for smoothing (like RMS)
-        window = np.ones(frame_length) / frame_length
-        # Use simple moving average as proxy for RMS energy envelope
-        mse_env = np.convolve(energy, window, mode='same')
-        rmse_env = np.sqrt(mse_env)
-        
+        start, end, log = AudioPreprocessor._trim_bounds(len(y), lambda a, b: y[a:b], top_db, frame_length)
+        return y[start:end], log
+
+    @staticmethod
+    def _trim_bounds(n_samples: int, read, top_db=20, frame_length=2048, sr: int = 16000) -> tuple[int, int, dict]:
+        """
+        Retained region [start, end) of _trim_silence_numpy, computed from block
+        reads read(a, b) so the signal never has to be materialized. The dB
+        envelope is relative to its own peak, hence independent of scaling.
+        """
+        if n_samples < frame_length:
+            return 0, n_samples, {"trim_skipped": "too_short"}
+
+        # 1. Calculate Envelope (RMSE) per block: moving average of the energy
+        # (same as np.convolve(y**2, box, 'same') over the whole signal)
+        block = AudioPreprocessor.BLOCK_SAMPLES
+        blocks = [(a, min(a + block, n_samples)) for a in range(0, n_samples, block)]
+        # Edge blocks are kept: they are where the active region usually starts and ends
+        kept, block_max = {}, []
+        for k, (a, b) in enumerate(blocks):
+            mse_env = AudioPreprocessor._mse_envelope(n_samples, read, a, b, frame_length)
+            block_max.append(np.max(mse_env))
+            if k in (0, len(blocks) - 1):
+                kept[k] = mse_env
+
         # 2. Convert to dB
         # Ref is peak
-        ref = np.max(rmse_env)
+        ref = np.sqrt(max(block_max))
         if ref <= 0:
-            return y, {"trim_status": "silent_ref"}
-            
-        db_env = 20 * np.log10(rmse_env / ref + 1e-9) # 1e-9 to avoid log(0)
-        
-        # 3. Find mask
-        mask = db_env > -top_db
-        
-        # Find first and last True
-        # np.flatnonzero returns indices of non-zero elements
-        active_indices = np.flatnonzero(mask)
-        
-        if len(active_indices) == 0:
-            return np.array([]), {"trim_status": "all_silence"}
-            
-        start = active_indices[0]
-        end = active_indices[-1]
-        
+            return 0, n_samples, {"trim_status": "silent_ref"}
+
+        def active(k):
+            mse_env = kept[k] if k in kept else AudioPreprocessor._mse_envelope(n_samples, read, *blocks[k], frame_length)
+            rmse_env = np.sqrt(mse_env)
+            db_env = 20 * np.log10(rmse_env / ref + 1e-9) # 1e-9 to avoid log(0)
+            # 3. Find mask
+            return np.flatnonzero(db_env > -top_db)
+
+        # Only the first and last blocks holding an active sample are inspected
+        hits = [k for k, m in enumerate(block_max) if 20 * np.log10(np.sqrt(m) / ref + 1e-9) > -top_db]
+        if not hits:
+            return 0, 0, {"trim_status": "all_silence"}
+
+        start = blocks[hits[0]][0] + active(hits[0])[0]
+        end = blocks[hits[-1]][0] + active(hits[-1])[-1]
+
         # Map back to samples (approximate since we used convolved window same size)
         # Direct index mapping is sufficiently accurate for trimming
-        return y[start:end], {"trim_removed_sec": (len(y) - (end-start))/16000}
+        return start, end, {"trim_removed_sec": (n_samples - (end - start)) / sr}
+
+    @staticmethod
+    def _mse_envelope(n_samples: int, read, a: int, b: int, frame_length: int) -> np.ndarray:
+        """
+        Envelope samples a..b: mean energy over [i - L/2, i + L/2) clipped to the
+        signal (np.convolve(y**2, box, 'same') within rounding), from a block-local
+        cumulative sum in float64 so the cost is O(N) instead of O(N * L).
+        """
+        lo, hi = a - frame_length // 2, b + (frame_length - 1) // 2
+        y = read(max(lo, 0), min(hi, n_samples))
+        # Energy per sample, zero outside the signal
+        csum = np.zeros(hi - lo + 1)
+        start = max(lo, 0) - lo
+        np.cumsum(np.square(y, dtype=np.float64), out=csum[start + 1 : start + 1 + len(y)])
+        csum[start + 1 + len(y):] = csum[start + len(y)]
+        # Use simple moving average as proxy for RMS energy envelope
+        mse = (csum[frame_length:] - csum[:-frame_length]) / frame_length
+        return np.maximum(mse, 0.0) # Differencing can leave -eps in silence
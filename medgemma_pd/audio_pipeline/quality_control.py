@@ -1,4 +1,5 @@
 import numpy as np
+from .dsp import DSPKernels
 
 class SignalQualityControl:
     """
@@ -10,19 +11,119 @@ class SignalQualityControl:
     MIN_DURATION = 0.5  # Relaxed for short test clips
     MAX_CLIPPING_RATIO = 0.05 # Stricter: 5% Max Clipping
     MIN_RMS = 0.005 # Stricter: Reject absolute silence
+    CELL_DUR = 0.01 # Statistics cell (= FeatureExtractor.HOP_DUR, so one table serves both layers)
+    CLIP_LEVEL = 0.99
+    SNR_MIN_CELLS = 50 # 0.5 s of cells before an SNR estimate is reported
+    SNR_HIST_DB = (-200.0, 20.0, 0.1) # Cell power histogram: low, high, bin width (dB)
+    SNR_MIN_NOISE_CELLS = 10 # Noise-only (pause) cells needed for a noise floor
+    SNR_MIN_GAP_DB = 6.0 # Active vs. pause class means closer than this: no pauses (one population)
     
     @staticmethod
-    def assess_quality(y: np.ndarray, sr: int) -> dict:
+    def assess_quality(y: np.ndarray, sr: int, frame_stats: dict = None) -> dict:
         """
         Analyzes raw signal for defects.
+        frame_stats: DSPKernels.frame_stats table of y (cells of CELL_DUR), when
+                     the caller shares one with feature extraction; built here
+                     otherwise.
+        Returns: {'passed': bool, 'metrics': dict, 'reasons': list}
+        """
+        if frame_stats is None:
+            frame_stats = DSPKernels.frame_stats(y, SignalQualityControl.cell_length(sr), SignalQualityControl.CLIP_LEVEL)
+        return SignalQualityControl.assess_stats(SignalQualityControl.table_stats(frame_stats), sr)
+
+    @staticmethod
+    def cell_length(sr: int) -> int:
+        return int(sr * SignalQualityControl.CELL_DUR)
+
+    @staticmethod
+    def signal_stats(y: np.ndarray, sr: int, stats: dict = None) -> dict:
+        """
+        Sufficient statistics of a chunk for assess_stats(). Pass the previous
+        dict as `stats` to accumulate chunks (cells restart at each chunk).
+        """
+        table = DSPKernels.frame_stats(y, SignalQualityControl.cell_length(sr), SignalQualityControl.CLIP_LEVEL)
+        return SignalQualityControl.table_stats(table, stats)
+
+    @staticmethod
+    def table_stats(table: dict, stats: dict = None) -> dict:
+        """
+        Folds a frame_stats table into the running statistics: sample count,
+        clipped count, sum of squares and a histogram of per-cell power (dB).
+        """
+        lo, hi, width = SignalQualityControl.SNR_HIST_DB
+        if stats is None:
+            stats = {'n': 0, 'clipped': 0, 'sum_sq': 0.0,
+                     'power_hist': np.zeros(int(round((hi - lo) / width)), dtype=np.int64)}
+        stats['n'] += table['n']
+        stats['clipped'] += int(np.sum(table['clipped']))
+        stats['sum_sq'] += float(np.sum(table['energy']))
+
+        if len(table['energy']):
+            cell_len = np.full(len(table['energy']), table['hop'])
+            cell_len[-1] = table['n'] - table['hop'] * (len(cell_len) - 1)
+            power_db = 10 * np.log10(table['energy'] / cell_len + 1e-30)
+            bins = np.clip(((power_db - lo) / width).astype(np.int64), 0, len(stats['power_hist']) - 1)
+            stats['power_hist'] += np.bincount(bins, minlength=len(stats['power_hist']))
+        return stats
+
+    @staticmethod
+    def _snr_db(power_hist: np.ndarray) -> float:
+        """
+        SNR (dB) from the cell power histogram: cells are split into pauses
+        and active speech at the Otsu threshold of their dB levels; the noise
+        floor is the mean power of the pause cells, the signal the mean power
+        of the active cells less that floor. None when there are too few
+        cells or no noise-only cells (a single population, e.g. a vowel with
+        no pauses, pure noise or digital silence). Capped at 100 dB (digitally
+        silent pauses).
+        """
+        total = int(np.sum(power_hist))
+        if total < SignalQualityControl.SNR_MIN_CELLS:
+            return None
+        lo, _, width = SignalQualityControl.SNR_HIST_DB
+        level_db = lo + (np.arange(len(power_hist)) + 0.5) * width
+
+        # Otsu: the split maximizing the between-class variance of the dB levels
+        counts = power_hist.astype(np.float64)
+        n_low = np.cumsum(counts)[:-1]
+        s_low = np.cumsum(counts * level_db)[:-1]
+        n_high = total - n_low
+        with np.errstate(divide="ignore", invalid="ignore"):
+            between = n_low * n_high * (s_low / n_low - (s_low[-1] + counts[-1] * level_db[-1] - s_low) / n_high) ** 2
+        between = np.where((n_low > 0) & (n_high > 0), between, -1.0)
+        if np.max(between) < 0:
+            return None
+        split = int(np.argmax(between)) + 1 # Pause cells: bins < split
+
+        pause, active = counts[:split], counts[split:]
+        if np.sum(pause) < SignalQualityControl.SNR_MIN_NOISE_CELLS:
+            return None
+        pause_db = np.sum(pause * level_db[:split]) / np.sum(pause)
+        active_db = np.sum(active * level_db[split:]) / np.sum(active)
+        if active_db - pause_db < SignalQualityControl.SNR_MIN_GAP_DB:
+            return None
+
+        power = 10 ** (level_db / 10)
+        noise = np.sum(pause * power[:split]) / np.sum(pause)
+        signal = np.sum(active * power[split:]) / np.sum(active) - noise
+        if noise <= 0 or signal <= 0:
+            return 100.0 if signal > 0 else None
+        return round(float(min(10 * np.log10(signal / noise), 100.0)), 1)
+
+    @staticmethod
+    def assess_stats(stats: dict, sr: int) -> dict:
+        """
+        assess_quality() from accumulated signal_stats(), so streamed recordings
+        are judged without holding the whole signal.
         Returns: {'passed': bool, 'metrics': dict, 'reasons': list}
         """
         reasons = []
         metrics = {}
         passed = True
+        n = stats['n']
         
         # 1. Duration Check
-        duration = len(y) / sr
+        duration = n / sr
         metrics['duration'] = duration
         if duration < SignalQualityControl.MIN_DURATION:
             passed = False
@@ -30,8 +131,7 @@ class SignalQualityControl:
 
         # 2. Clipping Check
         # Samples near +/- 1.0 are considered clipped
-        clipped_samples = np.sum(np.abs(y) >= 0.99)
-        clipping_ratio = clipped_samples / len(y)
+        clipping_ratio = float(stats['clipped'] / n) if n else 0.0
         metrics['clipping_ratio'] = clipping_ratio
         
         if clipping_ratio > SignalQualityControl.MAX_CLIPPING_RATIO:
@@ -39,15 +139,16 @@ class SignalQualityControl:
             reasons.append(f"Excessively Clipped ({clipping_ratio*100:.1f}%)")
 
         # 3. Silence / Energy Check
-        rms = np.sqrt(np.mean(y**2))
+        rms = float(np.sqrt(stats['sum_sq'] / n)) if n else 0.0
         metrics['rms_energy'] = rms
         
         if rms < SignalQualityControl.MIN_RMS:
             passed = False
             reasons.append("Signal Level too low (Silence/Near-Silence)")
 
-        # 4. SNR Proxy (Simple estimation: Mean / Std of quiet segments)
-        # This is hard on short clips, so we skip for now or use RMS as proxy.
+        # 4. SNR Estimate (reported, not gated)
+        # Active vs. pause 10 ms cells; None without pauses to measure noise in
+        metrics['snr_db'] = SignalQualityControl._snr_db(stats['power_hist'])
 
         return {
             'passed': passed,
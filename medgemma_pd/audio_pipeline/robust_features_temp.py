@@ -1,54 +1,45 @@
 import numpy as np
-from scipy import signal
+from .dsp import DSPKernels
 
 def autocorrelation(y):
     """
     Computes Autocorrelation Function (ACF) using FFT.
     """
     n = len(y)
-    # Pad to avoids circular convolution artifacts
-    y_pad = np.pad(y, (0, n), mode='constant')
-    f = np.fft.fft(y_pad)
-    acf = np.fft.ifft(f * np.conj(f)).real
-    return acf[:n]
+    # FFT length >= 2n-1 avoids circular convolution artifacts
+    return DSPKernels.acf(np.asarray(y, dtype=float), DSPKernels.fft_size(max(2 * n - 1, 1)))[:n]
 
 def extract_pitch_robust(y, sr, min_f0=75, max_f0=600):
     """
     Robust Pitch Detection using ACF.
     Returns: f0 (Hz), voiced_flag (bool)
     """
-    # 1. ACF
-    acf = autocorrelation(y)
-    
-    # 2. Find Peak in valid range
-    min_lag = int(sr / max_f0)
-    max_lag = int(sr / min_f0)
-    
-    if max_lag >= len(acf):
-        max_lag = len(acf) - 1
-        
-    valid_acf = acf[min_lag:max_lag]
-    if len(valid_acf) == 0:
-        return 0.0, False
-        
-    peak_idx = np.argmax(valid_acf)
-    peak_val = valid_acf[peak_idx]
-    true_lag = min_lag + peak_idx
-    
+    f0, voiced = _pitch_frames(np.asarray(y, dtype=float)[None, :], sr, min_f0, max_f0)
+    return float(f0[0]), bool(voiced[0])
+
+def _pitch_frames(frames_w, sr, min_f0=75, max_f0=600):
+    """
+    Batched extract_pitch_robust over rows of already-windowed frames.
+    Returns: f0 array (Hz, 0 where unvoiced), voiced mask
+    """
+    n = frames_w.shape[1]
+    f0 = np.zeros(len(frames_w))
+
+    # 1. ACF / 2. Find Peak in valid range
+    min_lag, max_lag, nfft = DSPKernels.acf_plan(sr, n, min_f0, max_f0)
+    if max_lag <= min_lag:
+        return f0, np.zeros(len(frames_w), dtype=bool)
+    true_lag, peak_val, energy = DSPKernels.acf_peaks(frames_w, nfft, min_lag, max_lag)
+
     # 3. Voiced/Unvoiced Decision (Voicing Strength)
     # Normalized ACF peak height (0.0 - 1.0)
     # HNR proxy
-    energy = acf[0]
-    if energy == 0: return 0.0, False
-    
-    voicing_strength = peak_val / energy
-    
+    voicing_strength = np.divide(peak_val, energy, out=np.zeros_like(energy), where=energy != 0)
+
     # Threshold for speech (typically 0.3-0.4 for sustained vowels)
-    if voicing_strength < 0.3:
-        return 0.0, False # Unvoiced / Noise
-        
-    f0 = sr / true_lag
-    return f0, True
+    voiced = (energy != 0) & (voicing_strength >= 0.3)
+    f0[voiced] = sr / true_lag[voiced]
+    return f0, voiced
 
 def extract_jitter_shimmer_hnr(y, sr):
     """
@@ -64,20 +55,12 @@ def extract_jitter_shimmer_hnr(y, sr):
     if num_frames < 5:
         return {"jitter": 0.0, "shimmer": 0.0, "hnr": 0.0, "f0": 0.0}
         
-    f0s = []
-    peaks = [] # Peak amplitudes for Shimmer
-    
-    for i in range(num_frames):
-        start = i * hop_len
-        frame = y[start : start + frame_len]
-        
-        # Apply window
-        frame_w = frame * np.hanning(len(frame))
-        
-        f0, voiced = extract_pitch_robust(frame_w, sr)
-        if voiced:
-            f0s.append(f0)
-            peaks.append(np.max(np.abs(frame))) # Simple peak amp
+    frames = DSPKernels.frame(np.asarray(y, dtype=float), frame_len, hop_len, num_frames)
+
+    # Apply window (cached) and track all frames at once
+    f0_all, voiced = _pitch_frames(frames * DSPKernels.window(frame_len), sr)
+    f0s = f0_all[voiced]
+    peaks = np.max(np.abs(frames[voiced]), axis=1) # Simple peak amp
             
     if len(f0s) < 3:
          return {"jitter": 0.0, "shimmer": 0.0, "hnr": 0.0, "f0": 0.0}
@@ -0,0 +1,107 @@
+import os
+import tempfile
+import numpy as np
+from .cache import FeatureCache
+from .features import FeatureExtractor
+from .preprocessing import AudioPreprocessor
+
+
+class TraceStore:
+    """
+    Persisted per-frame pitch traces (FeatureExtractor.track), one compact
+    .npz per recording. Changing only downstream parameters (voicing
+    threshold, stable-window length, median-filter kernel) then re-runs
+    FeatureExtractor.features_from_trace on the stored arrays, with no audio
+    decode, resampling or pitch tracking.
+
+    Keys cover the content hash, pipeline version, preprocessing constants
+    and the tracker constants below; downstream constants are deliberately
+    left out so they can change without invalidating traces.
+
+    The directory is size-bounded like FeatureCache (LRU by mtime, running
+    size total), under its own MAX_BYTES budget.
+    """
+
+    ENABLED = os.environ.get("MEDGEMMA_TRACE_STORE", "1") != "0"
+    ROOT = os.environ.get("MEDGEMMA_TRACE_DIR",
+                          os.path.join(os.path.expanduser("~"), ".cache", "medgemma_pd", "traces"))
+    MAX_BYTES = 512 * 1024 * 1024 # Evict least recently used traces beyond this
+
+    # FeatureExtractor constants that shape a trace
+    TRACKER_PARAMS = ("FRAME_DUR", "HOP_DUR", "MIN_F0", "MAX_F0", "MIN_ENERGY", "ZCR_MAX", "PITCH_METHOD",
+                      "DECIMATION", "COARSE_CANDIDATES", "REFINE_RADIUS", "YIN_THRESHOLD",
+                      "YIN_MAX_APERIODICITY", "CEPSTRUM_REFINE_RADIUS")
+
+    # Stored dtype per trace column (lags are integers or sub-sample fractions well inside float32).
+    # Amplitudes stay float32: float16 moves shimmer by ~0.3% relative, visible in reports.
+    DTYPES = {
+        "lag": np.float32,
+        "peak_val": np.float32,
+        "energy": np.float32,
+        "amp": np.float32,
+        "acf_computed": np.bool_,
+    }
+
+    @staticmethod
+    def key(content_hash: str, version: str, pitch_method: str = None, precision: str = None) -> str:
+        """precision: compute dtype of the preprocessed signal (AudioPreprocessor.PRECISION if None)."""
+        tracker = {name: getattr(FeatureExtractor, name) for name in TraceStore.TRACKER_PARAMS}
+        fingerprint = FeatureCache.fingerprint(AudioPreprocessor, tracker=tracker,
+                                               pitch_method=pitch_method or FeatureExtractor.PITCH_METHOD,
+                                               precision=precision or AudioPreprocessor.PRECISION)
+        return FeatureCache.key(content_hash, version, fingerprint)
+
+    @staticmethod
+    def _path(key: str) -> str:
+        return os.path.join(TraceStore.ROOT, key[:2], key + ".npz")
+
+    @staticmethod
+    def stored_form(trace: dict) -> dict:
+        """
+        The trace columns as get() returns them after put(): cast to DTYPES,
+        lags widened back to float64. Features computed from a fresh trace in
+        this form match those from a stored one bit for bit.
+        """
+        stored = {name: np.asarray(trace[name]).astype(dtype) for name, dtype in TraceStore.DTYPES.items()}
+        stored["lag"] = stored["lag"].astype(np.float64) # f0 = sr / lag in double precision, as when tracked
+        return stored
+
+    @staticmethod
+    def put(key: str, trace: dict, sr: int):
+        """Atomically stores a trace (columns cast to DTYPES) with its sample rate."""
+        path = TraceStore._path(key)
+        arrays = {name: np.asarray(trace[name]).astype(dtype) for name, dtype in TraceStore.DTYPES.items()}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez(f, sr=np.int64(sr), **arrays)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError as e:
+            print(f"[TraceStore] Error: could not store {key[:12]}: {e}")
+            return
+        FeatureCache.account(path, TraceStore.ROOT, TraceStore.MAX_BYTES)
+
+    @staticmethod
+    def get(key: str) -> tuple[dict, int]:
+        """
+        (trace, sr) or None, in stored_form() (ready for features_from_trace);
+        a hit marks the trace most recently used.
+        """
+        path = TraceStore._path(key)
+        try:
+            with np.load(path) as npz:
+                sr = int(npz["sr"])
+                trace = TraceStore.stored_form({name: npz[name] for name in TraceStore.DTYPES})
+            os.utime(path) # LRU: eviction removes the oldest mtimes first
+        except (OSError, KeyError, ValueError):
+            return None
+        return trace, sr
+
+    @staticmethod
+    def contains(key: str) -> bool:
+        return os.path.exists(TraceStore._path(key))
@@ -0,0 +1,69 @@
+import numpy as np
+from .buffer import AudioBuffer
+from .preprocessing import AudioPreprocessor
+
+
+class AudioTriage:
+    """
+    Layer 1b: Early-Reject Triage
+    Looks at the header plus a few evenly spaced sample blocks (a handful of
+    page reads on the memory-mapped file) and rejects recordings that are
+    digital silence, a flat DC line or saturated, before the full decode,
+    preprocessing and feature work. Short files are read completely.
+    """
+
+    BLOCKS = 32             # Sampled blocks per file (first and last included)
+    BLOCK_SAMPLES = 2048    # Samples per block
+    SILENCE_PEAK = 1e-4     # Full-scale peak below which a file is digital silence (-80 dBFS)
+    FLAT_RANGE = 1e-4       # Peak-to-peak range below which a non-silent file is a flat line
+    CLIP_LEVEL = 0.99       # |x| counted as full scale (as in SignalQualityControl)
+    SATURATION_RATIO = 0.5  # Share of sampled samples at full scale that rejects a file
+
+    @staticmethod
+    def check(buffer: AudioBuffer) -> dict:
+        """
+        Triage of an opened recording (InputValidator.open).
+        Returns: {'passed': bool, 'metrics': dict, 'reasons': list}; formats that
+        cannot be read without a full decode pass with metrics['skipped'].
+        """
+        if buffer.samples is None:
+            return {'passed': True, 'metrics': {'skipped': "no_sample_access"}, 'reasons': []}
+
+        n_samples = len(buffer.samples)
+        read = AudioPreprocessor._pcm_reader(buffer.samples, np.dtype(np.float64))
+        blocks = [read(a, a + L) for a, L in AudioTriage._block_starts(n_samples)]
+        y = np.concatenate(blocks) if blocks else np.zeros(0)
+
+        metrics = {'samples_read': len(y), 'coverage': len(y) / n_samples if n_samples else 1.0}
+        reasons = []
+        if len(y) == 0:
+            reasons.append("Empty recording")
+            return {'passed': False, 'metrics': metrics, 'reasons': reasons}
+
+        peak = float(np.max(np.abs(y)))
+        value_range = float(np.max(y) - np.min(y))
+        clipped_ratio = float(np.count_nonzero(np.abs(y) >= AudioTriage.CLIP_LEVEL) / len(y))
+        metrics['peak_dbfs'] = float(20 * np.log10(peak)) if peak > 0 else None
+        metrics['range'] = value_range
+        metrics['clipped_ratio'] = clipped_ratio
+
+        # 1. Digital silence
+        if peak < AudioTriage.SILENCE_PEAK:
+            reasons.append("Digital silence (no sampled block above -80 dBFS)")
+        # 2. Flat line (DC offset, stuck converter)
+        elif value_range < AudioTriage.FLAT_RANGE:
+            reasons.append("Flat signal (constant level, no audio content)")
+        # 3. Saturation
+        if clipped_ratio > AudioTriage.SATURATION_RATIO:
+            reasons.append(f"Saturated ({clipped_ratio * 100:.1f}% of sampled samples at full scale)")
+
+        return {'passed': not reasons, 'metrics': metrics, 'reasons': reasons}
+
+    @staticmethod
+    def _block_starts(n_samples: int) -> list:
+        """(start, length) of the sampled blocks; one block for files shorter than the sample budget."""
+        budget = AudioTriage.BLOCKS * AudioTriage.BLOCK_SAMPLES
+        if n_samples <= budget:
+            return [(0, n_samples)] if n_samples else []
+        starts = np.linspace(0, n_samples - AudioTriage.BLOCK_SAMPLES, AudioTriage.BLOCKS).astype(np.int64)
+        return [(int(a), AudioTriage.BLOCK_SAMPLES) for a in starts]
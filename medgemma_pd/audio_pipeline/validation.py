@@ -1,8 +1,5 @@
-import os
-import os
-import contextlib
-import wave # Standard library fallback
-from scipy.io import wavfile
+from .buffer import AudioBuffer
+from .decoders import AudioDecoders
 
 class InputValidator:
     """
@@ -11,58 +8,63 @@ class InputValidator:
     """
     
     ALLOWED_EXTENSIONS = {'.wav', '.mp3', '.m4a', '.ogg', '.flac'}
-    MAX_SIZE_MB = 50
+    MAX_SIZE_MB = 50 # In-memory preprocessing
+    MAX_STREAM_SIZE_MB = 4096 # Streaming preprocessing (long home-monitoring sessions)
 
     @staticmethod
-    def validate(file_path: str) -> dict:
+    def validate(source, name: str = None) -> dict:
         """
         Checks if file exists, has valid extension, and is readable.
+        source: file path, or in-memory audio (bytes, memoryview, file-like);
+                `name` is an optional file-name hint for in-memory sources.
         Returns: {'valid': bool, 'error': str, 'metadata': dict}
         """
-        # 1. Path/Existence Check
-        if not os.path.exists(file_path):
-            return {'valid': False, 'error': "File not found"}
+        result, buffer = InputValidator.open(source, name)
+        if buffer is not None:
+            buffer.close()
+        return result
+
+    @staticmethod
+    def open(source, name: str = None, streaming: bool = False) -> tuple[dict, AudioBuffer]:
+        """
+        validate() that also returns the opened AudioBuffer (None if invalid),
+        so later layers reuse the stat info, header and samples read here.
+        streaming: the caller preprocesses in chunks, so MAX_STREAM_SIZE_MB applies.
+        Returns: (validation result, buffer)
+        """
+        # 1. Path/Existence Check (a single stat also provides size and mtime)
+        try:
+            buffer = AudioBuffer.locate(source, name=name)
+        except OSError:
+            return {'valid': False, 'error': "File not found"}, None
+        except TypeError as e:
+            return {'valid': False, 'error': str(e)}, None
         
-        # 2. Extension Check
-        ext = os.path.splitext(file_path)[1].lower()
+        # 2. Extension Check (in-memory sources: name hint, else magic bytes)
+        ext = buffer.extension
         if ext not in InputValidator.ALLOWED_EXTENSIONS:
-             return {'valid': False, 'error': f"Unsupported format: {ext}"}
+             buffer.close()
+             return {'valid': False, 'error': f"Unsupported format: {ext or 'unknown'}"}, None
 
         # 3. Size Check
-        size_mb = os.path.getsize(file_path) / (1024 * 1024)
-        if size_mb > InputValidator.MAX_SIZE_MB:
-             return {'valid': False, 'error': f"File too large ({size_mb:.2f}MB). Max: {InputValidator.MAX_SIZE_MB}MB"}
+        size_mb = buffer.size_bytes / (1024 * 1024)
+        max_mb = InputValidator.MAX_STREAM_SIZE_MB if streaming else InputValidator.MAX_SIZE_MB
+        if size_mb > max_mb:
+             buffer.close()
+             return {'valid': False, 'error': f"File too large ({size_mb:.2f}MB). Max: {max_mb}MB"}, None
 
-        # 4. Header Integrity (Try opening)
-        # 4. Header Integrity (Try opening)
-        try:
-            # Use Scipy (robust) or Wave (fast)
-            # Scipy returns (rate, data)
-            # For validation, we just need headers without full read if possible, 
-            # but wavfile.read is standard here.
-            
-            # Optimization: Use standard 'wave' module for header only check if .wav
-            if ext == '.wav':
-                with contextlib.closing(wave.open(file_path, 'r')) as f:
-                     frames = f.getnframes()
-                     rate = f.getframerate()
-                     duration = frames / float(rate)
-                     channels = f.getnchannels()
-                     
-                return {
-                    'valid': True, 
-                    'error': None,
-                    'metadata': {
-                        'sample_rate': rate,
-                        'channels': channels,
-                        'duration_sec': duration
-                    }
-                }
-            else:
-                 # Be more permissive for non-wavs or assume passed if extensions allowed
-                 # We can't validate MP3/etc without ffmpeg/librosa
-                 # Just pass them and let Preprocessor handle it.
-                 return {'valid': True, 'error': None, 'metadata': {'sample_rate': 0, 'channels': 0, 'duration_sec': 0}}
+        # 4. Decoder Availability (compressed formats need a local library)
+        if ext != '.wav' and not AudioDecoders.available(ext):
+             buffer.close()
+             return {'valid': False, 'error': f"No decoder available for {ext}"}, None
 
+        # 5. Header Integrity (Try opening)
+        try:
+            # WAV headers are parsed and the samples memory-mapped, compressed
+            # formats get a block decoder (no audio data is read yet)
+            buffer.decode()
         except Exception as e:
-            return {'valid': False, 'error': f"Corrupt Audio Header: {e}"}
+            buffer.close()
+            return {'valid': False, 'error': f"Corrupt Audio Header: {e}"}, None
+
+        return {'valid': True, 'error': None, 'metadata': buffer.metadata()}, buffer
@@ -0,0 +1,130 @@
+import os
+import tarfile
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from ..audio_pipeline.buffer import AudioBuffer
+from ..audio_pipeline.preprocessing import AudioPreprocessor
+
+
+class CorpusReader:
+    """
+    Reads voice corpora (MDVR-KCL style trees: .../ReadText/HC/*.wav,
+    .../ReadText/PD/*.wav) straight from zip / tar archives, without
+    extracting them to disk. Members are streamed in archive order and can be
+    decoded in parallel; group and patient ID come from the member path.
+    """
+
+    AUDIO_EXTENSIONS = ('.wav',)
+    GROUPS = ("HC", "PD")
+    WORKERS = min(8, os.cpu_count() or 1)
+
+    @staticmethod
+    def is_archive(path: str) -> bool:
+        return os.path.isfile(path) and (zipfile.is_zipfile(path) or tarfile.is_tarfile(path))
+
+    @staticmethod
+    def infer_group(member_path: str) -> str:
+        """
+        'HC' / 'PD' from the nearest directory named like a group, else from
+        filename tokens (ID02_pd_2_0_0.wav). None if neither matches.
+        """
+        parts = member_path.replace('\\', '/').split('/')
+        for part in reversed(parts[:-1]):
+            if part.upper() in CorpusReader.GROUPS:
+                return part.upper()
+        tokens = os.path.splitext(parts[-1])[0].upper().split('_')
+        for group in CorpusReader.GROUPS:
+            if group in tokens[1:]:
+                return group
+        return None
+
+    @staticmethod
+    def infer_patient_id(member_path: str) -> str:
+        """Leading filename token (ID00_hc_0_0_0.wav -> ID00), as batch_process.py uses."""
+        return os.path.basename(member_path.replace('\\', '/')).split('_')[0]
+
+    @staticmethod
+    def _entry(archive_path: str, member: str, size_bytes: int) -> dict:
+        return {
+            'archive': archive_path,
+            'member': member,
+            'filename': os.path.basename(member),
+            'group': CorpusReader.infer_group(member),
+            'patient_id': CorpusReader.infer_patient_id(member),
+            'size_bytes': size_bytes
+        }
+
+    @staticmethod
+    def _is_audio(member: str) -> bool:
+        name = os.path.basename(member)
+        # Skip macOS resource forks (__MACOSX/._x.wav) that ride along in zips
+        return name.lower().endswith(CorpusReader.AUDIO_EXTENSIONS) and not name.startswith('._')
+
+    @staticmethod
+    def entries(archive_path: str) -> list:
+        """Audio member entries (archive, member, filename, group, patient_id, size_bytes)."""
+        return [entry for entry, _ in CorpusReader._members(archive_path, read=False)]
+
+    @staticmethod
+    def iter_members(archive_path: str):
+        """Yields (entry, bytes) for every audio member, in archive order, one at a time."""
+        return CorpusReader._members(archive_path, read=True)
+
+    @staticmethod
+    def _members(archive_path: str, read: bool):
+        if zipfile.is_zipfile(archive_path):
+            with zipfile.ZipFile(archive_path) as zf:
+                for info in zf.infolist():
+                    if info.is_dir() or not CorpusReader._is_audio(info.filename):
+                        continue
+                    entry = CorpusReader._entry(archive_path, info.filename, info.file_size)
+                    yield entry, (zf.read(info) if read else None)
+            return
+
+        # Stream mode ('r|*'): one sequential pass, also for .tar.gz / .tar.bz2 / .tar.xz
+        with tarfile.open(archive_path, mode='r|*') as tf:
+            for info in tf:
+                if not info.isfile() or not CorpusReader._is_audio(info.name):
+                    continue
+                entry = CorpusReader._entry(archive_path, info.name, info.size)
+                yield entry, (tf.extractfile(info).read() if read else None)
+
+    @staticmethod
+    def map_members(archive_path: str, fn, workers: int = None):
+        """
+        Yields fn(entry, data) for every audio member, in archive order.
+        The archive is read sequentially by the caller's thread; fn runs on a
+        thread pool (numpy / scipy / zlib release the GIL). At most 2 * workers
+        members are held in memory at once.
+        """
+        workers = workers or CorpusReader.WORKERS
+        if workers <= 1:
+            for entry, data in CorpusReader.iter_members(archive_path):
+                yield fn(entry, data)
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque()
+            for entry, data in CorpusReader.iter_members(archive_path):
+                in_flight.append(pool.submit(fn, entry, data))
+                if len(in_flight) >= 2 * workers:
+                    yield in_flight.popleft().result()
+            while in_flight:
+                yield in_flight.popleft().result()
+
+    @staticmethod
+    def decode_members(archive_path: str, workers: int = None, precision: str = None):
+        """
+        Yields (entry, y, sr, audit): every audio member decoded and preprocessed
+        (AudioPreprocessor.process) straight from the archive bytes.
+        """
+        def decode(entry, data):
+            buffer = AudioBuffer.open(data, name=entry['member'])
+            try:
+                y, sr, audit = AudioPreprocessor.process(buffer, precision)
+            finally:
+                buffer.close()
+            return entry, y, sr, audit
+
+        return CorpusReader.map_members(archive_path, decode, workers)
@@ -0,0 +1,168 @@
+import os
+import time
+import tempfile
+import numpy as np
+
+
+class FeatureStore:
+    """
+    Columnar store of per-recording features, one directory per pipeline
+    version holding append-only .npz partitions. Rows are keyed by
+    content_hash (AudioBuffer.content_hash / DatasetManifest) within a
+    version, so re-extraction only covers recordings not stored yet.
+
+    KEY_COLUMNS are stored as strings; every other column is float32 (labels
+    and flags included; NaN marks a value missing from a partition). Column
+    selection is cheap: an .npz archive only loads the arrays that are read.
+    """
+
+    ROOT = os.path.join("medgemma_pd", "models", "feature_store")
+    KEY_COLUMNS = ("content_hash", "filename", "group", "patient_id")
+    DTYPE = np.float32
+    IMPORT_PREFIX = "csv:" # content_hash of rows imported from a CSV: prefix + SHA-256 of the filename
+    LEGACY_VERSION = "legacy-csv" # Version of imported rows: the extractor that produced them is unknown
+
+    @staticmethod
+    def _version_dir(version: str, root: str = None) -> str:
+        # Version strings like "1.0.0-medical" are safe path components; strip separators anyway
+        return os.path.join(root or FeatureStore.ROOT, version.replace("/", "_").replace("\\", "_"))
+
+    @staticmethod
+    def _partitions(version: str, root: str = None) -> list:
+        path = FeatureStore._version_dir(version, root)
+        if not os.path.isdir(path):
+            return []
+        return sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".npz"))
+
+    @staticmethod
+    def keys(version: str, root: str = None) -> set:
+        """content_hash of every stored row of `version`."""
+        hashes = set()
+        for part in FeatureStore._partitions(version, root):
+            with np.load(part) as npz:
+                hashes.update(npz["content_hash"].tolist())
+        return hashes
+
+    @staticmethod
+    def append(rows: list, version: str, root: str = None) -> int:
+        """
+        Writes rows (dicts with 'content_hash' and numeric / key columns) as a
+        new partition, skipping hashes already stored for this version.
+        Returns: number of rows written.
+        """
+        stored = FeatureStore.keys(version, root)
+        fresh = {}
+        for row in rows:
+            if row["content_hash"] not in stored:
+                fresh.setdefault(row["content_hash"], row) # First row wins within a batch too
+        if not fresh:
+            return 0
+
+        rows = list(fresh.values())
+        columns = sorted({c for row in rows for c in row})
+        arrays = {}
+        for c in columns:
+            if c in FeatureStore.KEY_COLUMNS:
+                arrays[c] = np.array([str(row.get(c) or "") for row in rows])
+            else:
+                values = [row.get(c) for row in rows]
+                arrays[c] = np.array([np.nan if v is None else float(v) for v in values], dtype=FeatureStore.DTYPE)
+
+        FeatureStore._write_partition(FeatureStore._version_dir(version, root), arrays)
+        return len(rows)
+
+    @staticmethod
+    def import_csv(path: str, version: str = LEGACY_VERSION, root: str = None) -> int:
+        """
+        One-time import of a legacy feature table (training_data.csv: filename,
+        label and feature columns) into `version`, LEGACY_VERSION by default so
+        its rows never mix with features of a known pipeline version. The CSV predates content
+        hashes, so rows are keyed by IMPORT_PREFIX + SHA-256 of the filename
+        and importing again writes nothing. group / patient_id come from the
+        filename; rows are marked voiced (the CSV only kept voiced recordings).
+        Returns: number of rows written.
+        """
+        import csv
+        import hashlib
+        from .corpus import CorpusReader
+
+        rows = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for record in csv.DictReader(f):
+                fname = record.pop("filename")
+                row = {c: (float(v) if v not in ("", None) else None) for c, v in record.items()}
+                row.update({
+                    "content_hash": FeatureStore.IMPORT_PREFIX + hashlib.sha256(fname.encode()).hexdigest(),
+                    "filename": fname,
+                    "group": CorpusReader.infer_group(fname),
+                    "patient_id": CorpusReader.infer_patient_id(fname),
+                    "voiced": 1.0
+                })
+                rows.append(row)
+        return FeatureStore.append(rows, version, root)
+
+    @staticmethod
+    def read(version: str, columns: list = None, group: str = None, patient_id: str = None,
+             content_hashes=None, root: str = None) -> dict:
+        """
+        Rows of `version` as {column: array}, partitions concatenated in
+        append order. columns: subset to load (all if None); group /
+        patient_id / content_hashes filter rows.
+        """
+        filters = {'group': group, 'patient_id': patient_id}
+        parts = []
+        for part in FeatureStore._partitions(version, root):
+            with np.load(part) as npz:
+                stored = set(npz.files)
+                n = len(npz["content_hash"])
+                mask = np.ones(n, dtype=bool)
+                for c, value in filters.items():
+                    if value is not None:
+                        mask &= (npz[c] == value) if c in stored else False
+                if content_hashes is not None:
+                    mask &= np.isin(npz["content_hash"], list(content_hashes))
+                if not mask.any():
+                    continue
+                parts.append((stored, {c: npz[c][mask] for c in (columns or stored) if c in stored}, int(mask.sum())))
+
+        wanted = columns or sorted(set().union(*(stored for stored, _, _ in parts)))
+        table = {}
+        for c in wanted:
+            chunks = []
+            for _, arrays, n in parts:
+                if c in arrays:
+                    chunks.append(arrays[c])
+                elif c in FeatureStore.KEY_COLUMNS:
+                    chunks.append(np.full(n, ""))
+                else:
+                    chunks.append(np.full(n, np.nan, dtype=FeatureStore.DTYPE))
+            if c in FeatureStore.KEY_COLUMNS:
+                table[c] = np.concatenate(chunks) if chunks else np.zeros(0, dtype=str)
+            else:
+                table[c] = np.concatenate(chunks).astype(FeatureStore.DTYPE) if chunks else np.zeros(0, dtype=FeatureStore.DTYPE)
+        return table
+
+    @staticmethod
+    def _write_partition(path: str, arrays: dict):
+        os.makedirs(path, exist_ok=True)
+        # Temp file + atomic rename: readers never pick up a half-written partition
+        fd, tmp = tempfile.mkstemp(dir=path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp, os.path.join(path, f"part-{time.time_ns()}.npz"))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    @staticmethod
+    def compact(version: str, root: str = None) -> int:
+        """Merges all partitions of `version` into one. Returns: the row count."""
+        parts = FeatureStore._partitions(version, root)
+        table = FeatureStore.read(version, root=root)
+        if len(parts) > 1:
+            # The merged partition is in place before the old ones are dropped
+            FeatureStore._write_partition(FeatureStore._version_dir(version, root), table)
+            for part in parts:
+                os.unlink(part)
+        return len(table.get("content_hash", []))
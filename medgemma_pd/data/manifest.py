@@ -0,0 +1,209 @@
+import os
+import hashlib
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from ..audio_pipeline.buffer import AudioBuffer
+from ..audio_pipeline.validation import InputValidator
+from .corpus import CorpusReader
+
+
+class DatasetManifest:
+    """
+    SQLite index of a voice corpus directory: one row per audio file with
+    size, mtime, content hash, header metadata (sample rate, duration,
+    channels), group and patient ID. Batch tools query it instead of
+    re-globbing the tree and re-parsing path strings.
+
+    The tree is walked in parallel with os.scandir; only new or changed
+    files (size / mtime differ from the stored row) are re-read, and rows of
+    deleted files are dropped. Header metadata comes from the memory-mapped
+    header (or the decoder's header for compressed formats), never a full decode.
+
+    Databases live in a user cache directory, one per corpus (keyed by its
+    absolute path), so read-only corpora can be indexed. If that location
+    is not writable, entries() falls back to a plain scan.
+    """
+
+    ROOT = os.environ.get("MEDGEMMA_MANIFEST_DIR",
+                          os.path.join(os.path.expanduser("~"), ".cache", "medgemma_pd", "manifests"))
+    WORKERS = min(8, os.cpu_count() or 1)
+    COLUMNS = ("path", "size_bytes", "mtime", "content_hash", "sample_rate", "duration_sec",
+               "channels", "group_name", "patient_id", "error")
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (
+            path TEXT PRIMARY KEY,      -- relative to the corpus root, '/' separated
+            size_bytes INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            content_hash TEXT,
+            sample_rate INTEGER,
+            duration_sec REAL,
+            channels INTEGER,
+            group_name TEXT,
+            patient_id TEXT,
+            error TEXT                  -- header read failure; NULL for readable files
+        );
+        CREATE INDEX IF NOT EXISTS files_group ON files (group_name);
+        CREATE INDEX IF NOT EXISTS files_patient ON files (patient_id);
+        CREATE INDEX IF NOT EXISTS files_hash ON files (content_hash);
+    """
+
+    @staticmethod
+    def db_path(root: str) -> str:
+        key = hashlib.sha256(os.path.abspath(root).encode()).hexdigest()
+        return os.path.join(DatasetManifest.ROOT, key[:32] + ".sqlite")
+
+    @staticmethod
+    def _connect(db_path: str) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        conn = sqlite3.connect(db_path)
+        conn.executescript(DatasetManifest.SCHEMA)
+        return conn
+
+    @staticmethod
+    def refresh(root: str, db_path: str = None, workers: int = None) -> dict:
+        """
+        Scans `root` and brings the manifest up to date.
+        Returns: {'files': int, 'added': int, 'updated': int, 'removed': int, 'unchanged': int}
+        """
+        db_path = db_path or DatasetManifest.db_path(root)
+        workers = workers or DatasetManifest.WORKERS
+        conn = DatasetManifest._connect(db_path)
+        try:
+            known = {path: (size, mtime) for path, size, mtime
+                     in conn.execute("SELECT path, size_bytes, mtime FROM files")}
+            found = DatasetManifest._scan(root, workers)
+
+            # Incremental: only files whose size or mtime moved are re-read
+            stale = [(rel, st) for rel, st in found.items()
+                     if known.get(rel) != (st.st_size, st.st_mtime)]
+            removed = [rel for rel in known if rel not in found]
+
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                rows = list(pool.map(lambda item: DatasetManifest._probe(root, *item), stale))
+
+            with conn:
+                conn.executemany("DELETE FROM files WHERE path = ?", [(rel,) for rel in removed])
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO files ({', '.join(DatasetManifest.COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(DatasetManifest.COLUMNS))})", rows)
+        finally:
+            conn.close()
+
+        added = sum(1 for rel, _ in stale if rel not in known)
+        return {
+            'files': len(found),
+            'added': added,
+            'updated': len(stale) - added,
+            'removed': len(removed),
+            'unchanged': len(found) - len(stale)
+        }
+
+    @staticmethod
+    def _scan(root: str, workers: int) -> dict:
+        """{relative path: stat} of every audio file under root; directories are listed in parallel."""
+        found = {}
+        pending = [root]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending:
+                subdirs = []
+                for files, dirs in pool.map(DatasetManifest._list_dir, pending):
+                    for path, st in files:
+                        found[os.path.relpath(path, root).replace(os.sep, '/')] = st
+                    subdirs.extend(dirs)
+                pending = subdirs
+        return found
+
+    @staticmethod
+    def _list_dir(path: str) -> tuple[list, list]:
+        """([(file path, stat)], [subdirectory paths]) of one directory."""
+        files, dirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.name.startswith('.'):
+                        continue # macOS resource forks, hidden dirs, manifests of older versions
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in InputValidator.ALLOWED_EXTENSIONS:
+                        files.append((entry.path, entry.stat()))
+        except OSError as e:
+            print(f"[DatasetManifest] Error: cannot list {path}: {e}")
+        return files, dirs
+
+    @staticmethod
+    def _probe(root: str, rel: str, st: os.stat_result) -> tuple:
+        """Manifest row of one file: header metadata without decoding samples."""
+        row = {
+            'path': rel,
+            'size_bytes': st.st_size,
+            'mtime': st.st_mtime,
+            'content_hash': None,
+            'sample_rate': None,
+            'duration_sec': None,
+            'channels': None,
+            'group_name': CorpusReader.infer_group(rel),
+            'patient_id': CorpusReader.infer_patient_id(rel),
+            'error': None
+        }
+        try:
+            buffer = AudioBuffer.open(os.path.join(root, rel), stat=st)
+            try:
+                row['content_hash'] = buffer.content_hash()
+                row.update(buffer.metadata())
+            finally:
+                buffer.close()
+        except Exception as e:
+            row['error'] = str(e) or type(e).__name__
+        return tuple(row[c] for c in DatasetManifest.COLUMNS)
+
+    @staticmethod
+    def entries(root: str, group: str = None, db_path: str = None, refresh: bool = True,
+                readable_only: bool = True) -> list:
+        """
+        Manifest rows as dicts (path is joined back onto root; 'group' holds
+        the group label), sorted by path. Refreshes the manifest first unless
+        refresh=False. A missing corpus gives an empty list.
+        """
+        db_path = db_path or DatasetManifest.db_path(root)
+        try:
+            if refresh:
+                DatasetManifest.refresh(root, db_path)
+
+            query = f"SELECT {', '.join(DatasetManifest.COLUMNS)} FROM files WHERE 1 = 1"
+            params = []
+            if group is not None:
+                query += " AND group_name = ?"
+                params.append(group)
+            if readable_only:
+                query += " AND error IS NULL"
+            query += " ORDER BY path"
+
+            conn = DatasetManifest._connect(db_path)
+            try:
+                rows = conn.execute(query, params).fetchall()
+            finally:
+                conn.close()
+        except (OSError, sqlite3.Error) as e:
+            print(f"[DatasetManifest] Error: manifest at {db_path} unavailable ({e}), scanning {root} directly")
+            rows = DatasetManifest._scan_rows(root, group, readable_only)
+
+        entries = []
+        for values in rows:
+            entry = dict(zip(DatasetManifest.COLUMNS, values))
+            entry['group'] = entry.pop('group_name')
+            entry['filename'] = os.path.basename(entry['path'])
+            entry['path'] = os.path.join(root, *entry['path'].split('/'))
+            entries.append(entry)
+        return entries
+
+    @staticmethod
+    def _scan_rows(root: str, group: str = None, readable_only: bool = True, workers: int = None) -> list:
+        """Manifest rows of a fresh scan, without a database, filtered and sorted like entries()."""
+        workers = workers or DatasetManifest.WORKERS
+        found = DatasetManifest._scan(root, workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(lambda item: DatasetManifest._probe(root, *item), sorted(found.items())))
+        g, e = DatasetManifest.COLUMNS.index("group_name"), DatasetManifest.COLUMNS.index("error")
+        return [row for row in rows
+                if (group is None or row[g] == group) and not (readable_only and row[e] is not None)]
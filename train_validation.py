@@ -1,4 +1,5 @@
 import os
+import argparse
 import sys
 import numpy as np
 import pandas as pd
@@ -14,6 +15,11 @@ sys.path.append(os.getcwd())
 try:
     from medgemma_pd.audio_pipeline.features import FeatureExtractor
     from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
+    from medgemma_pd.data.manifest import DatasetManifest
+    from medgemma_pd.data.feature_store import FeatureStore
+    from medgemma_pd.audio_pipeline.cache import FeatureCache
+    from medgemma_pd.audio_pipeline.traces import TraceStore
+    from medgemma_pd.audio_pipeline.pipeline import MedicalAudioPipeline
 except ImportError:
     print("CRITICAL: Run this script from the project root directory.")
     sys.exit(1)
@@ -22,12 +28,12 @@ warnings.filterwarnings("ignore")
 
 # --- Configuration ---
 DATA_ROOT = r"dataset- MDVR-KCL Dataset/26_29_09_2017_KCL/26-29_09_2017_KCL/ReadText"
-OUTPUT_CSV = "medgemma_pd/models/training_data.csv"
+FEATURE_COLUMNS = ["jitter", "shimmer", "hnr", "f0_std"]
+LEGACY_CSV = "medgemma_pd/models/training_data.csv" # Features of the corpus the bundled model was trained on
 REPORT_FILE = "medgemma_pd/models/validation_report.txt"
 
 def extract_dataset_features():
     print(f"--- 1. Data Extraction from: {DATA_ROOT} ---")
-    data = []
     
     # 1. Find all files
     hc_path = os.path.join(DATA_ROOT, "HC")
@@ -35,58 +41,117 @@ def extract_dataset_features():
     
     if not os.path.exists(hc_path) or not os.path.exists(pd_path):
         print(f"Error: Dataset paths not found. \nExpected:\n  {hc_path}\n  {pd_path}")
-        return None
+        return load_stored_training_data()
 
-    files = []
-    for f in os.listdir(hc_path):
-        if f.endswith(".wav"): files.append((os.path.join(hc_path, f), 0, f)) # 0 = Healthy
-    for f in os.listdir(pd_path):
-        if f.endswith(".wav"): files.append((os.path.join(pd_path, f), 1, f)) # 1 = PD
+    # Manifest rows carry the content hash, so cache keys need no re-read
+    labels = {"HC": 0, "PD": 1} # 0 = Healthy, 1 = PD
+    entries = [e for e in DatasetManifest.entries(DATA_ROOT) if e['group'] in labels]
         
-    print(f"Found {len(files)} files ({len([x for x in files if x[1]==0])} HC, {len([x for x in files if x[1]==1])} PD)")
+    print(f"Found {len(entries)} files ({len([e for e in entries if e['group']=='HC'])} HC, {len([e for e in entries if e['group']=='PD'])} PD)")
     
-    # 2. Extract Features
-    print("Extracting features... (This may take a moment)")
+    # 2. Extract Features (only recordings the feature store has not seen)
+    stored = FeatureStore.keys(MedicalAudioPipeline.VERSION)
+    files = [(e['path'], e, e['filename'], e['content_hash']) for e in entries if e['content_hash'] not in stored]
+    print(f"Extracting features for {len(files)} new recordings ({len(entries) - len(files)} already stored)...")
     start_time = time.time()
     
-    for path, label, fname in files:
+    # Cached files are a lookup; the rest are preprocessed, then their
+    # features extracted in one batched call
+    fingerprint = FeatureCache.fingerprint(AudioPreprocessor, FeatureExtractor, stage="extract_features_batch")
+    results = [None] * len(files)
+    signals = []
+    pending = []
+    sr = AudioPreprocessor.TARGET_SR
+    for i, (path, entry, fname, content_hash) in enumerate(files):
         try:
-            # Preprocess
-            y, sr, _ = AudioPreprocessor.process(path)
-            
-            # Extract
-            feats = FeatureExtractor.extract_features(y, sr)
-            
-            if not feats.get("valid_voice_detected", False):
-                print(f"  [WARN] No voice detected in {fname}, skipping.")
+            key = FeatureCache.key(content_hash, MedicalAudioPipeline.VERSION, fingerprint)
+            feats = FeatureCache.get(key)
+            if feats is not None:
+                results[i] = feats
                 continue
-                
-            row = {
-                "filename": fname,
-                "label": label,
-                "jitter": feats.get("jitter_local", 0.0) * 100, # %
-                "shimmer": feats.get("shimmer_local", 0.0) * 100, # %
-                "hnr": feats.get("hnr", 0.0),
-                "f0_std": feats.get("f0_std", 0.0)
-            }
-            data.append(row)
-            sys.stdout.write(".")
-            sys.stdout.flush()
-            
+            y, sr, _ = AudioPreprocessor.process(path)
+            signals.append(y)
+            pending.append((i, key))
         except Exception as e:
             print(f"\n  [ERR] Failed {fname}: {e}")
+
+    # Frame traces of the misses are persisted too, so threshold / window
+    # changes can be re-analysed without audio (reanalyze_traces.py)
+    for (i, key), trace in zip(pending, FeatureExtractor.track_batch(signals, sr)):
+        if TraceStore.ENABLED:
+            TraceStore.put(TraceStore.key(files[i][3], MedicalAudioPipeline.VERSION), trace, sr)
+        feats = FeatureExtractor.features_from_trace(trace, sr)
+        FeatureCache.put(key, feats)
+        results[i] = feats
+    print(f"Feature cache: {FeatureCache.counters['hits']} hits, {FeatureCache.counters['misses']} misses")
+
+    rows = []
+    for (_, entry, fname, _), feats in zip(files, results):
+        if feats is None:
+            continue # Failed above
+        voiced = feats.get("valid_voice_detected", False)
+        if not voiced:
+            # Stored anyway (voiced=0) so the recording is not re-extracted next run
+            print(f"  [WARN] No voice detected in {fname}, skipping.")
+
+        rows.append({
+            "content_hash": entry['content_hash'],
+            "filename": fname,
+            "group": entry['group'],
+            "patient_id": entry['patient_id'],
+            "label": labels[entry['group']],
+            "voiced": voiced,
+            "jitter": feats.get("jitter_local", 0.0) * 100, # %
+            "shimmer": feats.get("shimmer_local", 0.0) * 100, # %
+            "hnr": feats.get("hnr", 0.0),
+            "f0_std": feats.get("f0_std", 0.0),
+            "f0_mean": feats.get("f0_mean", 0.0),
+            "fallback_used": feats.get("metadata", {}).get("fallback_used", False)
+        })
+        sys.stdout.write(".")
+        sys.stdout.flush()
             
     print(f"\nExtraction complete in {time.time() - start_time:.2f}s")
-    
-    df = pd.DataFrame(data)
-    # Shuffle
-    df = df.sample(frac=1, random_state=42).reset_index(drop=True)
-    df.to_csv(OUTPUT_CSV, index=False)
-    print(f"Saved dataset to {OUTPUT_CSV}")
+    written = FeatureStore.append(rows, MedicalAudioPipeline.VERSION)
+    print(f"Stored {written} new rows in {FeatureStore.ROOT}")
+    return load_training_data([e['content_hash'] for e in entries])
+
+def load_stored_training_data(legacy=False):
+    """
+    Training table without the raw corpus: the rows extracted by the current
+    pipeline VERSION. LEGACY_CSV rows (imported once under
+    FeatureStore.LEGACY_VERSION; re-importing writes nothing) are used instead
+    when `legacy` is set or nothing has been extracted for VERSION; the two
+    are never mixed. None if there is nothing to train on.
+    """
+    version = MedicalAudioPipeline.VERSION
+    df = None if legacy else load_training_data(version=version)
+    if df is None or df.empty:
+        version = FeatureStore.LEGACY_VERSION
+        if os.path.exists(LEGACY_CSV):
+            written = FeatureStore.import_csv(LEGACY_CSV, version)
+            if written:
+                print(f"Imported {written} rows from {LEGACY_CSV} into {FeatureStore.ROOT}")
+        df = load_training_data(version=version)
+    if df.empty:
+        print("Error: Feature store is empty, nothing to train on.")
+        return None
+    print(f"Training on {len(df)} stored recordings (features version {version})")
     return df
 
+def load_training_data(content_hashes=None, version=None):
+    """Training table from the feature store (`version`, default the pipeline's): voiced recordings, typed float32 columns."""
+    table = FeatureStore.read(version or MedicalAudioPipeline.VERSION,
+                              columns=["filename", "label", "voiced"] + FEATURE_COLUMNS,
+                              content_hashes=content_hashes)
+    df = pd.DataFrame(table)
+    df = df[df["voiced"] == 1].drop(columns="voiced")
+    df["label"] = df["label"].astype(int)
+    # Shuffle
+    return df.sample(frac=1, random_state=42).reset_index(drop=True)
+
 def train_and_validate(df):
-    X = df[["jitter", "shimmer", "hnr", "f0_std"]]
+    X = df[FEATURE_COLUMNS]
     y = df["label"]
     
     models = {
@@ -156,10 +221,15 @@ def train_and_validate(df):
     print(f"Validation Report saved to {REPORT_FILE}")
 
 if __name__ == "__main__":
-    if os.path.exists(OUTPUT_CSV):
-        print(f"Loading cached data from {OUTPUT_CSV}")
-        df = pd.read_csv(OUTPUT_CSV)
+    parser = argparse.ArgumentParser(description="Train and validate the PD classifier")
+    parser.add_argument("--legacy", action="store_true",
+                        help=f"Train on the imported {LEGACY_CSV} rows instead of extracted features")
+    args = parser.parse_args()
+
+    if args.legacy:
+        df = load_stored_training_data(legacy=True)
     else:
+        # Incremental: only recordings missing from the feature store are extracted
         df = extract_dataset_features()
     
     if df is not None and not df.empty:
@@ -0,0 +1,82 @@
+import os
+import sys
+import glob
+import tempfile
+import numpy as np
+from scipy.io import wavfile
+
+sys.path.append(os.getcwd())
+from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
+from medgemma_pd.audio_pipeline.quality_control import SignalQualityControl
+from medgemma_pd.audio_pipeline.features import FeatureExtractor
+
+# Validation harness: float32 vs float64 compute mode.
+# Runs every recording through preprocessing -> QC -> features in both
+# precisions and reports the drift in jitter / shimmer / HNR.
+
+MDVR_ROOT = r"dataset- MDVR-KCL Dataset/26_29_09_2017_KCL/26-29_09_2017_KCL/ReadText"
+METRICS = ["jitter_local", "shimmer_local", "hnr", "f0_mean", "rms_energy"]
+
+
+def write_synthetic_set(out_dir):
+    """Synthetic vowels (healthy / jittery / noisy) at common source rates."""
+    rng = np.random.default_rng(42)
+    paths = []
+    for i, (src_sr, jitter, noise) in enumerate([(16000, 0.0, 0.005), (44100, 0.3, 0.02),
+                                                 (48000, 0.6, 0.05), (22050, 0.1, 0.1)]):
+        t = np.arange(int(3.0 * src_sr)) / src_sr
+        phase = 2 * np.pi * 150 * t + rng.normal(0, jitter, len(t))
+        y = np.sin(phase) + 0.3 * np.sin(2 * phase) + rng.normal(0, noise, len(t))
+        y = np.concatenate([np.zeros(src_sr // 2), y, np.zeros(src_sr // 2)])
+        pcm = (0.8 * y / np.max(np.abs(y)) * 32767).astype(np.int16)
+        path = os.path.join(out_dir, f"synthetic_{i}_{src_sr}.wav")
+        wavfile.write(path, src_sr, pcm)
+        paths.append(path)
+    return paths
+
+
+def run(path, precision):
+    y, sr, _ = AudioPreprocessor.process(path, precision=precision)
+    qc = SignalQualityControl.assess_quality(y, sr)
+    feats = FeatureExtractor.extract_features(y, sr)
+    feats["rms_energy"] = qc["metrics"]["rms_energy"]
+    return feats, y.dtype
+
+
+def main():
+    print("--- float32 vs float64 Drift Report ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        sets = {"synthetic": write_synthetic_set(tmp)}
+        mdvr = sorted(glob.glob(os.path.join(MDVR_ROOT, "*", "*.wav")))
+        if mdvr:
+            sets["MDVR-KCL"] = mdvr
+        else:
+            print(f"(MDVR-KCL not found at '{MDVR_ROOT}', synthetic set only)")
+
+        for name, paths in sets.items():
+            drift = {m: [] for m in METRICS}
+            voicing_mismatch = 0
+            for path in paths:
+                f64, _ = run(path, "float64")
+                f32, dtype = run(path, "float32")
+                assert dtype == np.float32, f"float32 mode returned {dtype}"
+
+                if f64.get("valid_voice_detected") != f32.get("valid_voice_detected"):
+                    voicing_mismatch += 1
+                    continue
+                for m in METRICS:
+                    if m in f64 and m in f32:
+                        a, b = float(f64[m]), float(f32[m])
+                        drift[m].append((abs(a - b), abs(a - b) / (abs(a) + 1e-12)))
+
+            print(f"\n### {name} ({len(paths)} recordings, voicing mismatches: {voicing_mismatch})")
+            print("| Metric | Max Abs Drift | Max Rel Drift | Mean Rel Drift |")
+            print("| :--- | :--- | :--- | :--- |")
+            for m in METRICS:
+                if drift[m]:
+                    d = np.array(drift[m])
+                    print(f"| {m} | {d[:, 0].max():.3e} | {d[:, 1].max():.3e} | {d[:, 1].mean():.3e} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import sys
+import glob
+import tempfile
+import numpy as np
+
+sys.path.append(os.getcwd())
+from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
+from medgemma_pd.audio_pipeline.features import FeatureExtractor
+from validate_float32_drift import write_synthetic_set
+
+# Validation harness: polyphase vs FFT resampling.
+# The bundled classifier was trained on features from FFT-resampled audio;
+# this reports how far each feature moves when preprocessing resamples with
+# the polyphase FIR instead. Recordings already at TARGET_SR are skipped
+# (neither resampler runs).
+
+MDVR_ROOT = r"dataset- MDVR-KCL Dataset/26_29_09_2017_KCL/26-29_09_2017_KCL/ReadText"
+MOCK_ROOT = os.path.join("data", "pc_gita_mock")
+METRICS = ["jitter_local", "shimmer_local", "hnr", "f0_mean", "f0_std"]
+
+
+def run(path, resampler):
+    default = AudioPreprocessor.RESAMPLER
+    AudioPreprocessor.RESAMPLER = resampler
+    try:
+        y, sr, audit = AudioPreprocessor.process(path)
+    finally:
+        AudioPreprocessor.RESAMPLER = default
+    return FeatureExtractor.extract_features(y, sr), audit
+
+
+def main():
+    print("--- Polyphase vs FFT Resampler Drift Report ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        sets = {"synthetic": write_synthetic_set(tmp)}
+        mock = sorted(glob.glob(os.path.join(MOCK_ROOT, "*", "*.wav")))
+        if mock:
+            sets["pc_gita_mock"] = mock
+        mdvr = sorted(glob.glob(os.path.join(MDVR_ROOT, "*", "*.wav")))
+        if mdvr:
+            sets["MDVR-KCL"] = mdvr
+        else:
+            print(f"(MDVR-KCL not found at '{MDVR_ROOT}')")
+
+        for name, paths in sets.items():
+            drift = {m: [] for m in METRICS}
+            resampled, voicing_mismatch = 0, 0
+            for path in paths:
+                fft, audit = run(path, "fft")
+                if 'resampler' not in audit:
+                    continue
+                poly, _ = run(path, "polyphase")
+                resampled += 1
+
+                if fft.get("valid_voice_detected") != poly.get("valid_voice_detected"):
+                    voicing_mismatch += 1
+                    continue
+                for m in METRICS:
+                    if m in fft and m in poly:
+                        a, b = float(fft[m]), float(poly[m])
+                        drift[m].append((a, b, abs(a - b) / (abs(a) + 1e-12)))
+                if name != "synthetic" and len(paths) <= 10:
+                    print(f"  {path}: " + ", ".join(f"{m} {fft[m]:.5g} -> {poly[m]:.5g}" for m in METRICS if m in fft))
+
+            print(f"\n### {name} ({resampled} resampled recordings, voicing mismatches: {voicing_mismatch})")
+            print("| Metric | Max Rel Drift | Mean Rel Drift |")
+            print("| :--- | :--- | :--- |")
+            for m in METRICS:
+                if drift[m]:
+                    d = np.array(drift[m])
+                    print(f"| {m} | {d[:, 2].max():.3e} | {d[:, 2].mean():.3e} |")
+
+
+if __name__ == "__main__":
+    main()
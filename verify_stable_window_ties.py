@@ -0,0 +1,82 @@
+import sys
+import os
+import numpy as np
+
+sys.path.append(os.getcwd())
+from medgemma_pd.audio_pipeline.features import FeatureExtractor
+
+# Checks that the prefix-sum stable-window search picks the same window as
+# the original direct scan (strict '<', earliest window on ties) on
+# quantized-lag f0 traces, where exact and near ties are common.
+
+SR = 16000
+
+
+def reference_start(f0, amp, window=FeatureExtractor.STABLE_WINDOW_FRAMES):
+    """The original O(N*W) jitter-minimization loop."""
+    window = min(window, len(f0))
+    best, min_jitter = 0, float('inf')
+    for i in range(len(f0) - window):
+        if np.mean(amp[i:i + window]) < FeatureExtractor.AMP_GATE_RATIO * np.max(amp):
+            continue
+        periods = 1.0 / (f0[i:i + window] + 1e-9)
+        avg_per = np.mean(periods)
+        jitter = np.mean(np.abs(np.diff(periods))) / avg_per if avg_per > 0 else 1.0
+        if jitter < min_jitter:
+            min_jitter, best = jitter, i
+    return best
+
+
+def periodic_lag_case():
+    """Regression: alternating 101/102-sample lags with three bumped frames.
+    Several windows tie in exact arithmetic; their prefix-sum scores differed
+    from the minimum by more than the former rounding bound."""
+    lag = np.tile([101.0, 102.0], 96)
+    lag[[17, 18, 29]] += 1
+    return SR / lag, np.ones(len(lag))
+
+
+def fuzz_case(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(60, 400))
+    kind = seed % 3
+    if kind == 0:  # Periodic lag pattern
+        pattern = rng.integers(100, 104, int(rng.integers(2, 9)))
+        lag = np.tile(pattern, n // len(pattern) + 1)[:n].astype(float)
+        lag[rng.random(n) < 0.02] += 1
+    elif kind == 1:  # Quantized random walk
+        lag = np.round(114 + np.cumsum(rng.choice([-1, 0, 0, 0, 1], n))).astype(float)
+    else:  # Few distinct lags
+        lag = rng.choice([110.0, 111.0, 112.0], n)
+    amp = rng.uniform(0.5, 1.0, n) if rng.random() < 0.5 else np.ones(n)
+    return SR / lag, amp
+
+
+def main():
+    print("--- Stable-Window Tie Check ---")
+    failures = 0
+
+    f0, amp = periodic_lag_case()
+    expected = reference_start(f0, amp)
+    start, _, _ = FeatureExtractor._stable_window_search(f0, amp)
+    ok = start == expected
+    failures += not ok
+    print(f"periodic lag regression: {'PASS' if ok else 'FAIL'} (start {start}, reference {expected})")
+
+    mismatches = []
+    for seed in range(3000):
+        f0, amp = fuzz_case(seed)
+        expected = reference_start(f0, amp)
+        start, _, _ = FeatureExtractor._stable_window_search(f0, amp)
+        if start != expected:
+            mismatches.append((seed, start, expected))
+    failures += len(mismatches)
+    print(f"3000 quantized-lag traces: {'PASS' if not mismatches else 'FAIL'} ({len(mismatches)} mismatches)")
+    for seed, start, expected in mismatches[:5]:
+        print(f"  seed {seed}: start {start}, reference {expected}")
+
+    print("ALL PASSED" if failures == 0 else f"{failures} FAILED")
+
+
+if __name__ == "__main__":
+    main()
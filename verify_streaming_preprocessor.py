@@ -0,0 +1,58 @@
+import sys
+import os
+import tempfile
+import tracemalloc
+import numpy as np
+from scipy.io import wavfile
+
+sys.path.append(os.getcwd())
+from medgemma_pd.audio_pipeline.preprocessing import AudioPreprocessor
+
+# Checks that the two-pass streaming preprocessor reproduces process() on
+# synthetic WAVs (samples and normalization gain) and reports its peak heap
+# use on a long recording. process() is run with the streaming resampler,
+# whatever the configured default.
+
+RATES = [16000, 22050, 44100, 48000]
+
+
+def write_wav(path, duration, sr, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * sr)) / sr
+    y = np.sin(2 * np.pi * 140 * t) + 0.3 * np.sin(2 * np.pi * 280 * t)
+    y = y * ((t > 0.5) & (t < duration - 0.5)) + rng.normal(0, 1e-3, len(t))  # silent edges get trimmed
+    wavfile.write(path, sr, (0.5 * y / np.max(np.abs(y)) * 32767).astype(np.int16))
+
+
+def main():
+    print("--- Streaming Preprocessor Check ---")
+    failures = 0
+    AudioPreprocessor.RESAMPLER = AudioPreprocessor.STREAM_RESAMPLER
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "check.wav")
+        for sr in RATES:
+            for precision in ["float64", "float32"]:
+                write_wav(path, 7.3, sr, seed=sr)
+                ref, _, audit = AudioPreprocessor.process(path, precision)
+                chunks, _, s_audit = AudioPreprocessor.process_stream(path, precision)
+                out = np.concatenate(list(chunks))
+
+                scale = audit['normalization_gain'] / s_audit['normalization_gain']
+                ok = len(ref) == len(out) and out.dtype == ref.dtype and abs(scale - 1) < 1e-6 and \
+                    np.allclose(ref, out, atol=1e-5 if precision == "float32" else 1e-12)
+                failures += not ok
+                print(f"{sr:>6} Hz {precision}: {'PASS' if ok else 'FAIL'} (gain ratio {scale:.7f})")
+
+        write_wav(path, 15 * 60, 44100)
+        tracemalloc.start()
+        chunks, _, _ = AudioPreprocessor.process_stream(path)
+        n_out = sum(len(c) for c in chunks)
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+        print(f"15 min @ 44.1 kHz ({os.path.getsize(path) / 2**20:.0f} MB): {n_out} samples out, peak heap {peak:.1f} MB")
+
+    print("ALL PASSED" if failures == 0 else f"{failures} FAILED")
+
+
+if __name__ == "__main__":
+    main()